@@ -0,0 +1,3 @@
+"""
+Suíte de benchmarks do serviço e da API de segmentação
+"""
@@ -0,0 +1,352 @@
+"""
+Casos de benchmark: serviço (por motor/idioma/tamanho), lote vs chamadas
+individuais, modelo frio vs aquecido, serialização das respostas e vazão ponta a
+ponta via ASGI
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.corpus import build_corpus, build_formatted_corpus
+from benchmarks.harness import latency_summary, measure, summarize
+from src.core.config import settings
+from src.services.lexicon import load_unigrams
+from src.services.lexicon_index import LexiconIndex, write_index
+from src.services.nuuvify_wordsegment_service import ViterbiSegmenter, WordSegmenter
+from src.services.segmentation_cache import LRUCache
+
+
+def _segmenter(options: dict, cache_entries: int = 0) -> WordSegmenter:
+    """Segmentador isolado, sem cache compartilhado e com cache local opcional"""
+    segmenter = WordSegmenter()
+    segmenter.load_profile = options["spacy_profile"]
+    segmenter.cache = LRUCache(max_entries=cache_entries, max_bytes=0)
+    segmenter.shared_cache = None
+    return segmenter
+
+
+def _combinations(options: dict):
+    for engine in options["engines"]:
+        for language in options["languages"]:
+            yield engine, language
+
+
+def bench_service(options: dict) -> dict:
+    """segment_and_format por motor, idioma e tamanho de entrada (sem cache)"""
+    results = {}
+    for engine, language in _combinations(options):
+        segmenter = _segmenter(options)
+        for size in options["sizes"]:
+            corpus = build_corpus(language, size)
+
+            def run(corpus=corpus):
+                for text in corpus:
+                    segmenter.segment_and_format(text, language, engine)
+
+            results[f"service.single.{engine}.{language}.{size}"] = measure(
+                run, len(corpus), options["repeat"]
+            )
+    return results
+
+
+def bench_batch(options: dict) -> dict:
+    """segment_many (lote) comparado ao mesmo corpus em chamadas individuais"""
+    results = {}
+    for engine, language in _combinations(options):
+        segmenter = _segmenter(options)
+        for size in options["sizes"]:
+            corpus = build_corpus(language, size)
+            results[f"service.batch.{engine}.{language}.{size}"] = measure(
+                lambda corpus=corpus: segmenter.segment_many(corpus, language, engine),
+                len(corpus),
+                options["repeat"],
+            )
+    return results
+
+
+def bench_cached(options: dict) -> dict:
+    """segment_and_format com todas as entradas no cache local"""
+    results = {}
+    for engine, language in _combinations(options):
+        segmenter = _segmenter(options, cache_entries=10_000)
+        corpus = build_corpus(language, "medium")
+
+        def run(corpus=corpus):
+            for text in corpus:
+                segmenter.segment_and_format(text, language, engine)
+
+        results[f"service.cached.{engine}.{language}"] = measure(
+            run, len(corpus), options["repeat"]
+        )
+    return results
+
+
+def bench_fast_path(options: dict) -> dict:
+    """Textos já segmentados com e sem o atalho que evita o motor"""
+    results = {}
+    for engine, language in _combinations(options):
+        corpus = build_formatted_corpus(language)
+        for enabled in (True, False):
+            segmenter = _segmenter(options)
+            segmenter.fast_path = enabled
+
+            def run(corpus=corpus, segmenter=segmenter):
+                for text in corpus:
+                    segmenter.segment_and_format(text, language, engine)
+
+            state = "on" if enabled else "off"
+            results[f"fastpath.{state}.{engine}.{language}"] = measure(
+                run, len(corpus), options["repeat"]
+            )
+    return results
+
+
+def bench_vectorized(options: dict) -> dict:
+    """Viterbi sobre o índice compilado: recorrência em Python vs pontuação
+    vetorizada (NumPy), por idioma e tamanho de entrada"""
+    results = {}
+    for engine, language in _combinations(options):
+        if engine != "viterbi":
+            continue
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_index(load_unigrams(language), Path(directory) / "lexicon.idx")
+            lexicon = LexiconIndex.open(path)
+            segmenter = ViterbiSegmenter(
+                lexicon, max_word_length=settings.SEGMENTATION_MAX_WORD_LENGTH
+            )
+            for size in options["sizes"]:
+                corpus = build_corpus(language, size)
+                for enabled in (False, True):
+                    segmenter.vectorized_min_length = 1 if enabled else 0
+
+                    def run(corpus=corpus):
+                        for text in corpus:
+                            segmenter.segment(text)
+
+                    state = "on" if enabled else "off"
+                    results[f"vectorized.{state}.{language}.{size}"] = measure(
+                        run, len(corpus), options["repeat"]
+                    )
+            lexicon.close()
+    return results
+
+
+def bench_serialization(options: dict) -> dict:
+    """Custo de serialização por requisição de /segment/ e /segment/batch:
+    revalidação pelo response_model + json (caminho padrão do FastAPI) vs
+    corpo montado sem validação, com json da stdlib e com orjson"""
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+
+    from src.api import responses
+    from src.api.responses import SegmentationJSONResponse, segmentation_record
+    from src.core.models import (
+        SegmentationAlternative,
+        WordSegmentationBatchResponse,
+        WordSegmentationResponse,
+    )
+
+    single_adapter = TypeAdapter(WordSegmentationResponse)
+    batch_adapter = TypeAdapter(WordSegmentationBatchResponse)
+
+    def validated(adapter: TypeAdapter, model) -> bytes:
+        # Como serialize_response: valida o objeto devolvido pela rota e o
+        # converte (exclude_none) antes do JSONResponse
+        content = adapter.dump_python(
+            adapter.validate_python(model, from_attributes=True),
+            mode="json",
+            exclude_none=True,
+        )
+        return JSONResponse(content).body
+
+    results = {}
+    for engine, language in _combinations(options):
+        corpus = build_corpus(language, "medium")
+        formatted = _segmenter(options).segment_many(corpus, language, engine)
+        ranked = [(text, -10.0 - index) for index, text in enumerate(formatted[:3])]
+        batch_size = 50
+
+        def pydantic_single():
+            for text, result in zip(corpus, formatted):
+                model = WordSegmentationResponse(
+                    original=text,
+                    formatted=result,
+                    alternatives=[
+                        SegmentationAlternative(formatted=f, score=s) for f, s in ranked
+                    ],
+                )
+                validated(single_adapter, model)
+
+        def pydantic_batch():
+            for start in range(0, len(corpus), batch_size):
+                model = WordSegmentationBatchResponse(
+                    results=[
+                        WordSegmentationResponse(original=text, formatted=result)
+                        for text, result in zip(
+                            corpus[start : start + batch_size],
+                            formatted[start : start + batch_size],
+                        )
+                    ]
+                )
+                validated(batch_adapter, model)
+
+        def direct_single():
+            for text, result in zip(corpus, formatted):
+                SegmentationJSONResponse(segmentation_record(text, result, ranked))
+
+        def direct_batch():
+            for start in range(0, len(corpus), batch_size):
+                SegmentationJSONResponse(
+                    {
+                        "results": [
+                            segmentation_record(text, result)
+                            for text, result in zip(
+                                corpus[start : start + batch_size],
+                                formatted[start : start + batch_size],
+                            )
+                        ]
+                    }
+                )
+
+        batches = -(-len(corpus) // batch_size)
+        name = f"{engine}.{language}"
+        results[f"serialization.pydantic.single.{name}"] = measure(
+            pydantic_single, len(corpus), options["repeat"]
+        )
+        results[f"serialization.pydantic.batch.{name}"] = measure(
+            pydantic_batch, batches, options["repeat"]
+        )
+
+        encoders = {"json": False, "orjson": True}
+        if responses.orjson is None:
+            del encoders["orjson"]
+        saved = settings.FAST_JSON_RESPONSES
+        try:
+            for encoder, enabled in encoders.items():
+                settings.FAST_JSON_RESPONSES = enabled
+                results[f"serialization.{encoder}.single.{name}"] = measure(
+                    direct_single, len(corpus), options["repeat"]
+                )
+                results[f"serialization.{encoder}.batch.{name}"] = measure(
+                    direct_batch, batches, options["repeat"]
+                )
+        finally:
+            settings.FAST_JSON_RESPONSES = saved
+    return results
+
+
+def bench_model(options: dict) -> dict:
+    """Primeira segmentação com o modelo frio (inclui a carga) vs aquecido"""
+    results = {}
+    for engine, language in _combinations(options):
+        text = build_corpus(language, "medium", count=1)[0]
+
+        def cold():
+            _segmenter(options).segment_and_format(text, language, engine)
+
+        results[f"model.cold.{engine}.{language}"] = measure(
+            cold, 1, max(1, options["repeat"] // 2), warmup=0
+        )
+
+        segmenter = _segmenter(options)
+        segmenter.segment_and_format(text, language, engine)
+        results[f"model.warm.{engine}.{language}"] = measure(
+            lambda: segmenter.segment_and_format(text, language, engine),
+            1,
+            options["repeat"] * 20,
+        )
+    return results
+
+
+async def _api_round(client, requests: list[tuple[str, dict]], concurrency: int):
+    """Envia as requisições com concorrência limitada e retorna as latências"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def send(path: str, payload: dict):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    await asyncio.gather(*(send(path, payload) for path, payload in requests))
+    return latencies
+
+
+def bench_api(options: dict) -> dict:
+    """Vazão ponta a ponta pelo app FastAPI com cliente ASGI em processo"""
+    import httpx
+
+    from src.api.main import app
+    from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+
+    service = nuuvify_wordsegment_service
+    saved = (service.cache, service.shared_cache, service.load_profile)
+    service.cache = LRUCache(max_entries=0)
+    service.shared_cache = None
+    service.load_profile = options["spacy_profile"]
+
+    async def run_case(requests: list[tuple[str, dict]], items: int) -> dict:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            # Aquecimento: carga do modelo fora da medição
+            await _api_round(c, requests[:1], 1)
+            rounds, latencies = [], []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                latencies += await _api_round(c, requests, options["concurrency"])
+                rounds.append(time.perf_counter() - started)
+        result = summarize(rounds, items)
+        result["latency"] = latency_summary(latencies)
+        return result
+
+    results = {}
+    try:
+        for engine, language in _combinations(options):
+            corpus = build_corpus(language, "medium")
+            single = [
+                (
+                    "/api/v1/segment/",
+                    {"text": t, "language": language, "engine": engine},
+                )
+                for t in corpus
+            ]
+            batch_size = 50
+            batch = [
+                (
+                    "/api/v1/segment/batch",
+                    {
+                        "items": [
+                            {"text": t, "language": language, "engine": engine}
+                            for t in corpus[start : start + batch_size]
+                        ]
+                    },
+                )
+                for start in range(0, len(corpus), batch_size)
+            ]
+            results[f"api.single.{engine}.{language}"] = asyncio.run(
+                run_case(single, len(corpus))
+            )
+            results[f"api.batch.{engine}.{language}"] = asyncio.run(
+                run_case(batch, len(corpus))
+            )
+    finally:
+        service.cache, service.shared_cache, service.load_profile = saved
+    return results
+
+
+# Grupos executados pelo runner (filtráveis com --only)
+CASES: dict[str, Callable[[dict], dict]] = {
+    "service": bench_service,
+    "batch": bench_batch,
+    "cached": bench_cached,
+    "fastpath": bench_fast_path,
+    "vectorized": bench_vectorized,
+    "model": bench_model,
+    "serialization": bench_serialization,
+    "api": bench_api,
+}
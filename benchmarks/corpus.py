@@ -0,0 +1,55 @@
+"""
+Corpora fixos (determinísticos) de entradas curtas, médias e longas
+"""
+
+import random
+
+# Palavras frequentes usadas para montar os textos colados
+WORDS = {
+    "pt": (
+        "casa sistema nota fiscal produto cliente pedido informacao tecnologia "
+        "empresa valor pagamento cadastro endereco cidade estado codigo servico "
+        "contrato data minha nova grande total conta banco saude escola"
+    ).split(),
+    "en": (
+        "house system invoice product customer order human resources information "
+        "technology company value payment account address city state code "
+        "service contract my new big total bank health school report"
+    ).split(),
+}
+
+# Siglas preservadas pelo serviço, anexadas a parte dos textos
+ACRONYMS = {"pt": ["sp", "ti", "mg", "pr"], "en": ["usa", "uk", "hr", "it"]}
+
+# Quantidade de palavras por texto em cada tamanho
+SIZES = {"short": (2, 3), "medium": (6, 10), "long": (30, 50)}
+
+CORPUS_SIZE = 200
+SEED = 20240101
+
+
+def build_corpus(language: str, size: str, count: int = CORPUS_SIZE) -> list[str]:
+    """Gera o corpus do idioma e tamanho indicados (sempre o mesmo para a semente)"""
+    rng = random.Random(f"{SEED}:{language}:{size}")
+    low, high = SIZES[size]
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS[language], k=rng.randint(low, high))
+        if rng.random() < 0.3:
+            words.append(rng.choice(ACRONYMS[language]))
+        texts.append("".join(words))
+    return texts
+
+
+def build_formatted_corpus(language: str, count: int = CORPUS_SIZE) -> list[str]:
+    """Textos já segmentados (CamelCase ou com separadores) de 2 a 5 palavras"""
+    rng = random.Random(f"{SEED}:{language}:formatted")
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS[language], k=rng.randint(2, 5))
+        separator = rng.choice(["camel", "_", "-", " "])
+        if separator == "camel":
+            texts.append("".join(word.capitalize() for word in words))
+        else:
+            texts.append(separator.join(words))
+    return texts
@@ -0,0 +1,113 @@
+"""
+Medição, estatísticas e comparação com o baseline
+"""
+
+import gc
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+
+def summarize(timings: list[float], operations: int) -> dict:
+    """Estatísticas por operação a partir do tempo total de cada repetição"""
+    per_op = [timing / operations for timing in timings]
+    median = statistics.median(per_op)
+    return {
+        "operations": operations,
+        "repeat": len(timings),
+        "min": min(per_op),
+        "median": median,
+        "mean": statistics.fmean(per_op),
+        "stdev": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "ops_per_second": 1 / median if median else 0.0,
+    }
+
+
+def measure(
+    func: Callable[[], object], operations: int, repeat: int, warmup: int = 1
+) -> dict:
+    """Executa func `repeat` vezes (cada execução processa `operations` itens)"""
+    for _ in range(warmup):
+        func()
+
+    # Como no timeit: sem coletas do GC durante a medição
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        timings = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return summarize(timings, operations)
+
+
+def latency_summary(latencies: list[float]) -> dict:
+    """Percentis de latência (segundos)"""
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": ordered[-1],
+    }
+
+
+def environment() -> dict:
+    """Metadados do ambiente para tornar os resultados comparáveis"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """Compara a mediana de cada caso com o baseline (razão atual / baseline)"""
+    comparison = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or "median" not in result or "median" not in previous:
+            continue
+
+        ratio = result["median"] / previous["median"] if previous["median"] else 1.0
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 - tolerance:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison.append(
+            {
+                "name": name,
+                "baseline": previous["median"],
+                "current": result["median"],
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    return comparison
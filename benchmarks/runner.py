@@ -0,0 +1,138 @@
+"""
+Runner da suíte de benchmarks: executa os casos, grava JSON e compara com o baseline
+
+Uso:
+    python -m benchmarks --engines viterbi --output resultados.json
+    python -m benchmarks --baseline benchmarks/baseline.json
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Optional
+
+from benchmarks.cases import CASES
+from benchmarks.corpus import SIZES
+from benchmarks.harness import compare, environment
+from src.core.config import settings
+
+
+def _split(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def run(options: dict, groups: list[str]) -> dict:
+    """Executa cada grupo por motor e idioma; falhas (ex.: modelo ausente)
+    são registradas como "skipped" sem interromper os demais casos"""
+    results: dict = {}
+    for group in groups:
+        for engine in options["engines"]:
+            for language in options["languages"]:
+                single = {**options, "engines": [engine], "languages": [language]}
+                print(f"{group}: {engine}/{language}...", file=sys.stderr)
+                try:
+                    results.update(CASES[group](single))
+                except Exception as e:
+                    results[f"{group}.{engine}.{language}"] = {"skipped": str(e)}
+                    print(f"  ignorado: {e}", file=sys.stderr)
+    return results
+
+
+def _print_table(results: dict, comparison: list[dict]) -> None:
+    """Resumo legível em stderr"""
+    status = {item["name"]: item for item in comparison}
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name:<45} ignorado", file=sys.stderr)
+            continue
+        line = (
+            f"{name:<45} {result['median'] * 1e6:>12.1f} µs/op "
+            f"{result['ops_per_second']:>12,.0f} op/s"
+        )
+        if name in status:
+            line += f"  x{status[name]['ratio']:.2f} {status[name]['status']}"
+        print(line, file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks do serviço e da API de segmentação",
+    )
+    parser.add_argument("--engines", default="viterbi,spacy")
+    parser.add_argument("--languages", default="pt,en")
+    parser.add_argument("--sizes", default=",".join(SIZES))
+    parser.add_argument(
+        "--only", default=",".join(CASES), help=f"Grupos: {', '.join(CASES)}"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Requisições simultâneas (api)"
+    )
+    parser.add_argument("--spacy-profile", default=settings.SPACY_LOAD_PROFILE)
+    parser.add_argument("-o", "--output", help="Arquivo JSON de resultados")
+    parser.add_argument("--baseline", help="Baseline JSON para comparação")
+    parser.add_argument(
+        "--save-baseline", help="Grava os resultados como novo baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Aumento relativo da mediana tolerado antes de acusar regressão",
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Ponto de entrada; retorna 1 quando há regressão em relação ao baseline"""
+    args = build_parser().parse_args(argv)
+    groups = _split(args.only)
+    unknown = [group for group in groups if group not in CASES]
+    if unknown:
+        raise SystemExit(f"Grupos desconhecidos: {unknown}")
+
+    options = {
+        "engines": _split(args.engines),
+        "languages": _split(args.languages),
+        "sizes": _split(args.sizes),
+        "repeat": max(1, args.repeat),
+        "concurrency": max(1, args.concurrency),
+        "spacy_profile": args.spacy_profile,
+    }
+    results = run(options, groups)
+
+    comparison: list[dict] = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        comparison = compare(results, baseline["results"], args.tolerance)
+
+    report = {
+        "environment": environment(),
+        "options": options,
+        "results": results,
+        "comparison": comparison,
+    }
+    _print_table(results, comparison)
+
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+    else:
+        print(payload)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as fh:
+            fh.write(payload + "\n")
+
+    regressions = [item for item in comparison if item["status"] == "regression"]
+    for item in regressions:
+        print(
+            f"REGRESSÃO: {item['name']} x{item['ratio']:.2f} "
+            f"({item['baseline'] * 1e6:.1f} -> {item['current'] * 1e6:.1f} µs/op)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
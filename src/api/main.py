@@ -1,10 +1,21 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.api import auth_routes, nuuvify_wordsegment_routes, routes
+from src.api import (
+    auth_routes,
+    nuuvify_wordsegment_routes,
+    routes,
+    vocabulary_routes,
+)
+from src.api.middleware import MetricsMiddleware, RateLimitMiddleware
+from src.api.prefork import preload_models, serve, warmup_models
 from src.core.config import settings
+from src.services.azure_service import azure_service, prefetch_secret_names
+from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+from src.services.segmentation_executor import segmentation_executor
 
 
 @asynccontextmanager
@@ -13,13 +24,38 @@ async def lifespan(app: FastAPI):
     # Startup
     print(f"Iniciando {settings.app_name} v{settings.version}")
 
-    # Conectar ao Azure Vault
-    print("Conexão com Azure Key Vault inicializada")
+    # Azure Key Vault: pré-carga dos segredos configurados e renovação antes do
+    # TTL, em segundo plano (não atrasa a inicialização)
+    azure_service.start_refresh(prefetch_secret_names())
+
+    # Aquecimento em segundo plano: /health/live responde enquanto
+    # /health/ready fica indisponível até o fim do aquecimento
+    warmup_task = None
+    if settings.WARMUP_ON_STARTUP:
+        nuuvify_wordsegment_service.warmup_state = "pending"
+        warmup_task = asyncio.create_task(asyncio.to_thread(warmup_models))
+    elif settings.PRELOAD_MODELS:
+        # No modo pre-fork os modelos já foram carregados no processo pai
+        preload_models()
+
+    # Primeira carga e recarga periódica do vocabulário de domínio (arquivo ou
+    # Key Vault), fora do event loop
+    await asyncio.to_thread(
+        nuuvify_wordsegment_service.vocabulary.start_watching,
+        settings.SEGMENTATION_VOCABULARY_RELOAD_SECONDS,
+    )
 
     yield
 
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+
     # Shutdown
     print("Encerrando aplicação...")
+    nuuvify_wordsegment_service.vocabulary.stop_watching()
+    segmentation_executor.shutdown()
+    await nuuvify_wordsegment_service.disconnect()
+    await azure_service.close()
     print("Aplicação encerrada")
 
 
@@ -35,6 +71,12 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Rate limit por cliente nas rotas de segmentação (429 antes dos workers);
+    # registrado antes do CORS para que as respostas 429 também levem os headers
+    # de CORS (o último middleware registrado é o mais externo)
+    if settings.RATE_LIMIT_RATE > 0:
+        app.add_middleware(RateLimitMiddleware)
+
     # Configurar CORS
     app.add_middleware(
         CORSMiddleware,
@@ -44,10 +86,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Latência por rota e idioma, exposta em /metrics
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
     # Incluir rotas
     app.include_router(routes.router, prefix=settings.API_PREFIX)
     app.include_router(nuuvify_wordsegment_routes.router, prefix=settings.API_PREFIX)
     app.include_router(auth_routes.router, prefix=settings.API_PREFIX)
+    app.include_router(vocabulary_routes.router, prefix=settings.API_PREFIX)
 
     return app
 
@@ -55,12 +102,18 @@ def create_app() -> FastAPI:
 app = create_app()
 
 if __name__ == "__main__":
-    import uvicorn
-
-    uvicorn.run(
-        "src.api.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.DEBUG,
-        log_level="info",
-    )
+    if settings.PRELOAD_MODELS and not settings.DEBUG:
+        # Modelos carregados uma vez no processo pai e compartilhados pelos workers
+        serve(app, host="0.0.0.0", port=8000, workers=settings.UVICORN_WORKERS)
+    else:
+        import uvicorn
+
+        uvicorn.run(
+            "src.api.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=settings.DEBUG,
+            workers=settings.UVICORN_WORKERS,
+            log_level="info",
+            access_log=True,
+        )
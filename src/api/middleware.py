@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+import math
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.services.auth_service import auth_service
+from src.services.metrics import metrics
+from src.services.rate_limiter import RateLimiter, rate_limiter
+
+
+def _route_label(scope: Scope) -> str:
+    """Caminho do template da rota (ex.: /api/v1/segment/), evitando uma série
+    por URL"""
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    # Conforme a versão do FastAPI o template não inclui o prefixo do router;
+    # o prefixo é recuperado do caminho concreto
+    parts = scope["path"].split("/")
+    return "/".join(parts[: max(1, len(parts) - template.count("/"))]) + template
+
+
+class MetricsMiddleware:
+    """Mede a latência de cada requisição HTTP por rota, idioma e status.
+
+    Middleware ASGI puro: não consome o corpo da requisição (compatível com o
+    endpoint de streaming) e mede até o envio do último bloco da resposta.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # O idioma é definido pelas rotas em request.state
+            language = scope.get("state", {}).get("language")
+            metrics.observe_request(
+                scope["method"],
+                _route_label(scope),
+                language,
+                status,
+                time.perf_counter() - started,
+            )
+
+
+def _client_identity(scope: Scope, api_keys: frozenset[str], trust_proxy: bool) -> str:
+    """Identidade do cliente para o rate limit: sub do JWT válido, API key
+    conhecida ou IP (chaves não reconhecidas não ganham bucket próprio)"""
+    headers = dict(scope.get("headers", []))
+
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        claims = auth_service.verify_token(token.strip())
+        if claims and claims.get("sub"):
+            return f"sub:{claims['sub']}"
+
+    api_key = headers.get(b"x-api-key", b"").decode("latin-1")
+    if api_key and api_key in api_keys:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    if trust_proxy:
+        # X-Real-IP é definido pelo nginx; no X-Forwarded-For só o último salto
+        # (acrescentado pelo proxy confiável) é usado, os anteriores vêm do cliente
+        real_ip = headers.get(b"x-real-ip", b"").decode("latin-1").strip()
+        forwarded = headers.get(b"x-forwarded-for", b"").decode("latin-1")
+        address = real_ip or forwarded.rsplit(",", 1)[-1].strip()
+        if address:
+            return "ip:" + address
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """Controle de admissão por cliente com token buckets ponderados pelo custo.
+
+    O custo é estimado pelo Content-Length (textos longos e lotes grandes custam
+    mais) e verificado antes de a requisição chegar às rotas: clientes acima do
+    limite recebem 429 com Retry-After sem ocupar os workers de NLP. Corpos sem
+    Content-Length (streaming) são debitados conforme chegam.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[RateLimiter] = None,
+        paths: Optional[list[str]] = None,
+        api_keys: Optional[list[str]] = None,
+        trust_proxy: Optional[bool] = None,
+    ):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+        if paths is None:
+            paths = [
+                settings.API_PREFIX + path.strip()
+                for path in settings.RATE_LIMIT_PATHS.split(",")
+                if path.strip()
+            ]
+        self.paths = tuple(paths)
+        if api_keys is None:
+            api_keys = settings.RATE_LIMIT_API_KEYS.split(",")
+        self.api_keys = frozenset(key.strip() for key in api_keys if key.strip())
+        self.trust_proxy = (
+            settings.RATE_LIMIT_TRUST_PROXY if trust_proxy is None else trust_proxy
+        )
+        # Backends compartilhados fazem I/O: rodam fora do event loop
+        self._blocking = self.limiter.backend.backend != "memory"
+
+    async def _call(self, function, *args):
+        if self._blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not self.limiter.enabled
+            or not scope["path"].startswith(self.paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        try:
+            declared = max(0, int(headers.get(b"content-length", b"0")))
+        except ValueError:
+            declared = 0
+
+        client = _client_identity(scope, self.api_keys, self.trust_proxy)
+        wait = await self._call(self.limiter.admit, client, declared)
+        if wait:
+            metrics.rate_limited.inc(client.partition(":")[0])
+            await self._reject(send, wait)
+            return
+
+        received = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        try:
+            await self.app(scope, receive_wrapper, send)
+        finally:
+            if received > declared:
+                await self._call(self.limiter.charge, client, received - declared)
+
+    async def _reject(self, send: Send, wait: float) -> None:
+        """Responde 429 com o tempo de espera sugerido"""
+        body = json.dumps(
+            {"detail": "Limite de requisições excedido, tente novamente mais tarde"}
+        ).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(wait))).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
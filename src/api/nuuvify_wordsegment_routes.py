@@ -1,20 +1,329 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import AsyncIterator, Literal, Optional, Union
 
-from src.core.models import WordSegmentationRequest, WordSegmentationResponse
-from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from src.api.responses import (
+    SegmentationJSONResponse,
+    dumps,
+    segmentation_record,
+)
+from src.core.config import settings
+from src.core.models import (
+    WordSegmentationBatchRequest,
+    WordSegmentationBatchResponse,
+    WordSegmentationRequest,
+    WordSegmentationResponse,
+)
+from src.services.micro_batcher import micro_batcher
+from src.services.segmentation_executor import (
+    ExecutorSaturatedError,
+    segmentation_executor,
+)
 
 router = APIRouter(prefix="/segment", tags=["Word Segmentation"])
 
 
-@router.post("/", response_model=WordSegmentationResponse)
-async def segment_text(input_data: WordSegmentationRequest):
+def _batch_language(languages: list[str]) -> str:
+    """Idioma do lote para as métricas ("mixed" quando há mais de um)"""
+    unique = set(languages)
+    return unique.pop() if len(unique) == 1 else "mixed"
+
+
+def _check_top_k(items: list[WordSegmentationRequest]) -> None:
+    """Valida o top_k pedido contra os limites configurados; as alternativas vêm
+    do modelo de léxico (Viterbi) e não são oferecidas com engine=spacy"""
+    limit = settings.SEGMENTATION_MAX_TOP_K
+    max_chars = settings.SEGMENTATION_MAX_TOP_K_CHARS
+    for item in items:
+        if item.top_k is not None and item.top_k > limit:
+            raise HTTPException(
+                status_code=422,
+                detail=f"top_k {item.top_k} excede o limite de {limit}",
+            )
+        if item.top_k and item.engine == "spacy":
+            raise HTTPException(
+                status_code=422,
+                detail="top_k requer o motor 'viterbi'",
+            )
+        if item.top_k and len(item.text) > max_chars:
+            raise HTTPException(
+                status_code=422,
+                detail=f"top_k aceita textos de até {max_chars} caracteres",
+            )
+
+
+def _check_text_size(items: list[WordSegmentationRequest]) -> None:
+    """Rejeita textos acima do limite de caracteres antes de enfileirar trabalho"""
+    limit = settings.SEGMENTATION_MAX_INPUT_CHARS
+    for item in items:
+        if limit > 0 and len(item.text) > limit:
+            raise HTTPException(
+                status_code=413,
+                detail=(
+                    f"Texto com {len(item.text)} caracteres excede o limite de "
+                    f"{limit}"
+                ),
+            )
+
+
+@router.post(
+    "/",
+    response_model=WordSegmentationResponse,
+    response_model_exclude_none=True,
+    response_class=SegmentationJSONResponse,
+)
+async def segment_text(input_data: WordSegmentationRequest, request: Request):
     """Segmenta e formata texto usando NLP"""
+    request.state.language = input_data.language
+    _check_text_size([input_data])
+    _check_top_k([input_data])
     try:
-        result = nuuvify_wordsegment_service.segment_and_format(
-            input_data.text, input_data.language
+        if not input_data.top_k:
+            # Requisições concorrentes do mesmo idioma/motor viram um único lote
+            result = await micro_batcher.segment_and_format(
+                input_data.text,
+                input_data.language,
+                input_data.engine,
+                input_data.tenant,
+            )
+            return SegmentationJSONResponse(
+                segmentation_record(input_data.text, result)
+            )
+
+        # Uma passada k-best: o texto formatado é a melhor alternativa
+        (ranked,) = await segmentation_executor.segment_alternatives(
+            [
+                (
+                    input_data.text,
+                    input_data.language,
+                    input_data.tenant,
+                    input_data.top_k,
+                )
+            ]
+        )
+        return SegmentationJSONResponse(
+            segmentation_record(input_data.text, ranked[0][0], ranked)
+        )
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except TimeoutError:
+        raise HTTPException(
+            status_code=504, detail="Tempo limite excedido ao processar texto"
         )
-        return WordSegmentationResponse(original=input_data.text, formatted=result)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Erro ao processar texto: {str(e)}"
         )
+
+
+@router.post(
+    "/batch",
+    response_model=WordSegmentationBatchResponse,
+    response_model_exclude_none=True,
+    response_class=SegmentationJSONResponse,
+)
+async def segment_batch(input_data: WordSegmentationBatchRequest, request: Request):
+    """Segmenta e formata vários textos em uma única requisição"""
+    request.state.language = _batch_language(
+        [item.language for item in input_data.items]
+    )
+    if len(input_data.items) > settings.SEGMENTATION_MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Lote com {len(input_data.items)} itens excede o limite de "
+                f"{settings.SEGMENTATION_MAX_BATCH_ITEMS}"
+            ),
+        )
+    _check_text_size(input_data.items)
+    _check_top_k(input_data.items)
+
+    plain_items = [item for item in input_data.items if not item.top_k]
+    ranked_items = [item for item in input_data.items if item.top_k]
+
+    async def no_results() -> list:
+        return []
+
+    try:
+        # Itens com top_k: o texto formatado é a melhor alternativa k-best
+        results, ranked_lists = await asyncio.gather(
+            (
+                segmentation_executor.segment_batch(
+                    [
+                        (item.text, item.language, item.engine, item.tenant)
+                        for item in plain_items
+                    ]
+                )
+                if plain_items
+                else no_results()
+            ),
+            (
+                segmentation_executor.segment_alternatives(
+                    [
+                        (item.text, item.language, item.tenant, item.top_k)
+                        for item in ranked_items
+                    ]
+                )
+                if ranked_items
+                else no_results()
+            ),
+        )
+        formatted, ranked = iter(results), iter(ranked_lists)
+        records = []
+        for item in input_data.items:
+            if item.top_k:
+                alternatives = next(ranked)
+                records.append(
+                    segmentation_record(item.text, alternatives[0][0], alternatives)
+                )
+            else:
+                records.append(segmentation_record(item.text, next(formatted)))
+        return SegmentationJSONResponse({"results": records})
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except TimeoutError:
+        raise HTTPException(
+            status_code=504, detail="Tempo limite excedido ao processar lote"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao processar lote: {str(e)}")
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse que consome o corpo da requisição enquanto responde.
+
+    A implementação padrão escuta desconexões com um receive() concorrente,
+    que disputaria as mensagens do corpo com o gerador; aqui a desconexão é
+    detectada pela própria leitura do corpo (request.stream).
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _parse_stream_line(
+    line: bytes,
+    plain: bool,
+    language: Optional[str],
+    engine: Optional[str],
+    tenant: Optional[str] = None,
+) -> Union[tuple[str, str, Optional[str], Optional[str]], str]:
+    """Converte uma linha do stream em (texto, idioma, motor, tenant) ou mensagem
+    de erro"""
+    if plain:
+        text = line.decode("utf-8", errors="replace").rstrip("\r")
+        parsed = (text, language, engine, tenant)
+    else:
+        try:
+            item = WordSegmentationRequest.model_validate_json(line)
+        except ValidationError as e:
+            return f"Linha inválida: {e.errors()[0]['msg']}"
+        parsed = (
+            item.text,
+            item.language,
+            item.engine or engine,
+            item.tenant or tenant,
+        )
+
+    limit = settings.SEGMENTATION_MAX_INPUT_CHARS
+    if limit > 0 and len(parsed[0]) > limit:
+        return f"Texto com {len(parsed[0])} caracteres excede o limite de {limit}"
+    return parsed
+
+
+async def _iter_stream_lines(
+    request: Request,
+) -> AsyncIterator[list[Optional[bytes]]]:
+    """Lê o corpo incrementalmente e produz as linhas completas já recebidas
+    (None marca uma linha descartada por exceder o tamanho máximo)"""
+    max_line = settings.SEGMENTATION_STREAM_MAX_LINE_BYTES
+    buffer = b""
+    discarding = False
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if discarding and lines:
+            # Descarta o restante da linha longa demais
+            lines, discarding = lines[1:], False
+        if len(buffer) > max_line:
+            if not discarding:
+                lines.append(None)  # Marca a linha descartada
+            buffer, discarding = b"", True
+        if lines:
+            yield lines
+
+    if buffer.strip() and not discarding:
+        yield [buffer]
+
+
+async def _stream_segmentation(
+    request: Request,
+    plain: bool,
+    language: Optional[str],
+    engine: Optional[str],
+    tenant: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """Pipeline: linhas recebidas -> lotes limitados -> resultados NDJSON"""
+    chunk_size = max(1, settings.SEGMENTATION_STREAM_CHUNK_SIZE)
+
+    async for lines in _iter_stream_lines(request):
+        for start in range(0, len(lines), chunk_size):
+            parsed = []
+            for line in lines[start : start + chunk_size]:
+                if line is None:
+                    parsed.append("Linha excede o tamanho máximo")
+                elif line.strip():
+                    parsed.append(
+                        _parse_stream_line(line, plain, language, engine, tenant)
+                    )
+
+            items = [item for item in parsed if isinstance(item, tuple)]
+            error = None
+            results: list[str] = []
+            try:
+                if items:
+                    results = await segmentation_executor.segment_batch(items)
+            except ExecutorSaturatedError as e:
+                error = str(e)
+            except TimeoutError:
+                error = "Tempo limite excedido ao processar texto"
+            except Exception as e:
+                error = f"Erro ao processar texto: {str(e)}"
+
+            formatted = iter(results)
+            for item in parsed:
+                if isinstance(item, str):
+                    record = {"error": item}
+                elif error is not None:
+                    record = {"original": item[0], "error": error}
+                else:
+                    record = {"original": item[0], "formatted": next(formatted)}
+                yield dumps(record) + b"\n"
+
+
+@router.post("/stream")
+async def segment_stream(
+    request: Request,
+    language: Optional[Literal["pt", "en"]] = None,
+    engine: Optional[Literal["spacy", "viterbi"]] = None,
+    tenant: Optional[str] = None,
+):
+    """Segmenta textos em streaming (NDJSON ou texto puro, uma entrada por linha)"""
+    plain = request.headers.get("content-type", "").startswith("text/plain")
+    request.state.language = language or "mixed"
+    if plain and language is None:
+        raise HTTPException(
+            status_code=422,
+            detail="Parâmetro 'language' obrigatório para entrada em texto puro",
+        )
+
+    return _DuplexStreamingResponse(
+        _stream_segmentation(request, plain, language, engine, tenant),
+        media_type="application/x-ndjson",
+    )
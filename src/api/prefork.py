@@ -0,0 +1,134 @@
+"""
+Servidor pre-fork: carrega os modelos no processo pai e só então cria os workers,
+que compartilham as páginas de memória dos modelos via copy-on-write
+"""
+
+import gc
+import os
+import signal
+import socket
+import time
+import traceback
+
+import uvicorn
+from fastapi import FastAPI
+
+from src.core.config import settings
+from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+
+
+def _split(value: str) -> list[str]:
+    """Converte uma lista separada por vírgulas das configurações"""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def preload_models() -> dict[str, float]:
+    """Carrega os modelos dos idiomas configurados"""
+    timings = nuuvify_wordsegment_service.preload(_split(settings.PRELOAD_LANGUAGES))
+    for name, seconds in timings.items():
+        print(f"Modelo '{name}' pré-carregado em {seconds:.2f}s")
+    return timings
+
+
+def warmup_models() -> dict:
+    """Carrega e aquece os modelos dos idiomas/motores configurados"""
+    report = nuuvify_wordsegment_service.warmup(
+        _split(settings.PRELOAD_LANGUAGES), _split(settings.WARMUP_ENGINES) or None
+    )
+    print(
+        f"Aquecimento {nuuvify_wordsegment_service.warmup_state} "
+        f"em {report['warmup_seconds']:.2f}s: {report['models']}"
+    )
+    return report
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    """Cria o socket de escuta compartilhado pelos workers"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app: FastAPI, sock: socket.socket, log_level: str) -> None:
+    """Executa um worker uvicorn no socket herdado (processo filho)"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    host, port = sock.getsockname()[:2]
+    # Mantém o access log do antigo CMD (uvicorn ... --access-log)
+    config = uvicorn.Config(
+        app, host=host, port=port, log_level=log_level, access_log=True
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(
+    app: FastAPI,
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 4,
+    log_level: str = "info",
+) -> None:
+    """Pré-carrega os modelos, cria os workers por fork e os supervisiona"""
+    preload_models()
+    sock = _bind_socket(host, port)
+
+    # Move os objetos já carregados para a geração permanente do GC, evitando que
+    # as coletas nos workers toquem (e copiem) as páginas compartilhadas
+    gc.freeze()
+
+    children: set[int] = set()
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            # Código de saída diferente de zero quando o worker falha (ex.: na
+            # inicialização), para o status registrado pelo processo pai
+            code = 1
+            try:
+                _run_worker(app, sock, log_level)
+                code = 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        children.add(pid)
+        print(f"Worker {pid} iniciado")
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(max(1, workers)):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            code = os.waitstatus_to_exitcode(status)
+            print(f"Worker {pid} encerrado (status {code}), reiniciando...")
+            time.sleep(1)
+            # O SIGTERM pode ter chegado durante a espera: o novo worker não o
+            # receberia e o processo pai ficaria bloqueado em os.wait()
+            if not stopping:
+                spawn()
+
+    sock.close()
+    print("Servidor pre-fork encerrado")
@@ -0,0 +1,46 @@
+"""
+Respostas JSON das rotas de segmentação, serializadas sem revalidar o modelo
+"""
+
+import json
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+
+from src.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # Extra opcional: pip install .[fast-json]
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa em JSON UTF-8: orjson (direto em bytes) quando instalado e ativo,
+    senão json com as mesmas opções do JSONResponse"""
+    if orjson is not None and settings.FAST_JSON_RESPONSES:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class SegmentationJSONResponse(JSONResponse):
+    """Resposta para conteúdo já no formato do response_model (saída confiável do
+    serviço): o FastAPI não revalida nem converte um Response devolvido pela rota"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def segmentation_record(
+    original: str, formatted: str, ranked: Optional[list[tuple[str, float]]] = None
+) -> dict:
+    """Corpo de um WordSegmentationResponse (sem alternatives quando não pedidas,
+    como em response_model_exclude_none)"""
+    record: dict[str, Any] = {"original": original, "formatted": formatted}
+    if ranked is not None:
+        record["alternatives"] = [
+            {"formatted": alternative, "score": score} for alternative, score in ranked
+        ]
+    return record
@@ -1,9 +1,19 @@
+import os
 from datetime import datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, Response
 
 from src.core.config import settings
 from src.core.models import StatusResponse
+from src.services.metrics import (
+    CONTENT_TYPE,
+    metrics,
+    process_rss_bytes,
+    render_samples,
+)
+from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+from src.services.segmentation_executor import segmentation_executor
 
 router = APIRouter()
 
@@ -41,3 +51,77 @@ async def health_check():
             ),
         },
     }
+
+
+@router.get("/health/live")
+async def liveness_check():
+    """Liveness: o processo está de pé e o event loop responde"""
+    return {"status": "alive", "timestamp": datetime.utcnow()}
+
+
+@router.get("/health/ready")
+async def readiness_check():
+    """Readiness: modelos carregados e aquecidos; 503 enquanto não estiver pronto"""
+    readiness = nuuvify_wordsegment_service.readiness()
+    return JSONResponse(
+        status_code=200 if readiness["ready"] else 503,
+        content=readiness,
+    )
+
+
+def _runtime_metrics() -> list[str]:
+    """Métricas coletadas no momento da leitura (cache, executor e memória)"""
+    service = nuuvify_wordsegment_service
+    caches = [("local", service.cache.stats())]
+    if service.shared_cache is not None:
+        caches.append(("shared", service.shared_cache.stats()))
+
+    def by_cache(field: str) -> list[tuple[dict, float]]:
+        return [({"cache": name}, stats[field]) for name, stats in caches]
+
+    pid = {"pid": str(os.getpid())}
+    lines = []
+    lines += render_samples(
+        "nuuvify_cache_hits_total", "Acertos do cache", by_cache("hits"), "counter"
+    )
+    lines += render_samples(
+        "nuuvify_cache_misses_total", "Faltas do cache", by_cache("misses"), "counter"
+    )
+    lines += render_samples(
+        "nuuvify_cache_hit_ratio", "Taxa de acerto do cache", by_cache("hit_ratio")
+    )
+    lines += render_samples(
+        "nuuvify_cache_entries",
+        "Entradas no cache local",
+        [({"cache": "local"}, caches[0][1]["entries"])],
+    )
+    lines += render_samples(
+        "nuuvify_executor_queue_depth",
+        "Tarefas aguardando um worker do executor",
+        [(pid, segmentation_executor.queue_depth)],
+    )
+    lines += render_samples(
+        "nuuvify_executor_inflight",
+        "Tarefas em execução ou na fila do executor",
+        [(pid, segmentation_executor.inflight)],
+    )
+    lines += render_samples(
+        "nuuvify_executor_capacity",
+        "Tarefas aceitas simultaneamente antes de responder 503",
+        [(pid, segmentation_executor.capacity)],
+    )
+    lines += render_samples(
+        "nuuvify_process_resident_memory_bytes",
+        "Memória residente (RSS) do worker",
+        [(pid, process_rss_bytes())],
+    )
+    return lines
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Métricas no formato de exposição do Prometheus"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Métricas desativadas")
+    body = "\n".join(metrics.render() + _runtime_metrics()) + "\n"
+    return Response(content=body, media_type=CONTENT_TYPE)
@@ -0,0 +1,43 @@
+import asyncio
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+
+from src.core.config import settings
+from src.core.models import ApiResponse
+from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+
+router = APIRouter(prefix="/vocabulary", tags=["Vocabulary"])
+
+
+@router.get("/")
+async def get_vocabulary():
+    """Versão e tamanho do vocabulário de siglas/palavras de domínio carregado"""
+    return ApiResponse(
+        message="Vocabulário carregado",
+        data=nuuvify_wordsegment_service.vocabulary.stats(),
+    )
+
+
+@router.post("/reload")
+async def reload_vocabulary(x_admin_token: Optional[str] = Header(None)):
+    """Força a recarga do vocabulário neste worker (requer X-Admin-Token)"""
+    expected = settings.VOCABULARY_ADMIN_TOKEN
+    if not expected or not hmac.compare_digest(
+        (x_admin_token or "").encode(), expected.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Token de administração inválido")
+
+    store = nuuvify_wordsegment_service.vocabulary
+    # A origem pode ser o Key Vault (E/S bloqueante): fora do event loop
+    changed = await asyncio.to_thread(store.reload, True)
+    if store.last_error is not None:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Erro ao recarregar vocabulário: {store.last_error}",
+        )
+    return ApiResponse(
+        message="Vocabulário atualizado" if changed else "Vocabulário inalterado",
+        data={"version": store.current.version, "changed": changed},
+    )
@@ -0,0 +1,276 @@
+"""
+CLI de segmentação em massa (nuuvify-segment) para arquivos texto, CSV e TSV
+"""
+
+import argparse
+import csv
+import io
+import json
+import mmap
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+from multiprocessing.pool import AsyncResult
+from typing import Iterator, Optional
+
+from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+
+# Configuração do worker (definida no initializer de cada processo)
+_worker_options: dict = {}
+
+
+def _detect_format(path: str, explicit: Optional[str]) -> str:
+    """Determina o formato pelo argumento ou pela extensão do arquivo"""
+    if explicit:
+        return explicit
+    extension = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".tsv": "tsv"}.get(extension, "text")
+
+
+def _init_worker(options: dict) -> None:
+    """Carrega o modelo uma única vez por processo"""
+    _worker_options.update(options)
+    nuuvify_wordsegment_service.preload([options["language"]], [options["engine"]])
+
+
+def _segment_texts(
+    texts: list[str], language: str, engine: str, tenant: Optional[str]
+) -> list[str]:
+    """Segmenta os textos em lote; se algum for recusado (ex.: acima do limite de
+    tamanho), segmenta um a um e deixa vazio o campo dos recusados"""
+    try:
+        return nuuvify_wordsegment_service.segment_many(texts, language, engine, tenant)
+    except ValueError:
+        results = []
+        for text in texts:
+            try:
+                results.append(
+                    nuuvify_wordsegment_service.segment_and_format(
+                        text, language, engine, tenant
+                    )
+                )
+            except ValueError as e:
+                print(f"Linha não segmentada: {e}", file=sys.stderr)
+                results.append("")
+        return results
+
+
+def _segment_chunk(lines: list[bytes]) -> str:
+    """Segmenta um bloco de linhas e devolve a saída já serializada"""
+    options = _worker_options
+    language, engine, tenant = options["language"], options["engine"], options["tenant"]
+    decoded = [line.decode("utf-8", errors="replace") for line in lines]
+
+    if options["format"] == "text":
+        texts = [line.rstrip("\r\n") for line in decoded]
+        results = _segment_texts(texts, language, engine, tenant)
+        return "".join(f"{formatted}\n" for formatted in results)
+
+    delimiter = "," if options["format"] == "csv" else "\t"
+    rows = list(csv.reader(decoded, delimiter=delimiter))
+    column = options["column"]
+    texts = [row[column] if column < len(row) else "" for row in rows]
+    results = _segment_texts(texts, language, engine, tenant)
+
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=delimiter, lineterminator="\n")
+    for row, formatted in zip(rows, results):
+        writer.writerow([*row, formatted])
+    return output.getvalue()
+
+
+def _imap_bounded(
+    pool: Pool, chunks: Iterator[tuple[list[bytes], int]], limit: int
+) -> Iterator[tuple[str, int, int]]:
+    """Segmenta os blocos no pool, com no máximo limit em voo (memória constante),
+    e devolve (saída, linhas, offset final) na ordem do arquivo. Os envios são
+    feitos pela thread principal: uma falha não deixa o pool esperando vagas"""
+    pending: deque[tuple[AsyncResult, int, int]] = deque()
+    for lines, end_offset in chunks:
+        result = pool.apply_async(_segment_chunk, (lines,))
+        pending.append((result, len(lines), end_offset))
+        if len(pending) >= limit:
+            result, count, end = pending.popleft()
+            yield result.get(), count, end
+    while pending:
+        result, count, end = pending.popleft()
+        yield result.get(), count, end
+
+
+def _iter_chunks(
+    mm: mmap.mmap, offset: int, chunk_lines: int
+) -> Iterator[tuple[list[bytes], int]]:
+    """Lê blocos de linhas do arquivo mapeado, com o offset final de cada bloco"""
+    mm.seek(offset)
+    while True:
+        lines = []
+        for _ in range(chunk_lines):
+            line = mm.readline()
+            if not line:
+                break
+            lines.append(line)
+        if not lines:
+            return
+        yield lines, mm.tell()
+
+
+def _load_checkpoint(path: Optional[str]) -> dict:
+    """Lê o checkpoint (offsets de entrada/saída e linhas processadas)"""
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    return {"input_offset": 0, "output_offset": 0, "lines": 0}
+
+
+def _save_checkpoint(path: Optional[str], checkpoint: dict) -> None:
+    """Grava o checkpoint de forma atômica"""
+    if not path:
+        return
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as fh:
+        json.dump(checkpoint, fh)
+    os.replace(temporary, path)
+
+
+def _resolve_column(header: bytes, column: str, delimiter: str) -> int:
+    """Converte o nome ou índice da coluna em índice"""
+    if column.isdigit():
+        return int(column)
+    names = next(csv.reader([header.decode("utf-8-sig")], delimiter=delimiter))
+    if column not in names:
+        raise SystemExit(f"Coluna '{column}' não encontrada no cabeçalho: {names}")
+    return names.index(column)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(
+        prog="nuuvify-segment",
+        description="Segmenta textos de arquivos em massa usando múltiplos processos",
+    )
+    parser.add_argument("input", help="Arquivo de entrada (texto, CSV ou TSV)")
+    parser.add_argument("-o", "--output", help="Arquivo de saída (padrão: stdout)")
+    parser.add_argument("-l", "--language", choices=["pt", "en"], default="pt")
+    parser.add_argument("-e", "--engine", choices=["spacy", "viterbi"])
+    parser.add_argument("-f", "--format", choices=["text", "csv", "tsv"])
+    parser.add_argument("-t", "--tenant", help="Tenant do vocabulário de domínio")
+    parser.add_argument(
+        "-c", "--column", default="0", help="Coluna (nome ou índice) em CSV/TSV"
+    )
+    parser.add_argument(
+        "--no-header", action="store_true", help="CSV/TSV sem linha de cabeçalho"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-lines", type=int, default=1000)
+    parser.add_argument(
+        "--checkpoint", help="Arquivo de checkpoint para retomar o processamento"
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Ponto de entrada do nuuvify-segment"""
+    args = build_parser().parse_args(argv)
+    if args.checkpoint and not args.output:
+        raise SystemExit("--checkpoint requer --output")
+
+    file_format = _detect_format(args.input, args.format)
+    delimiter = "," if file_format == "csv" else "\t"
+    options = {
+        "language": args.language,
+        "engine": args.engine or nuuvify_wordsegment_service.default_engine,
+        "tenant": args.tenant,
+        "format": file_format,
+        "column": int(args.column) if args.column.isdigit() else 0,
+    }
+
+    checkpoint = _load_checkpoint(args.checkpoint)
+    if os.path.getsize(args.input) == 0:
+        return 0
+
+    with (
+        open(args.input, "rb") as source,
+        mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        if args.output:
+            output = open(args.output, "a+", encoding="utf-8", newline="")
+            # Descarta saída gravada após o último checkpoint
+            output.truncate(checkpoint["output_offset"])
+            output.seek(checkpoint["output_offset"])
+        else:
+            output = sys.stdout
+
+        offset = checkpoint["input_offset"]
+        if file_format != "text" and not args.no_header:
+            mm.seek(0)
+            header = mm.readline()
+            options["column"] = _resolve_column(header, args.column, delimiter)
+            if offset == 0:
+                names = next(
+                    csv.reader([header.decode("utf-8-sig")], delimiter=delimiter)
+                )
+                csv.writer(output, delimiter=delimiter, lineterminator="\n").writerow(
+                    [*names, "formatted"]
+                )
+                offset = mm.tell()
+
+        chunks = _iter_chunks(mm, offset, max(1, args.chunk_lines))
+        pool = None
+        if args.workers > 1:
+            pool = Pool(args.workers, initializer=_init_worker, initargs=(options,))
+            results = _imap_bounded(pool, chunks, args.workers * 2)
+        else:
+            _init_worker(options)
+            results = (
+                (_segment_chunk(lines), len(lines), end_offset)
+                for lines, end_offset in chunks
+            )
+
+        started = last_report = time.perf_counter()
+        processed = 0
+        try:
+            for text, lines_in_chunk, end_offset in results:
+                output.write(text)
+                output.flush()
+
+                processed += lines_in_chunk
+                checkpoint = {
+                    "input_offset": end_offset,
+                    "output_offset": output.tell() if args.output else 0,
+                    "lines": checkpoint["lines"] + lines_in_chunk,
+                }
+                _save_checkpoint(args.checkpoint, checkpoint)
+
+                now = time.perf_counter()
+                if now - last_report >= 1:
+                    rate = processed / (now - started)
+                    print(
+                        f"{checkpoint['lines']} linhas ({rate:,.0f} linhas/s)",
+                        file=sys.stderr,
+                    )
+                    last_report = now
+        except BrokenPipeError:
+            # Leitor da saída padrão encerrado (ex.: "| head"); termina em silêncio
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 1
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            if args.output:
+                output.close()
+
+    elapsed = time.perf_counter() - started
+    rate = processed / elapsed if elapsed else 0.0
+    print(
+        f"Concluído: {processed} linhas em {elapsed:.2f}s ({rate:,.0f} linhas/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
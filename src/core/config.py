@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 from pydantic import HttpUrl
@@ -17,15 +18,120 @@ class Settings(BaseSettings):
     def version(self) -> str:
         return self.VERSION
 
-    AzureKeyVault__Dns: HttpUrl = ""
+    AzureKeyVault__Dns: Optional[HttpUrl] = None
     AzureKeyVault__ClientId: str = ""
     AzureKeyVault__ClientSecret: str = ""
     AzureKeyVault__TenantId: str = ""
+    # Key Vault: TTL do cache de segredos (segundos, 0 desativa) e segredos
+    # adicionais pré-carregados na inicialização (separados por vírgula)
+    KEYVAULT_CACHE_TTL_SECONDS: float = 300
+    KEYVAULT_PREFETCH_SECRETS: str = ""
     DEBUG: bool = False
     API_PREFIX: str = "/api/v1"
     SECRET_KEY: str = ""
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Autenticação: threads para o bcrypt (concorrência máxima) e cache de
+    # tokens verificados (entradas e TTL máximo; cada token expira no seu exp)
+    AUTH_HASH_WORKERS: int = 2
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: float = 300
+
+    # Segmentação: motor padrão ("spacy" ou "viterbi") e léxicos do Viterbi
+    SEGMENTATION_ENGINE: str = "spacy"
+    SEGMENTATION_LEXICON_DIR: str = ""
+    SEGMENTATION_MAX_WORD_LENGTH: int = 24
+    # Textos a partir deste tamanho usam a pontuação vetorizada (NumPy) do
+    # Viterbi sobre o índice compilado (0 desativa)
+    SEGMENTATION_VECTORIZED_MIN_LENGTH: int = 96
+    # Máximo de segmentações alternativas (top_k) por texto e tamanho máximo
+    # (caracteres) dos textos com top_k: o k-best não é dividido em janelas
+    SEGMENTATION_MAX_TOP_K: int = 10
+    SEGMENTATION_MAX_TOP_K_CHARS: int = 2000
+
+    # Textos longos: limite de caracteres por texto (0 = sem limite, verificado
+    # antes do motor), tamanho dos pedaços processados um a um (0 desativa) e
+    # sobreposição das janelas do Viterbi em sequências de letras longas
+    SEGMENTATION_MAX_INPUT_CHARS: int = 100_000
+    SEGMENTATION_CHUNK_SIZE: int = 2000
+    SEGMENTATION_CHUNK_OVERLAP: int = 64
+
+    # Respostas de /segment/ serializadas com orjson quando instalado
+    # (pip install .[fast-json]); desativado ou ausente, usa o json da stdlib
+    FAST_JSON_RESPONSES: bool = True
+
+    # Atalho sem NLP para textos em CamelCase, com separadores ou palavras
+    # conhecidas (só o restante passa pelo motor)
+    SEGMENTATION_FAST_PATH: bool = True
+
+    # Perfil de carga do spaCy: "full", "tokenizer" (só tokenização) ou "blank"
+    SPACY_LOAD_PROFILE: str = "tokenizer"
+
+    # Lotes: tamanho/processos do nlp.pipe e limite de itens por requisição
+    SEGMENTATION_BATCH_SIZE: int = 256
+    SEGMENTATION_N_PROCESS: int = 1
+    SEGMENTATION_MAX_BATCH_ITEMS: int = 1000
+
+    # Streaming: linhas por lote e tamanho máximo de cada linha (bytes)
+    SEGMENTATION_STREAM_CHUNK_SIZE: int = 64
+    SEGMENTATION_STREAM_MAX_LINE_BYTES: int = 1024 * 1024
+
+    # Cache de resultados: entradas (0 desativa), bytes (0 = sem limite) e TTL
+    SEGMENTATION_CACHE_MAX_ENTRIES: int = 10000
+    SEGMENTATION_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    SEGMENTATION_CACHE_TTL_SECONDS: float = 0
+
+    # Cache compartilhado (segundo nível): "sqlite", "redis" ou vazio (desativado);
+    # URL é o caminho do arquivo SQLite ou a URL do Redis; entradas máximas do
+    # SQLite (0 = sem limite)
+    SEGMENTATION_SHARED_CACHE: str = ""
+    SEGMENTATION_SHARED_CACHE_URL: str = ""
+    SEGMENTATION_SHARED_CACHE_TTL_SECONDS: float = 86400
+    SEGMENTATION_SHARED_CACHE_MAX_ENTRIES: int = 1_000_000
+
+    # Servidor: workers e pré-carga dos modelos no processo pai antes do fork
+    UVICORN_WORKERS: int = 1
+    PRELOAD_MODELS: bool = False
+    PRELOAD_LANGUAGES: str = "pt,en"
+
+    # Aquecimento na inicialização (readiness só fica pronta ao final)
+    WARMUP_ON_STARTUP: bool = False
+    WARMUP_ENGINES: str = ""
+
+    # Executor: "thread" ou "process", workers, fila máxima e timeout (segundos)
+    SEGMENTATION_EXECUTOR: str = "thread"
+    SEGMENTATION_EXECUTOR_WORKERS: int = 4
+    SEGMENTATION_EXECUTOR_MAX_QUEUE: int = 64
+    SEGMENTATION_TIMEOUT_SECONDS: float = 10.0
+
+    # Micro-batching de /segment/: espera máxima (ms, 0 desativa) e itens por lote
+    SEGMENTATION_MICROBATCH_WAIT_MS: float = 2.0
+    SEGMENTATION_MICROBATCH_MAX_ITEMS: int = 64
+
+    # Rate limit por cliente (sub do JWT, API key conhecida ou IP) nas rotas de
+    # segmentação: tokens/s (0 desativa), capacidade, bytes do corpo por token,
+    # backend ("memory", "sqlite" ou "redis") e sua URL/caminho
+    RATE_LIMIT_RATE: float = 0
+    RATE_LIMIT_BURST: float = 60
+    RATE_LIMIT_BYTES_PER_TOKEN: int = 1024
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_URL: str = ""
+    # Prefixos (após API_PREFIX) sujeitos ao limite, API keys com bucket próprio
+    # e se X-Real-IP/X-Forwarded-For (definidos pelo nginx) identificam o cliente
+    RATE_LIMIT_PATHS: str = "/segment"
+    RATE_LIMIT_API_KEYS: str = ""
+    RATE_LIMIT_TRUST_PROXY: bool = False
+
+    # Endpoint /metrics (formato Prometheus) e middleware de latência
+    METRICS_ENABLED: bool = True
+
+    # Vocabulário de siglas/palavras de domínio: arquivo JSON ou segredo do Key
+    # Vault, intervalo de verificação (segundos, 0 desativa) e token de recarga
+    SEGMENTATION_VOCABULARY_FILE: str = ""
+    SEGMENTATION_VOCABULARY_SECRET: str = ""
+    SEGMENTATION_VOCABULARY_RELOAD_SECONDS: float = 30
+    VOCABULARY_ADMIN_TOKEN: str = ""
+
     def __init__(self, **kwargs):
         environment = os.getenv("FLASK_ENV", "development").upper()
 
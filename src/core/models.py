@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class UserLogin(BaseModel):
@@ -29,11 +29,30 @@ class StatusResponse(BaseModel):
 class WordSegmentationRequest(BaseModel):
     text: str
     language: Literal["pt", "en"]
+    engine: Optional[Literal["spacy", "viterbi"]] = None
+    tenant: Optional[str] = None
+    # Quantidade de segmentações alternativas com score (k-best do Viterbi)
+    top_k: Optional[int] = Field(default=None, ge=1)
+
+
+class SegmentationAlternative(BaseModel):
+    formatted: str
+    # Log-probabilidade (logaritmo natural) da segmentação no modelo de léxico
+    score: float
 
 
 class WordSegmentationResponse(BaseModel):
     original: str
     formatted: str
+    alternatives: Optional[list[SegmentationAlternative]] = None
+
+
+class WordSegmentationBatchRequest(BaseModel):
+    items: list[WordSegmentationRequest]
+
+
+class WordSegmentationBatchResponse(BaseModel):
+    results: list[WordSegmentationResponse]
 
 
 class ApiResponse(BaseModel):
@@ -1,11 +1,16 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
-from jose import jwt
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from src.core.config import settings
 from src.core.models import Token, UserLogin, UserResponse
+from src.services.segmentation_cache import LRUCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -16,12 +21,61 @@ class AuthService:
         self.algorithm = "HS256"
         self.ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
+        # bcrypt (~100ms de CPU, libera o GIL) roda fora do event loop, com no
+        # máximo AUTH_HASH_WORKERS cálculos simultâneos
+        self.hash_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.AUTH_HASH_WORKERS),
+            thread_name_prefix="auth-hash",
+        )
+        # Tokens já verificados: SHA-256 do token -> claims, válidos até o exp
+        self.token_cache = LRUCache(
+            max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+        )
+
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         return pwd_context.verify(plain_password, hashed_password)
 
     def get_password_hash(self, password: str) -> str:
         return pwd_context.hash(password)
 
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """verify_password no pool de hashing, sem bloquear o event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.hash_executor, self.verify_password, plain_password, hashed_password
+        )
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """get_password_hash no pool de hashing, sem bloquear o event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.hash_executor, self.get_password_hash, password
+        )
+
+    def verify_token(self, token: str) -> Optional[dict]:
+        """Valida o JWT e retorna as claims (None se inválido ou expirado).
+
+        O resultado fica em cache pelo hash do token até o exp, evitando
+        repetir a verificação da assinatura a cada requisição.
+        """
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        claims = self.token_cache.get(key)
+        if claims is not None:
+            return dict(claims)
+
+        try:
+            claims = jwt.decode(token, self.SECRET_KEY, algorithms=[self.algorithm])
+        except JWTError:
+            return None
+
+        expires = claims.get("exp")
+        ttl = expires - time.time() if isinstance(expires, (int, float)) else None
+        self.token_cache.set(key, claims, ttl_seconds=ttl)
+        return dict(claims)
+
     def create_access_token(self, data: dict) -> str:
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
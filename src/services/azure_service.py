@@ -1,48 +1,190 @@
-from typing import Optional
-
-from azure.identity import ClientSecretCredential
-from azure.keyvault.secrets import SecretClient
+import asyncio
+import time
+from typing import Any, Callable, Optional
 
 from src.core.config import settings
 
+# Fração do TTL após a qual a atualização em segundo plano renova os segredos
+REFRESH_FRACTION = 0.8
+
+
+def create_secret_client(asynchronous: bool = False) -> Any:
+    """Cria o SecretClient (síncrono ou azure.*.aio) com as credenciais das settings"""
+    if asynchronous:
+        from azure.identity.aio import ClientSecretCredential
+        from azure.keyvault.secrets.aio import SecretClient
+    else:
+        from azure.identity import ClientSecretCredential
+        from azure.keyvault.secrets import SecretClient
+
+    credential = ClientSecretCredential(
+        tenant_id=settings.AzureKeyVault__TenantId,
+        client_id=settings.AzureKeyVault__ClientId,
+        client_secret=settings.AzureKeyVault__ClientSecret,
+    )
+    return SecretClient(
+        vault_url=settings.AzureKeyVault__Dns.unicode_string(),
+        credential=credential,
+    )
+
 
 class AzureKeyVaultService:
-    def __init__(self):
-        self.client: Optional[SecretClient] = None
-        self.connect_to_azure()
+    """Acesso ao Azure Key Vault com clientes criados sob demanda e cache com TTL.
 
-    def connect_to_azure(self) -> SecretClient:
-        """Conecta ao Azure Key Vault"""
-        try:
-            credential = ClientSecretCredential(
-                tenant_id=settings.AzureKeyVault__TenantId,
-                client_id=settings.AzureKeyVault__ClientId,
-                client_secret=settings.AzureKeyVault__ClientSecret,
-            )
-
-            self.client = SecretClient(
-                vault_url=settings.AzureKeyVault__Dns.unicode_string(),
-                credential=credential,
-            )
-            print("Conectado ao Azure Key Vault com sucesso")
+    Nada é conectado na importação: o cliente (síncrono ou assíncrono) é criado
+    no primeiro uso. Um segredo vencido ainda presente no cache é devolvido na
+    hora enquanto é renovado em segundo plano (get_secret_async).
+    """
 
-        except Exception as e:
-            print(f"Erro ao conectar ao Azure Key Vault: {e}")
-            self.client = None
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        client_factory: Optional[Callable[[bool], Any]] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.ttl = ttl_seconds
+        self.enabled = bool(settings.AzureKeyVault__Dns) if enabled is None else enabled
+        self._client_factory = client_factory or create_secret_client
+        self._client: Any = None
+        self._async_client: Any = None
+        # Nome -> (valor, instante de expiração em time.monotonic)
+        self._cache: dict[str, tuple[str, float]] = {}
+        # Buscas assíncronas em andamento por nome (evita consultas duplicadas)
+        self._fetching: dict[str, asyncio.Task] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self) -> Any:
+        """Cliente síncrono (criado no primeiro acesso)"""
+        if self._client is None and self.enabled:
+            try:
+                self._client = self._client_factory(False)
+                print("Conectado ao Azure Key Vault com sucesso")
+            except Exception as e:
+                print(f"Erro ao conectar ao Azure Key Vault: {e}")
+        return self._client
+
+    @property
+    def async_client(self) -> Any:
+        """Cliente assíncrono (azure.*.aio, criado no primeiro acesso)"""
+        if self._async_client is None and self.enabled:
+            try:
+                self._async_client = self._client_factory(True)
+            except Exception as e:
+                print(f"Erro ao conectar ao Azure Key Vault: {e}")
+        return self._async_client
+
+    def _cached(self, secret_name: str) -> tuple[Optional[str], bool]:
+        """Valor em cache e se ainda está dentro do TTL"""
+        entry = self._cache.get(secret_name)
+        if entry is None:
+            return None, False
+        value, expires_at = entry
+        return value, time.monotonic() < expires_at
+
+    def _store(self, secret_name: str, value: Optional[str]) -> None:
+        if value is not None and self.ttl > 0:
+            self._cache[secret_name] = (value, time.monotonic() + self.ttl)
 
     def get_secret(self, secret_name: str) -> Optional[str]:
-        """Recupera um segredo do Azure Key Vault"""
-        if not self.client:
+        """Recupera um segredo (bloqueante; para threads e código síncrono)"""
+        value, fresh = self._cached(secret_name)
+        if fresh:
+            return value
+
+        client = self.client
+        if not client:
+            print("Cliente do Azure Key Vault não inicializado")
+            return value
+
+        try:
+            fetched = client.get_secret(secret_name).value
+        except Exception as e:
+            print(f"Erro ao recuperar segredo '{secret_name}': {e}")
+            return value
+        self._store(secret_name, fetched)
+        return fetched
+
+    async def get_secret_async(self, secret_name: str) -> Optional[str]:
+        """Recupera um segredo sem bloquear o event loop"""
+        value, fresh = self._cached(secret_name)
+        if fresh:
+            return value
+        task = self._fetch(secret_name)
+        if value is not None:
+            # Vencido: responde com o valor anterior enquanto renova
+            return value
+        return await asyncio.shield(task)
+
+    def _fetch(self, secret_name: str) -> asyncio.Task:
+        """Busca no Key Vault (uma tarefa por nome, compartilhada)"""
+        task = self._fetching.get(secret_name)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._fetch_secret(secret_name))
+            self._fetching[secret_name] = task
+            task.add_done_callback(lambda _: self._fetching.pop(secret_name, None))
+        return task
+
+    async def _fetch_secret(self, secret_name: str) -> Optional[str]:
+        """Consulta o Key Vault; em caso de falha mantém o valor anterior"""
+        previous, _ = self._cached(secret_name)
+        client = self.async_client
+        if not client:
             print("Cliente do Azure Key Vault não inicializado")
-            return None
+            return previous
 
         try:
-            secret = self.client.get_secret(secret_name)
-            return secret.value
+            secret = await client.get_secret(secret_name)
         except Exception as e:
             print(f"Erro ao recuperar segredo '{secret_name}': {e}")
-            return None
+            return previous
+        self._store(secret_name, secret.value)
+        return secret.value
+
+    async def prefetch(self, secret_names: list[str]) -> dict[str, Optional[str]]:
+        """Busca vários segredos de uma vez (consultas concorrentes)"""
+        names = list(dict.fromkeys(name for name in secret_names if name))
+        values = await asyncio.gather(*(self._fetch(name) for name in names))
+        return dict(zip(names, values))
+
+    def start_refresh(self, secret_names: list[str]) -> None:
+        """Pré-carrega os segredos e os renova em segundo plano antes do TTL"""
+        if not self.enabled or self.ttl <= 0 or self._refresh_task is not None:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_loop(secret_names))
+
+    async def _refresh_loop(self, secret_names: list[str]) -> None:
+        """Renova os segredos configurados e os já consultados a cada ciclo"""
+        names = list(secret_names)
+        while True:
+            await self.prefetch(names + [n for n in self._cache if n not in names])
+            await asyncio.sleep(self.ttl * REFRESH_FRACTION)
+
+    async def close(self) -> None:
+        """Encerra a atualização em segundo plano e os clientes"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            await client.close()
+
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+def prefetch_secret_names() -> list[str]:
+    """Segredos usados pelo serviço, nomeados nas settings"""
+    names = [settings.SEGMENTATION_VOCABULARY_SECRET]
+    names += settings.KEYVAULT_PREFETCH_SECRETS.split(",")
+    return [name.strip() for name in names if name.strip()]
 
 
 # Instância global do serviço
-azure_service = AzureKeyVaultService()
+azure_service = AzureKeyVaultService(ttl_seconds=settings.KEYVAULT_CACHE_TTL_SECONDS)
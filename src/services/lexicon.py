@@ -0,0 +1,165 @@
+"""
+Léxicos de frequência usados pelos motores de segmentação baseados em dicionário
+"""
+
+import argparse
+import gzip
+import unicodedata
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.services.lexicon_index import write_index
+
+# Diretório com os léxicos distribuídos junto com o pacote
+DEFAULT_LEXICON_DIR = Path(__file__).parent / "data"
+
+# Quantidade padrão de palavras exportadas por idioma
+DEFAULT_LEXICON_SIZE = 100_000
+
+# Siglas preservadas em maiúsculo por idioma (compiladas também no índice)
+DEFAULT_ACRONYMS = {
+    "pt": {"sp", "ti", "mg", "pi", "pr"},
+    "en": {"usa", "uk", "ai", "it", "hr"},
+}
+
+
+def fold_accents(word: str) -> str:
+    """Remove acentos e converte para minúsculas (informação -> informacao)"""
+    decomposed = unicodedata.normalize("NFKD", word)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def lexicon_path(language: str, lexicon_dir: Optional[str] = None) -> Path:
+    """Retorna o caminho do arquivo de unigramas de um idioma"""
+    base = Path(lexicon_dir) if lexicon_dir else DEFAULT_LEXICON_DIR
+    return base / f"{language}_unigrams.tsv.gz"
+
+
+def bigram_path(language: str, lexicon_dir: Optional[str] = None) -> Path:
+    """Retorna o caminho do arquivo (opcional) de bigramas de um idioma"""
+    base = Path(lexicon_dir) if lexicon_dir else DEFAULT_LEXICON_DIR
+    return base / f"{language}_bigrams.tsv.gz"
+
+
+def index_path(language: str, lexicon_dir: Optional[str] = None) -> Path:
+    """Retorna o caminho do índice compilado (trie) de um idioma"""
+    base = Path(lexicon_dir) if lexicon_dir else DEFAULT_LEXICON_DIR
+    return base / f"{language}_lexicon.idx"
+
+
+def read_acronyms(path: str) -> set[str]:
+    """Lê siglas de um arquivo texto (uma por linha, '#' para comentários)"""
+    with open(path, encoding="utf-8") as fh:
+        return {
+            line.strip().lower()
+            for line in fh
+            if line.strip() and not line.startswith("#")
+        }
+
+
+def _read_counts(path: Path) -> dict[str, int]:
+    """Lê um arquivo TSV (gzip) no formato 'termo<TAB>contagem'"""
+    counts: dict[str, int] = {}
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            term, _, count = line.rpartition("\t")
+            if not term:
+                term, count = count, "1"
+            counts[term] = counts.get(term, 0) + int(count)
+    return counts
+
+
+def load_unigrams(language: str, lexicon_dir: Optional[str] = None) -> dict[str, int]:
+    """Carrega as contagens de unigramas de um idioma"""
+    path = lexicon_path(language, lexicon_dir)
+    if not path.exists():
+        raise RuntimeError(
+            f"Léxico '{path}' não encontrado. "
+            "Gere-o com 'python -m src.services.lexicon'."
+        )
+    return _read_counts(path)
+
+
+def load_bigrams(language: str, lexicon_dir: Optional[str] = None) -> dict[str, int]:
+    """Carrega as contagens de bigramas ('palavra1 palavra2'), se existirem"""
+    path = bigram_path(language, lexicon_dir)
+    if not path.exists():
+        return {}
+    return _read_counts(path)
+
+
+def write_counts(counts: dict[str, int], path: Path) -> None:
+    """Grava contagens em TSV (gzip), ordenadas por frequência decrescente"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    with gzip.open(path, "wt", encoding="utf-8", compresslevel=9) as fh:
+        for term, count in ordered:
+            fh.write(f"{term}\t{count}\n")
+
+
+def build_from_wordfreq(
+    language: str, size: int = DEFAULT_LEXICON_SIZE
+) -> dict[str, int]:
+    """Gera contagens de unigramas a partir do pacote wordfreq (dependência de build)"""
+    try:
+        import wordfreq
+    except ImportError:
+        raise RuntimeError(
+            "Pacote 'wordfreq' não instalado. Instale-o para gerar os léxicos."
+        )
+
+    counts: dict[str, int] = {}
+    for word in wordfreq.top_n_list(language, size):
+        folded = fold_accents(word)
+        if not (folded.isascii() and folded.isalpha()):
+            continue
+        count = max(1, round(wordfreq.word_frequency(word, language) * 1e9))
+        counts[folded] = counts.get(folded, 0) + count
+    return counts
+
+
+def compile_index(
+    language: str, lexicon_dir: Optional[str] = None, acronyms: Iterable[str] = ()
+) -> Path:
+    """Compila o léxico TSV e as siglas do idioma no índice binário (trie)"""
+    counts = load_unigrams(language, lexicon_dir)
+    siglas = DEFAULT_ACRONYMS.get(language, set()) | set(acronyms)
+    return write_index(counts, index_path(language, lexicon_dir), siglas, language)
+
+
+def main() -> None:
+    """Gera os arquivos de léxico a partir do wordfreq ou compila os índices"""
+    parser = argparse.ArgumentParser(description="Gera léxicos de frequência")
+    parser.add_argument("--language", action="append", choices=["pt", "en"])
+    parser.add_argument("--size", type=int, default=DEFAULT_LEXICON_SIZE)
+    parser.add_argument("--output", default=str(DEFAULT_LEXICON_DIR))
+    parser.add_argument(
+        "--compile-index",
+        action="store_true",
+        help="Compila os léxicos TSV existentes em índices binários (mmap)",
+    )
+    parser.add_argument(
+        "--acronyms", help="Arquivo com siglas adicionais (uma por linha)"
+    )
+    args = parser.parse_args()
+
+    for language in args.language or ["pt", "en"]:
+        if args.compile_index:
+            extra = read_acronyms(args.acronyms) if args.acronyms else set()
+            path = compile_index(language, args.output, extra)
+            print(
+                f"Índice '{language}' compilado: {path.stat().st_size} bytes em {path}"
+            )
+            continue
+
+        counts = build_from_wordfreq(language, args.size)
+        path = lexicon_path(language, args.output)
+        write_counts(counts, path)
+        print(f"Léxico '{language}' gerado: {len(counts)} palavras em {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+Índice compilado de léxico: trie em double-array (BASE/CHECK) carregada via mmap
+
+Formato (versão 2):
+
+    MAGIC | tamanho do cabeçalho (uint32) | cabeçalho JSON | padding | dados
+
+O cabeçalho traz a tabela de arrays (offset relativo ao início dos dados,
+tamanho e dtype de cada um) e o CRC32 da seção de dados; cada array começa
+alinhado em 8 bytes e pode ser mapeado diretamente como array NumPy.
+"""
+
+import json
+import mmap
+import statistics
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+MAGIC = b"NWSLEX01"
+FORMAT_VERSION = 2
+
+# dtype (NumPy) -> typecode de memoryview.cast
+DTYPES = {"int32": "i", "uint32": "I", "uint8": "B"}
+
+# Flags por estado
+FLAG_WORD = 1
+FLAG_ACRONYM = 2
+
+# Estado raiz e marcador de posição livre no CHECK
+ROOT = 0
+FREE = -1
+
+
+def _align(offset: int, size: int = 8) -> int:
+    return (offset + size - 1) // size * size
+
+
+class _Builder:
+    """Construção da double-array a partir das palavras ordenadas"""
+
+    def __init__(self, codes: dict[str, int]):
+        self.codes = codes
+        self.base = array("i", [0])
+        self.check = array("i", [FREE])
+        self.next_check = 1
+        # Palavra -> estado terminal
+        self.terminal: dict[str, int] = {}
+
+    def _grow(self, size: int) -> None:
+        if size > len(self.check):
+            extra = max(size - len(self.check), len(self.check) // 2)
+            self.base.extend([0] * extra)
+            self.check.extend([FREE] * extra)
+
+    def _find_base(self, child_codes: list[int]) -> int:
+        """Menor base em que todas as transições dos filhos estão livres"""
+        first = child_codes[0]
+        position = max(self.next_check, first + 1)
+        occupied = 0
+        scanned = 0
+        while True:
+            self._grow(position + 1)
+            if self.check[position] != FREE:
+                occupied += 1
+            else:
+                base = position - first
+                self._grow(base + child_codes[-1] + 1)
+                if all(self.check[base + code] == FREE for code in child_codes):
+                    # Avança o início da busca quando a região já está densa
+                    if scanned and occupied / scanned > 0.95:
+                        self.next_check = position
+                    return base
+            scanned += 1
+            position += 1
+
+    def build(self, words: list[str]) -> int:
+        """Insere as palavras (ordenadas) e retorna o número de estados usados"""
+        # Pilha de (estado, início, fim, profundidade) sobre words[início:fim]
+        stack = [(ROOT, 0, len(words), 0)]
+        used = 1
+        while stack:
+            state, low, high, depth = stack.pop()
+            if len(words[low]) == depth:
+                self.terminal[words[low]] = state
+                low += 1
+            if low >= high:
+                continue
+
+            groups: list[tuple[int, int, int]] = []
+            start = low
+            for index in range(low + 1, high + 1):
+                if index == high or words[index][depth] != words[start][depth]:
+                    groups.append((self.codes[words[start][depth]], start, index))
+                    start = index
+
+            child_codes = sorted(code for code, _, _ in groups)
+            base = self._find_base(child_codes)
+            self.base[state] = base
+            for code, group_low, group_high in groups:
+                child = base + code
+                self.check[child] = state
+                used = max(used, child + 1)
+                stack.append((child, group_low, group_high, depth + 1))
+        return used
+
+
+def build_index(
+    counts: dict[str, int],
+    acronyms: Iterable[str] = (),
+    language: str = "",
+) -> bytes:
+    """Compila contagens de palavras e siglas no formato binário do índice"""
+    acronym_set = {acronym.lower() for acronym in acronyms if acronym}
+    counts = dict(counts)
+    # Siglas ausentes do léxico entram com a contagem mediana
+    floor = int(statistics.median(counts.values())) if counts else 1
+    for acronym in acronym_set:
+        counts[acronym] = max(counts.get(acronym, 0), floor)
+
+    words = sorted(word for word in counts if word)
+    if not words:
+        raise ValueError("Léxico vazio")
+
+    # Alfabeto com códigos densos (1..n), os mais frequentes primeiro
+    frequency = Counter(char for word in words for char in word)
+    alphabet = "".join(char for char, _ in frequency.most_common())
+    codes = {char: code for code, char in enumerate(alphabet, start=1)}
+
+    builder = _Builder(codes)
+    size = builder.build(words)
+
+    word_counts = array("I", [0]) * size
+    flags = bytearray(size)
+    for word, state in builder.terminal.items():
+        word_counts[state] = counts[word]
+        flags[state] = FLAG_WORD | (FLAG_ACRONYM if word in acronym_set else 0)
+
+    # Seção de dados: arrays alinhados e tabela de offsets para o cabeçalho
+    tables, chunks, offset = {}, [], 0
+    for name, dtype, values in (
+        ("base", "int32", builder.base[:size].tobytes()),
+        ("check", "int32", builder.check[:size].tobytes()),
+        ("counts", "uint32", word_counts.tobytes()),
+        ("flags", "uint8", bytes(flags)),
+    ):
+        tables[name] = {"offset": offset, "length": size, "dtype": dtype}
+        padding = _align(len(values)) - len(values)
+        chunks += [values, b"\0" * padding]
+        offset += len(values) + padding
+    data = b"".join(chunks)
+
+    header = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "language": language,
+            "byteorder": sys.byteorder,
+            "states": size,
+            "words": len(words),
+            "total": sum(counts.values()),
+            "median_count": floor,
+            "max_word_length": max(map(len, words)),
+            "alphabet": alphabet,
+            "acronyms": sorted(acronym_set),
+            "arrays": tables,
+            "data_size": len(data),
+            "checksum": zlib.crc32(data),
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    prefix = MAGIC + struct.pack("<I", len(header)) + header
+    return b"".join([prefix, b"\0" * (_align(len(prefix)) - len(prefix)), data])
+
+
+def write_index(
+    counts: dict[str, int],
+    path: Union[str, Path],
+    acronyms: Iterable[str] = (),
+    language: str = "",
+) -> Path:
+    """Compila e grava o índice de forma atômica"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_bytes(build_index(counts, acronyms, language))
+    temporary.replace(path)
+    return path
+
+
+class LexiconIndex:
+    """Léxico compilado somente leitura (trie em double-array sobre mmap).
+
+    As páginas do arquivo mapeado ficam no page cache e são compartilhadas
+    entre todos os workers que abrirem o mesmo arquivo.
+    """
+
+    def __init__(
+        self,
+        buffer: Union[bytes, mmap.mmap],
+        source: Optional[mmap.mmap] = None,
+        verify: bool = True,
+    ):
+        with memoryview(buffer) as view:
+            if bytes(view[: len(MAGIC)]) != MAGIC:
+                raise ValueError("Arquivo de índice de léxico inválido")
+            (header_size,) = struct.unpack_from("<I", view, len(MAGIC))
+            header_start = len(MAGIC) + 4
+            header = json.loads(bytes(view[header_start : header_start + header_size]))
+            if header["version"] != FORMAT_VERSION:
+                raise ValueError(
+                    f"Versão do índice {header['version']} não suportada "
+                    f"(esperada {FORMAT_VERSION})"
+                )
+            if header["byteorder"] != sys.byteorder:
+                raise ValueError("Índice gerado em máquina com outra ordem de bytes")
+
+            start = _align(header_start + header_size)
+            with view[start : start + header["data_size"]] as data:
+                if len(data) != header["data_size"]:
+                    raise ValueError("Índice de léxico truncado")
+                if verify and zlib.crc32(data) != header["checksum"]:
+                    raise ValueError("Checksum do índice de léxico não confere")
+
+        # Views sem cópia sobre o buffer, a partir da tabela de offsets
+        views = {}
+        for name, table in header["arrays"].items():
+            typecode = DTYPES[table["dtype"]]
+            offset = start + table["offset"]
+            size = table["length"] * struct.calcsize(typecode)
+            views[name] = memoryview(buffer)[offset : offset + size].cast(typecode)
+        self._base = views["base"]
+        self._check = views["check"]
+        self._counts = views["counts"]
+        self._flags = views["flags"]
+
+        self._buffer = buffer
+        self._start = start
+        self._numpy: Optional[dict] = None
+        self._mmap = source
+        self.header = header
+        self.language: str = header["language"]
+        self.total: int = header["total"]
+        self.max_word_length: int = header["max_word_length"]
+        self.median_count: int = header["median_count"]
+        self.acronyms: frozenset[str] = frozenset(header["acronyms"])
+        self._codes = {char: code for code, char in enumerate(header["alphabet"], 1)}
+
+    @classmethod
+    def open(cls, path: Union[str, Path], verify: bool = True) -> "LexiconIndex":
+        """Mapeia o arquivo em memória (somente leitura)"""
+        with open(path, "rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, source=mapped, verify=verify)
+        except Exception:
+            mapped.close()
+            raise
+
+    def arrays(self) -> dict:
+        """Arrays do índice como arrays NumPy somente leitura (sem cópia).
+
+        Os arrays apontam para o mmap: descarte-os antes de chamar close().
+        """
+        if self._numpy is None:
+            import numpy as np
+
+            self._numpy = {
+                name: np.frombuffer(
+                    self._buffer,
+                    dtype=table["dtype"],
+                    count=table["length"],
+                    offset=self._start + table["offset"],
+                )
+                for name, table in self.header["arrays"].items()
+            }
+        return self._numpy
+
+    def __len__(self) -> int:
+        return self.header["words"]
+
+    @property
+    def nbytes(self) -> int:
+        """Tamanho dos arrays do índice em bytes"""
+        return self.header["states"] * 13
+
+    def _walk(self, word: str) -> int:
+        """Estado alcançado pela palavra (ou FREE se não houver caminho)"""
+        base, check, codes = self._base, self._check, self._codes
+        states = len(check)
+        state = ROOT
+        for char in word:
+            code = codes.get(char)
+            if code is None:
+                return FREE
+            target = base[state] + code
+            if target >= states or check[target] != state:
+                return FREE
+            state = target
+        return state
+
+    def count(self, word: str) -> int:
+        """Contagem da palavra (0 se não pertencer ao léxico)"""
+        state = self._walk(word)
+        return self._counts[state] if state != FREE else 0
+
+    def __contains__(self, word: str) -> bool:
+        state = self._walk(word)
+        return state != FREE and bool(self._flags[state] & FLAG_WORD)
+
+    def is_acronym(self, word: str) -> bool:
+        """Indica se a palavra foi compilada como sigla"""
+        state = self._walk(word)
+        return state != FREE and bool(self._flags[state] & FLAG_ACRONYM)
+
+    def prefixes_of(
+        self, text: str, pos: int = 0, max_length: Optional[int] = None
+    ) -> list[tuple[int, int]]:
+        """Palavras do léxico que começam em text[pos]: lista de (fim, contagem)"""
+        base, check, counts, codes = self._base, self._check, self._counts, self._codes
+        states = len(check)
+        stop = len(text) if max_length is None else min(len(text), pos + max_length)
+        state = ROOT
+        found = []
+        for end in range(pos, stop):
+            code = codes.get(text[end])
+            if code is None:
+                break
+            target = base[state] + code
+            if target >= states or check[target] != state:
+                break
+            state = target
+            if counts[state]:
+                found.append((end + 1, counts[state]))
+        return found
+
+    def count_matrix(self, text: str, max_length: int):
+        """Contagens de todas as palavras candidatas do texto, sem laço por posição.
+
+        Retorna a matriz NumPy (posição x tamanho - 1) com a contagem de
+        text[pos:pos + tamanho] (0 se desconhecida). A trie é percorrida em
+        paralelo a partir de todas as posições, um caractere por iteração.
+        """
+        import numpy as np
+
+        arrays = self.arrays()
+        base, check, counts = arrays["base"], arrays["check"], arrays["counts"]
+        states = len(check)
+        size = len(text)
+        codes = self._codes
+        text_codes = np.zeros(size + max_length, dtype=np.int32)
+        text_codes[:size] = [codes.get(char, 0) for char in text]
+
+        matrix = np.zeros((size, max_length), dtype=np.uint32)
+        positions = np.arange(size)
+        state = np.zeros(size, dtype=np.int32)
+        for length in range(max_length):
+            code = text_codes[positions + length]
+            target = base[state] + code
+            alive = (code > 0) & (target < states)
+            target[~alive] = ROOT
+            alive &= check[target] == state
+            positions, state = positions[alive], target[alive]
+            if not len(positions):
+                break
+            matrix[positions, length] = counts[state]
+        return matrix
+
+    def close(self) -> None:
+        """Libera o mapeamento do arquivo"""
+        for view in (self._base, self._check, self._counts, self._flags):
+            view.release()
+        self._numpy = None
+        self._buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class DictLexicon:
+    """Léxico em dicionário com a mesma interface de consulta do LexiconIndex"""
+
+    def __init__(self, counts: dict[str, int], acronyms: Iterable[str] = ()):
+        self._counts = counts
+        self.total = sum(counts.values())
+        self.max_word_length = max(map(len, counts), default=1)
+        self.median_count = int(statistics.median(counts.values())) if counts else 1
+        self.acronyms = frozenset(acronyms)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def __iter__(self):
+        return iter(self._counts)
+
+    def count(self, word: str) -> int:
+        """Contagem da palavra (0 se não pertencer ao léxico)"""
+        return self._counts.get(word, 0)
+
+    def is_acronym(self, word: str) -> bool:
+        """Indica se a palavra é uma sigla"""
+        return word in self.acronyms
+
+    def prefixes_of(
+        self, text: str, pos: int = 0, max_length: Optional[int] = None
+    ) -> list[tuple[int, int]]:
+        """Palavras do léxico que começam em text[pos]: lista de (fim, contagem)"""
+        limit = self.max_word_length
+        if max_length is not None:
+            limit = min(limit, max_length)
+        counts = self._counts
+        found = []
+        for end in range(pos + 1, min(len(text), pos + limit) + 1):
+            count = counts.get(text[pos:end])
+            if count:
+                found.append((end, count))
+        return found
@@ -0,0 +1,287 @@
+"""
+Métricas no formato de exposição do Prometheus (texto 0.0.4), sem dependências externas
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Limites (segundos) dos buckets de latência: de 0,5 ms a 10 s
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Limites dos buckets de tamanho de lote
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escapa o valor de um rótulo"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Formata os rótulos como {nome="valor",...}"""
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    """Formata valores numéricos (inteiros sem casas decimais)"""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Histograma com buckets cumulativos por combinação de rótulos"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+
+        # rótulos -> [contagem por bucket (+Inf no final), soma]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Registra uma observação"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                ]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        """Total de observações de uma série"""
+        series = self._series.get(labelvalues)
+        return sum(series[0]) if series else 0
+
+    def drain(self) -> dict[tuple[str, ...], list]:
+        """Retorna as séries registradas e as zera"""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, series: dict[tuple[str, ...], list]) -> None:
+        """Soma séries drenadas de outro processo"""
+        with self._lock:
+            for labelvalues, (counts, total) in series.items():
+                current = self._series.get(labelvalues)
+                if current is None:
+                    self._series[labelvalues] = [list(counts), total]
+                    continue
+                current[0] = [a + b for a, b in zip(current[0], counts)]
+                current[1] += total
+
+    def render(self) -> list[str]:
+        """Linhas no formato de exposição"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._series.items()
+            ]
+
+        for labelvalues, counts, total in sorted(series):
+            labels = dict(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Contador monotônico por combinação de rótulos"""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        """Incrementa a série dos rótulos indicados"""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Valor atual de uma série"""
+        return self._values.get(labelvalues, 0)
+
+    def drain(self) -> dict[tuple[str, ...], float]:
+        """Retorna os valores registrados e os zera"""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: dict[tuple[str, ...], float]) -> None:
+        """Soma valores drenados de outro processo"""
+        with self._lock:
+            for labelvalues, amount in values.items():
+                self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        """Linhas no formato de exposição"""
+        with self._lock:
+            values = sorted(self._values.items())
+        return render_samples(
+            self.name,
+            self.documentation,
+            [(dict(zip(self.labelnames, key)), value) for key, value in values],
+            kind="counter",
+        )
+
+
+def render_samples(
+    name: str,
+    documentation: str,
+    samples: list[tuple[dict[str, str], float]],
+    kind: str = "gauge",
+) -> list[str]:
+    """Linhas de uma métrica simples (gauge ou counter) coletada no momento da
+    leitura"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return lines
+
+
+def process_rss_bytes() -> int:
+    """Memória residente (RSS) atual do processo"""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Fora do Linux: pico de RSS (ru_maxrss em KiB)
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MetricsRegistry:
+    """Latência das requisições e das etapas da segmentação e caminhos usados"""
+
+    def __init__(self):
+        self.request_latency = Histogram(
+            "nuuvify_http_request_duration_seconds",
+            "Latência das requisições HTTP por rota e idioma",
+            ("method", "route", "language", "status"),
+        )
+        self.stage_latency = Histogram(
+            "nuuvify_segmentation_stage_duration_seconds",
+            "Tempo gasto em cada etapa da segmentação (model_load, tokenize, format)",
+            ("stage", "language", "engine"),
+        )
+        self.microbatch_size = Histogram(
+            "nuuvify_microbatch_size",
+            "Requisições individuais agrupadas em cada lote do micro-batching",
+            ("language",),
+            BATCH_SIZE_BUCKETS,
+        )
+        self.segmentation_path = Counter(
+            "nuuvify_segmentation_path_total",
+            "Textos por caminho de resolução (cache, atalhos sem NLP ou modelo)",
+            ("path", "language", "engine"),
+        )
+        self.rate_limited = Counter(
+            "nuuvify_rate_limited_total",
+            "Requisições recusadas pelo rate limit, por tipo de identidade do cliente",
+            ("client_type",),
+        )
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        language: Optional[str],
+        status: int,
+        seconds: float,
+    ) -> None:
+        """Registra a latência de uma requisição"""
+        self.request_latency.observe(
+            seconds, method, route, language or "", str(status)
+        )
+
+    @contextmanager
+    def time_stage(self, stage: str, language: str, engine: str) -> Iterator[None]:
+        """Mede o tempo de uma etapa da segmentação"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_latency.observe(
+                time.perf_counter() - started, stage, language, engine
+            )
+
+    def drain_worker(self) -> dict:
+        """Métricas da segmentação registradas em um processo worker do executor,
+        zeradas para serem somadas às do processo que expõe /metrics"""
+        return {
+            "stage_latency": self.stage_latency.drain(),
+            "segmentation_path": self.segmentation_path.drain(),
+        }
+
+    def merge_worker(self, snapshot: dict) -> None:
+        """Soma as métricas drenadas de um processo worker"""
+        self.stage_latency.merge(snapshot["stage_latency"])
+        self.segmentation_path.merge(snapshot["segmentation_path"])
+
+    def render(self) -> list[str]:
+        """Linhas dos histogramas no formato de exposição"""
+        return (
+            self.request_latency.render()
+            + self.stage_latency.render()
+            + self.microbatch_size.render()
+            + self.segmentation_path.render()
+            + self.rate_limited.render()
+        )
+
+
+# Instância global do serviço
+metrics = MetricsRegistry()
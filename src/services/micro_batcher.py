@@ -0,0 +1,128 @@
+import asyncio
+from typing import Optional
+
+from src.core.config import settings
+from src.services.metrics import metrics
+from src.services.segmentation_executor import (
+    SegmentationExecutor,
+    segmentation_executor,
+)
+
+
+class MicroBatcher:
+    """Agrupa requisições individuais concorrentes em lotes por idioma e motor.
+
+    Cada requisição entra no lote pendente da sua chave; o lote é enviado ao
+    executor (uma chamada de segment_batch, ou seja, um nlp.pipe) quando atinge
+    max_items, quando a primeira requisição completa max_wait_ms de espera ou
+    quando o lote anterior da chave termina. Sem lote da chave em execução e com
+    worker livre no executor, a requisição é enviada na hora: o agrupamento só
+    acontece sob carga e não adiciona latência com o servidor ocioso.
+    """
+
+    def __init__(
+        self,
+        executor: SegmentationExecutor,
+        max_wait_ms: float = 2.0,
+        max_items: int = 64,
+    ):
+        self.executor = executor
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_items = max(1, max_items)
+
+        # (idioma, motor) -> itens pendentes (texto, tenant, future)
+        self._pending: dict[tuple[str, Optional[str]], list] = {}
+        self._timers: dict[tuple[str, Optional[str]], asyncio.TimerHandle] = {}
+        # Referências aos lotes em execução (evita coleta das tasks)
+        self._running: set[asyncio.Task] = set()
+        # (idioma, motor) -> lotes em execução
+        self._active: dict[tuple[str, Optional[str]], int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_wait > 0 and self.max_items > 1
+
+    @property
+    def pending(self) -> int:
+        """Requisições aguardando o envio do lote"""
+        return sum(len(items) for items in self._pending.values())
+
+    async def segment_and_format(
+        self,
+        text: str,
+        language: str,
+        engine: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> str:
+        """Segmenta um texto, compartilhando a chamada ao motor com as requisições
+        concorrentes do mesmo idioma e motor"""
+        if not self.enabled:
+            return await self.executor.segment_and_format(
+                text, language, engine, tenant
+            )
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[str] = loop.create_future()
+        key = (language, engine)
+        items = self._pending.setdefault(key, [])
+        items.append((text, tenant, future))
+
+        idle = (
+            not self._active.get(key) and self.executor.inflight < self.executor.workers
+        )
+        if idle or len(items) >= self.max_items:
+            self._flush(key)
+        elif len(items) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: tuple[str, Optional[str]]) -> None:
+        """Envia o lote pendente da chave ao executor"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(key, None)
+        if not items:
+            return
+
+        self._active[key] = self._active.get(key, 0) + 1
+        task = asyncio.ensure_future(self._run(key, items))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: tuple[str, Optional[str]], items: list) -> None:
+        """Executa o lote e entrega a cada requisição o seu resultado (ou o erro)"""
+        language, engine = key
+        metrics.microbatch_size.observe(len(items), language)
+        try:
+            results = await self.executor.segment_batch(
+                [(text, language, engine, tenant) for text, tenant, _ in items]
+            )
+        except Exception as e:
+            self._finish(key)
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._finish(key)
+        for (_, _, future), formatted in zip(items, results):
+            # O chamador pode ter desistido (desconexão/cancelamento)
+            if not future.done():
+                future.set_result(formatted)
+
+    def _finish(self, key: tuple[str, Optional[str]]) -> None:
+        """Registra o fim de um lote e envia o que acumulou enquanto ele rodava"""
+        self._active[key] -= 1
+        if not self._active[key]:
+            del self._active[key]
+        if key in self._pending:
+            self._flush(key)
+
+
+# Instância global do serviço
+micro_batcher = MicroBatcher(
+    segmentation_executor,
+    max_wait_ms=settings.SEGMENTATION_MICROBATCH_WAIT_MS,
+    max_items=settings.SEGMENTATION_MICROBATCH_MAX_ITEMS,
+)
@@ -1,5 +1,527 @@
+import heapq
+import math
+import re
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Iterator, Optional, Union
+
+import numpy as np
 import spacy
 
+from src.core.config import settings
+from src.services.lexicon import (
+    DEFAULT_ACRONYMS,
+    fold_accents,
+    index_path,
+    load_bigrams,
+    load_unigrams,
+)
+from src.services.lexicon_index import DictLexicon, LexiconIndex
+from src.services.metrics import metrics
+from src.services.segmentation_cache import LRUCache
+from src.services.shared_cache import create_shared_cache
+from src.services.single_flight import SingleFlight
+from src.services.vocabulary import (
+    Vocabulary,
+    VocabularyStore,
+    create_vocabulary_source,
+)
+
+# Perfis de carga do spaCy: pipeline completo, só tokenizador do modelo ou
+# tokenizador em branco (spacy.blank, sem vetores)
+LOAD_PROFILES = ("full", "tokenizer", "blank")
+
+# Componentes que não influenciam a tokenização (excluídos no perfil "tokenizer")
+_NON_TOKENIZER_PIPES = (
+    "tok2vec",
+    "tagger",
+    "morphologizer",
+    "parser",
+    "senter",
+    "attribute_ruler",
+    "lemmatizer",
+    "ner",
+)
+
+# Textos sintéticos usados no aquecimento dos motores
+WARMUP_SAMPLES = {
+    "pt": ["minhacasatemsp", "sistemadeinformacaomg", "notafiscaleletronica"],
+    "en": ["myhouseisbeautiful", "humanresourceshr", "informationtechnologyuk"],
+}
+
+# Sequências de letras (sem dígitos, pontuação ou "_")
+_ALPHA_RUN = re.compile(r"[^\W\d_]+")
+
+# Textos elegíveis ao atalho sem NLP: só letras, espaços, "_" e "-" (apóstrofos,
+# dígitos e outra pontuação dependem da tokenização do motor)
+_FAST_PATH_TEXT = re.compile(r"[^\W\d]*(?:[\s-]+[^\W\d]*)*")
+
+
+def split_case_pieces(text: str) -> tuple[list[str], bool]:
+    """Divide o texto nas sequências de letras e nas fronteiras de CamelCase
+    (minhaCasa -> minha, Casa; HTTPServer -> HTTP, Server); indica se houve
+    alguma fronteira de CamelCase"""
+    pieces = []
+    camel = False
+    for match in _ALPHA_RUN.finditer(text):
+        run = match.group()
+        # Casos comuns sem fronteira: tudo minúsculo, capitalizado ou maiúsculo
+        if run.islower() or run[1:].islower() or run.isupper():
+            pieces.append(run)
+            continue
+        start = 0
+        for index in range(1, len(run)):
+            char = run[index]
+            if not char.isupper():
+                continue
+            previous = run[index - 1]
+            following = run[index + 1] if index + 1 < len(run) else ""
+            if previous.islower() or (previous.isupper() and following.islower()):
+                pieces.append(run[start:index])
+                start = index
+                camel = True
+        pieces.append(run[start:])
+    return pieces, camel
+
+
+# Prefixo até o último espaço em branco / último caractere que não é letra
+_UNTIL_SPACE = re.compile(r".*\s", re.DOTALL)
+_UNTIL_NON_ALPHA = re.compile(r".*[\W\d_]", re.DOTALL)
+_NON_ALPHA = re.compile(r"[\W\d_]")
+
+
+def split_chunks(text: str, size: int) -> Iterator[str]:
+    """Divide textos maiores que size em pedaços de até size caracteres, cortados
+    após um espaço em branco ou, na falta dele, após um caractere que não é
+    letra. Uma sequência de letras maior que size vira um pedaço inteiro (o
+    Viterbi a processa em janelas sobrepostas)"""
+    if size <= 0 or len(text) <= size:
+        yield text
+        return
+
+    start = 0
+    while len(text) - start > size:
+        end = start + size
+        match = _UNTIL_SPACE.match(text, start, end) or _UNTIL_NON_ALPHA.match(
+            text, start, end
+        )
+        if match is None:
+            # Janela só de letras: vai até o fim da sequência
+            match = _NON_ALPHA.search(text, end)
+            end = match.start() if match else len(text)
+        else:
+            end = match.end()
+        yield text[start:end]
+        start = end
+    if start < len(text):
+        yield text[start:]
+
+
+_LOG10 = math.log(10.0)
+
+
+class ViterbiSegmenter:
+    """Segmentador por programação dinâmica sobre um léxico de frequências"""
+
+    # Fator de backoff quando o bigrama não existe no léxico
+    BIGRAM_BACKOFF = math.log(0.4)
+
+    def __init__(
+        self,
+        unigrams: Union[dict[str, int], LexiconIndex, DictLexicon],
+        bigrams: Optional[dict[str, int]] = None,
+        max_word_length: int = 24,
+        extra_words: Optional[dict[str, int]] = None,
+        vectorized_min_length: int = 0,
+    ):
+        # Léxico em dicionário ou índice compilado (mesma interface de consulta)
+        self.lexicon = DictLexicon(unigrams) if isinstance(unigrams, dict) else unigrams
+        # Palavras ausentes do índice compilado (ex.: siglas adicionadas depois)
+        self.extra_words = dict(extra_words or {})
+
+        total = (self.lexicon.total + sum(self.extra_words.values())) or 1
+        longest = max(
+            self.lexicon.max_word_length, max(map(len, self.extra_words), default=1)
+        )
+        self.max_word_length = max(1, min(max_word_length, longest))
+        # Textos a partir deste tamanho usam a pontuação vetorizada (0 desativa;
+        # requer o índice compilado)
+        self.vectorized_min_length = (
+            vectorized_min_length if isinstance(self.lexicon, LexiconIndex) else 0
+        )
+        self.log_total = math.log(total)
+        # Contagem atribuída aos termos do vocabulário (overlay) em cada chamada
+        self.overlay_count = self.lexicon.median_count
+
+        # Penalidade de palavras desconhecidas por tamanho (decai com o comprimento):
+        # log(10 / (total * 10^tamanho)) = offset - tamanho * log(10)
+        self._unknown_offset = math.log(10.0) - self.log_total
+        self.unknown_logp = [0.0] + [
+            self._unknown_offset - size * _LOG10
+            for size in range(1, self.max_word_length + 1)
+        ]
+
+        self.bigram_logp: dict[tuple[str, str], float] = {}
+        for pair, count in (bigrams or {}).items():
+            first, _, second = pair.partition(" ")
+            first_count = self._count(first)
+            if first_count and second and count > 0:
+                self.bigram_logp[(first, second)] = math.log(count / first_count)
+
+    def _count(self, word: str) -> int:
+        """Contagem da palavra no léxico (0 se desconhecida)"""
+        return self.lexicon.count(word) or self.extra_words.get(word, 0)
+
+    def is_known(self, word: str, overlay: Optional[DictLexicon] = None) -> bool:
+        """Indica se a palavra pertence ao léxico (ou ao overlay do vocabulário)"""
+        return bool(self._count(word)) or (overlay is not None and word in overlay)
+
+    def _word_logp(self, word: str, overlay: Optional[DictLexicon] = None) -> float:
+        """Log-probabilidade de uma palavra isolada"""
+        count = self._count(word)
+        if overlay is not None and word in overlay:
+            count = max(count, self.overlay_count)
+        if not count:
+            return self.unknown_logp[len(word)]
+        return math.log(count) - self.log_total
+
+    def _prefixes(
+        self, text: str, pos: int, overlay: Optional[DictLexicon] = None
+    ) -> list[tuple[int, int]]:
+        """Palavras conhecidas que começam em pos: lista de (fim, contagem)"""
+        found = self.lexicon.prefixes_of(text, pos, self.max_word_length)
+        for word, count in self.extra_words.items():
+            if len(word) <= self.max_word_length and text.startswith(word, pos):
+                found.append((pos + len(word), count))
+        if overlay is not None:
+            for end, _ in overlay.prefixes_of(text, pos, self.max_word_length):
+                found.append((end, self.overlay_count))
+        return found
+
+    def segment(self, text: str, overlay: Optional[DictLexicon] = None) -> list[str]:
+        """Segmenta um texto sem espaços na sequência de palavras mais provável
+        (overlay: termos do vocabulário tratados como palavras do léxico)"""
+        if not text:
+            return []
+        if self.bigram_logp:
+            return self._segment_bigram(text, overlay)
+        if 0 < self.vectorized_min_length <= len(text):
+            return self._segment_vectorized(text, overlay)
+        return self._segment_unigram(text, overlay)
+
+    def segment_windows(
+        self,
+        text: str,
+        size: int,
+        overlap: int,
+        overlay: Optional[DictLexicon] = None,
+    ) -> list[str]:
+        """Segmenta textos longos em janelas de size + overlap caracteres: ficam
+        as palavras que terminam nos primeiros size caracteres da janela e a
+        seguinte recomeça após a última delas (a sobreposição evita cortar uma
+        palavra na fronteira)"""
+        if size <= 0 or len(text) <= size + overlap:
+            return self.segment(text, overlay)
+
+        words: list[str] = []
+        start = 0
+        while len(text) - start > size + overlap:
+            end = 0
+            for word in self.segment(text[start : start + size + overlap], overlay):
+                # A primeira palavra sempre fica (garante o avanço)
+                if end and end + len(word) > size:
+                    break
+                words.append(word)
+                end += len(word)
+            start += end
+        words.extend(self.segment(text[start:], overlay))
+        return words
+
+    def _segment_unigram(
+        self, text: str, overlay: Optional[DictLexicon] = None
+    ) -> list[str]:
+        """Viterbi com unigramas: O(n + palavras conhecidas encontradas).
+
+        As palavras conhecidas vêm de prefixes_of; para as desconhecidas, cuja
+        penalidade depende só do tamanho, o melhor início é o máximo de
+        best[início] + início * log(10) numa janela deslizante.
+        """
+        size = len(text)
+        limit = self.max_word_length
+        log_total = self.log_total
+        offset = self._unknown_offset
+        best = [0.0] + [-math.inf] * size
+        back = [0] * (size + 1)
+        # (best[início] + início * log(10), início) em ordem decrescente de valor
+        window: deque[tuple[float, int]] = deque()
+
+        for pos in range(size + 1):
+            if pos:
+                while window[0][1] < pos - limit:
+                    window.popleft()
+                value, start = window[0]
+                score = value + offset - pos * _LOG10
+                if score > best[pos]:
+                    best[pos] = score
+                    back[pos] = start
+                if pos == size:
+                    break
+
+            current = best[pos]
+            value = current + pos * _LOG10
+            while window and window[-1][0] < value:
+                window.pop()
+            window.append((value, pos))
+
+            for end, count in self._prefixes(text, pos, overlay):
+                score = current + math.log(count) - log_total
+                if score > best[end]:
+                    best[end] = score
+                    back[end] = pos
+
+        words = []
+        end = size
+        while end > 0:
+            start = back[end]
+            words.append(text[start:end])
+            end = start
+        return words[::-1]
+
+    def _score_matrix(
+        self, text: str, overlay: Optional[DictLexicon] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Matriz (posição x tamanho - 1) com a log-probabilidade de cada palavra
+        candidata, montada com consultas vetorizadas ao índice compilado, e a
+        máscara das palavras conhecidas"""
+        limit = self.max_word_length
+        counts = self.lexicon.count_matrix(text, limit)
+        extra = list(self.extra_words.items())
+        if overlay is not None:
+            extra += [(word, self.overlay_count) for word in overlay]
+        for word, count in extra:
+            if not 0 < len(word) <= limit:
+                continue
+            pos = text.find(word)
+            while pos != -1:
+                cell = counts[pos, len(word) - 1]
+                counts[pos, len(word) - 1] = max(cell, count)
+                pos = text.find(word, pos + 1)
+
+        unknown = np.array(self.unknown_logp[1 : limit + 1])
+        with np.errstate(divide="ignore"):
+            known = np.log(counts) - self.log_total
+        mask = counts > 0
+        return np.where(mask, known, unknown), mask
+
+    def _segment_vectorized(
+        self, text: str, overlay: Optional[DictLexicon] = None
+    ) -> list[str]:
+        """Viterbi com unigramas sobre a matriz de pontuações (textos longos).
+
+        A pontuação de todas as palavras candidatas é calculada de uma vez em
+        NumPy; a recorrência percorre só as palavras conhecidas e, para as
+        desconhecidas, a mesma janela deslizante de _segment_unigram.
+        """
+        size = len(text)
+        limit = self.max_word_length
+        scores, mask = self._score_matrix(text, overlay)
+        # Palavras conhecidas em ordem de posição inicial (nonzero percorre a
+        # matriz por linha); a sentinela encerra a última posição
+        starts, lengths = np.nonzero(mask)
+        known_scores = scores[starts, lengths].tolist()
+        known_ends = (starts + lengths + 1).tolist()
+        known_starts = starts.tolist() + [size + 1]
+
+        offset = self._unknown_offset
+        best = [0.0] + [-math.inf] * size
+        back = [0] * (size + 1)
+        window: deque[tuple[float, int]] = deque()
+        candidate = 0
+
+        for pos in range(size + 1):
+            if pos:
+                while window[0][1] < pos - limit:
+                    window.popleft()
+                value, start = window[0]
+                score = value + offset - pos * _LOG10
+                if score > best[pos]:
+                    best[pos] = score
+                    back[pos] = start
+                if pos == size:
+                    break
+
+            current = best[pos]
+            value = current + pos * _LOG10
+            while window and window[-1][0] < value:
+                window.pop()
+            window.append((value, pos))
+
+            while known_starts[candidate] == pos:
+                end = known_ends[candidate]
+                score = current + known_scores[candidate]
+                if score > best[end]:
+                    best[end] = score
+                    back[end] = pos
+                candidate += 1
+
+        words = []
+        end = size
+        while end > 0:
+            start = back[end]
+            words.append(text[start:end])
+            end = start
+        return words[::-1]
+
+    def _segment_bigram(
+        self, text: str, overlay: Optional[DictLexicon] = None
+    ) -> list[str]:
+        """Viterbi com bigramas: O(n * max_word_length^2)"""
+        size = len(text)
+        limit = self.max_word_length
+        # lattice[fim][inicio] = (score, inicio da palavra anterior)
+        lattice: list[dict[int, tuple[float, int]]] = [{} for _ in range(size + 1)]
+        lattice[0][0] = (0.0, 0)
+
+        for end in range(1, size + 1):
+            for start in range(max(0, end - limit), end):
+                previous_states = lattice[start]
+                word = text[start:end]
+                word_logp = self._word_logp(word, overlay)
+                best: Optional[tuple[float, int]] = None
+                for prev_start, (prev_score, _) in previous_states.items():
+                    logp = word_logp
+                    if start > 0:
+                        pair = (text[prev_start:start], word)
+                        logp = self.bigram_logp.get(
+                            pair, word_logp + self.BIGRAM_BACKOFF
+                        )
+                    score = prev_score + logp
+                    if best is None or score > best[0]:
+                        best = (score, prev_start)
+                if best is not None:
+                    lattice[end][start] = best
+
+        end = size
+        start = max(lattice[end], key=lambda s: lattice[end][s][0])
+        words = []
+        while end > 0:
+            words.append(text[start:end])
+            end, start = start, lattice[end][start][1]
+        return words[::-1]
+
+    def segment_k_best(
+        self, text: str, k: int, overlay: Optional[DictLexicon] = None
+    ) -> list[tuple[list[str], float]]:
+        """As k segmentações mais prováveis e a log-probabilidade de cada uma, em
+        uma única passada pelo lattice (cada estado guarda os k melhores caminhos)"""
+        if not text:
+            return [([], 0.0)]
+        k = max(1, k)
+        if self.bigram_logp:
+            return self._k_best_bigram(text, k, overlay)
+        return self._k_best_unigram(text, k, overlay)
+
+    def _known_spans(
+        self, text: str, overlay: Optional[DictLexicon] = None
+    ) -> list[dict[int, float]]:
+        """Log-probabilidade das palavras conhecidas por posição: spans[início][fim]"""
+        spans = []
+        for pos in range(len(text)):
+            counts: dict[int, int] = {}
+            for end, count in self._prefixes(text, pos, overlay):
+                counts[end] = max(counts.get(end, 0), count)
+            spans.append(
+                {end: math.log(count) - self.log_total for end, count in counts.items()}
+            )
+        return spans
+
+    def _k_best_unigram(
+        self, text: str, k: int, overlay: Optional[DictLexicon] = None
+    ) -> list[tuple[list[str], float]]:
+        """k-best com unigramas: O(n * max_word_length * k)"""
+        size = len(text)
+        limit = self.max_word_length
+        spans = self._known_spans(text, overlay)
+        # best[fim] = [(score, início, posição do caminho em best[início])]
+        best: list[list[tuple[float, int, int]]] = [[(0.0, 0, 0)]]
+        for end in range(1, size + 1):
+            # Heap com os k melhores; como best[início] está em ordem decrescente,
+            # o primeiro caminho que não entra encerra aquele início
+            heap: list[tuple[float, int, int]] = []
+            for start in range(max(0, end - limit), end):
+                logp = spans[start].get(end, self.unknown_logp[end - start])
+                for rank, (score, _, _) in enumerate(best[start]):
+                    candidate = (score + logp, start, rank)
+                    if len(heap) < k:
+                        heapq.heappush(heap, candidate)
+                    elif candidate > heap[0]:
+                        heapq.heapreplace(heap, candidate)
+                    else:
+                        break
+            best.append(sorted(heap, reverse=True))
+
+        results = []
+        for score, start, rank in best[size]:
+            words = []
+            end = size
+            while end > 0:
+                words.append(text[start:end])
+                end = start
+                _, start, rank = best[end][rank]
+            results.append((words[::-1], score))
+        return results
+
+    def _k_best_bigram(
+        self, text: str, k: int, overlay: Optional[DictLexicon] = None
+    ) -> list[tuple[list[str], float]]:
+        """k-best com bigramas: O(n * max_word_length^2 * k)"""
+        size = len(text)
+        limit = self.max_word_length
+        # lattice[fim][inicio] = [(score, inicio anterior, posição do caminho)]
+        lattice: list[dict[int, list[tuple[float, int, int]]]] = [
+            {} for _ in range(size + 1)
+        ]
+        lattice[0][0] = [(0.0, 0, 0)]
+
+        for end in range(1, size + 1):
+            for start in range(max(0, end - limit), end):
+                if not lattice[start]:
+                    continue
+                word = text[start:end]
+                word_logp = self._word_logp(word, overlay)
+                candidates = []
+                for prev_start, paths in lattice[start].items():
+                    logp = word_logp
+                    if start > 0:
+                        pair = (text[prev_start:start], word)
+                        logp = self.bigram_logp.get(
+                            pair, word_logp + self.BIGRAM_BACKOFF
+                        )
+                    for rank, (score, _, _) in enumerate(paths):
+                        candidates.append((score + logp, prev_start, rank))
+                lattice[end][start] = heapq.nlargest(k, candidates)
+
+        final = heapq.nlargest(
+            k,
+            (
+                (score, start, rank)
+                for start, paths in lattice[size].items()
+                for rank, (score, _, _) in enumerate(paths)
+            ),
+        )
+        results = []
+        for score, start, rank in final:
+            words = []
+            end = size
+            while end > 0:
+                words.append(text[start:end])
+                _, prev_start, prev_rank = lattice[end][start][rank]
+                end, start, rank = start, prev_start, prev_rank
+            results.append((words[::-1], score))
+        return results
+
 
 class WordSegmenter:
     def __init__(self):
@@ -11,37 +533,272 @@ class WordSegmenter:
 
         # Siglas que devem ser preservadas por idioma
         self.SIGLAS = {
-            "pt": {"sp", "ti", "mg", "pi", "pr"},
-            "en": {"usa", "uk", "ai", "it", "hr"},
+            language: set(acronyms) for language, acronyms in DEFAULT_ACRONYMS.items()
         }
 
+        # Segmentadores por dicionário carregados por idioma
+        self.viterbi_segmenters = {}
+
+        # Locks por (motor, idioma) da carga sob demanda (executor com threads)
+        self._load_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._load_locks_guard = threading.Lock()
+
+        # Motor usado quando a requisição não especifica um
+        self.default_engine = settings.SEGMENTATION_ENGINE
+
+        # Perfil de carga dos modelos spaCy
+        self.load_profile = settings.SPACY_LOAD_PROFILE
+
+        # Atalho sem NLP para textos já segmentados ou palavras conhecidas
+        self.fast_path = settings.SEGMENTATION_FAST_PATH
+
+        # Textos longos: limite de caracteres (0 = sem limite) e pedaços
+        # processados um a um, com janelas sobrepostas no Viterbi
+        self.max_input_chars = settings.SEGMENTATION_MAX_INPUT_CHARS
+        self.chunk_size = settings.SEGMENTATION_CHUNK_SIZE
+        self.chunk_overlap = settings.SEGMENTATION_CHUNK_OVERLAP
+        # O k-best das alternativas percorre o texto inteiro (sem janelas)
+        self.max_top_k_chars = settings.SEGMENTATION_MAX_TOP_K_CHARS
+
+        # Cache de resultados por (idioma, motor, tenant, versão do vocabulário,
+        # texto em minúsculas)
+        self.cache = LRUCache(
+            max_entries=settings.SEGMENTATION_CACHE_MAX_ENTRIES,
+            max_bytes=settings.SEGMENTATION_CACHE_MAX_BYTES,
+            ttl_seconds=settings.SEGMENTATION_CACHE_TTL_SECONDS,
+        )
+
+        # Estado do aquecimento: disabled, pending, running, done ou failed
+        self.warmup_state = "disabled"
+        self.warmup_report: dict = {}
+
+        # Cache de segundo nível compartilhado entre workers (opcional)
+        self.shared_cache = create_shared_cache(
+            settings.SEGMENTATION_SHARED_CACHE,
+            settings.SEGMENTATION_SHARED_CACHE_URL,
+            settings.SEGMENTATION_SHARED_CACHE_TTL_SECONDS,
+            settings.SEGMENTATION_SHARED_CACHE_MAX_ENTRIES,
+        )
+
+        # Cálculos em andamento por chave de cache: requisições idênticas
+        # concorrentes aguardam o mesmo resultado
+        self.single_flight = SingleFlight()
+
+        # Vocabulário de siglas/palavras de domínio recarregável; a troca de
+        # versão descarta o cache local (as chaves antigas não são mais usadas)
+        self.vocabulary = VocabularyStore(
+            create_vocabulary_source(
+                settings.SEGMENTATION_VOCABULARY_FILE,
+                settings.SEGMENTATION_VOCABULARY_SECRET,
+            ),
+            on_swap=lambda vocabulary: self.cache.clear(),
+        )
+
+    def _load_lock(self, engine: str, language: str) -> threading.Lock:
+        """Lock da carga de um motor/idioma: requisições concorrentes esperam a
+        primeira carga em vez de repeti-la"""
+        with self._load_locks_guard:
+            return self._load_locks.setdefault((engine, language), threading.Lock())
+
+    def _check_language(self, language: str) -> None:
+        """Valida se o idioma é suportado"""
+        if language not in self.language_models:
+            raise ValueError(f"Idioma '{language}' não suportado. Use 'pt' ou 'en'.")
+
     def _get_model(self, language: str):
         """Carrega o modelo para o idioma especificado se ainda não estiver carregado"""
         if language not in self.models:
-            if language not in self.language_models:
-                raise ValueError(
-                    f"Idioma '{language}' não suportado. Use 'pt' ou 'en'."
-                )
+            with self._load_lock("spacy", language):
+                # Outra thread pode ter concluído a carga enquanto esta aguardava
+                if language not in self.models:
+                    self.models[language] = self._load_model(language)
+        return self.models[language]
 
-            model_name = self.language_models[language]
-            try:
-                self.models[language] = spacy.load(model_name)
-            except OSError:
-                raise RuntimeError(
-                    f"Modelo '{model_name}' não encontrado. "
-                    "Certifique-se de que está instalado."
+    def _load_model(self, language: str):
+        """Carrega o modelo spaCy do idioma conforme o perfil de carga"""
+        self._check_language(language)
+
+        model_name = self.language_models[language]
+        if self.load_profile not in LOAD_PROFILES:
+            raise ValueError(
+                f"Perfil de carga '{self.load_profile}' não suportado. "
+                "Use 'full', 'tokenizer' ou 'blank'."
+            )
+
+        try:
+            with metrics.time_stage("model_load", language, "spacy"):
+                if self.load_profile == "blank":
+                    return spacy.blank(language)
+                if self.load_profile == "tokenizer":
+                    return spacy.load(model_name, exclude=list(_NON_TOKENIZER_PIPES))
+                return spacy.load(model_name)
+        except OSError:
+            raise RuntimeError(
+                f"Modelo '{model_name}' não encontrado. "
+                "Certifique-se de que está instalado."
+            )
+
+    def _get_viterbi(self, language: str) -> ViterbiSegmenter:
+        """Carrega o segmentador por dicionário do idioma, se ainda não carregado"""
+        if language not in self.viterbi_segmenters:
+            with self._load_lock("viterbi", language):
+                # Outra thread pode ter concluído a carga enquanto esta aguardava
+                if language not in self.viterbi_segmenters:
+                    self.viterbi_segmenters[language] = self._load_viterbi(language)
+        return self.viterbi_segmenters[language]
+
+    def _load_viterbi(self, language: str) -> ViterbiSegmenter:
+        """Carrega o léxico (índice compilado ou TSV) e monta o segmentador"""
+        self._check_language(language)
+
+        with metrics.time_stage("model_load", language, "viterbi"):
+            lexicon_dir = settings.SEGMENTATION_LEXICON_DIR or None
+            siglas = self.SIGLAS.setdefault(language, set())
+            compiled = index_path(language, lexicon_dir)
+            lexicon = None
+
+            if compiled.exists():
+                # Índice compilado (mmap): compartilhado entre os workers
+                try:
+                    lexicon = LexiconIndex.open(compiled)
+                except ValueError as e:
+                    # Índice corrompido ou de versão antiga: usa o léxico TSV
+                    print(f"Índice {compiled} ignorado: {e}")
+
+            if lexicon is not None:
+                siglas |= lexicon.acronyms
+                floor = lexicon.header["median_count"]
+                extra = {sigla: floor for sigla in siglas if sigla not in lexicon}
+            else:
+                lexicon = load_unigrams(language, lexicon_dir)
+                # Garante que as siglas sejam reconhecidas como palavras do léxico
+                floor = int(statistics.median(lexicon.values())) if lexicon else 1
+                for sigla in siglas:
+                    lexicon[sigla] = max(lexicon.get(sigla, 0), floor)
+                extra = {}
+
+            return ViterbiSegmenter(
+                lexicon,
+                load_bigrams(language, lexicon_dir),
+                max_word_length=settings.SEGMENTATION_MAX_WORD_LENGTH,
+                extra_words=extra,
+                vectorized_min_length=settings.SEGMENTATION_VECTORIZED_MIN_LENGTH,
+            )
+
+    def _check_input_size(self, texts: list[str]) -> None:
+        """Rejeita textos acima do limite de caracteres antes de qualquer
+        trabalho do motor"""
+        limit = self.max_input_chars
+        if limit <= 0:
+            return
+        for text in texts:
+            if len(text) > limit:
+                raise ValueError(
+                    f"Texto com {len(text)} caracteres excede o limite de {limit}"
                 )
 
-        return self.models[language]
+    def _tokenize_spacy(self, text: str, language: str) -> list[str]:
+        """Tokeniza o texto com o pipeline do spaCy, um pedaço por vez em textos
+        longos"""
+        nlp = self._get_model(language)
+        tokens = []
+        for chunk in split_chunks(text, self.chunk_size):
+            # Sem componentes no pipeline basta o tokenizador (nlp.make_doc)
+            lowered = chunk.lower()
+            doc = nlp(lowered) if nlp.pipe_names else nlp.make_doc(lowered)
+            tokens.extend(t.text for t in doc if t.is_alpha)
+        return tokens
 
-    def segment_and_format(self, text: str, language: str) -> str:
-        """Segmenta e formata o texto usando NLP"""
+    def _tokenize_spacy_many(self, texts: list[str], language: str) -> list[list[str]]:
+        """Tokeniza vários textos de uma vez com nlp.pipe (os longos, em pedaços,
+        com _tokenize_spacy)"""
         nlp = self._get_model(language)
-        doc = nlp(text.lower())
-        tokens = [t.text for t in doc if t.is_alpha]
+        size = self.chunk_size
+        short = [text for text in texts if size <= 0 or len(text) <= size]
+        docs = nlp.pipe(
+            (text.lower() for text in short),
+            batch_size=settings.SEGMENTATION_BATCH_SIZE,
+            n_process=settings.SEGMENTATION_N_PROCESS,
+        )
+        return [
+            (
+                [t.text for t in next(docs) if t.is_alpha]
+                if size <= 0 or len(text) <= size
+                else self._tokenize_spacy(text, language)
+            )
+            for text in texts
+        ]
+
+    def _tokenize_viterbi(
+        self, text: str, language: str, overlay: Optional[DictLexicon] = None
+    ) -> list[str]:
+        """Segmenta cada sequência de letras do texto com o Viterbi do idioma
+        (as longas em janelas sobrepostas)"""
+        segmenter = self._get_viterbi(language)
+        lowered = text.lower()
+        folded = fold_accents(lowered)
+        # Mantém os acentos originais quando a remoção não altera os índices
+        source = lowered if len(folded) == len(lowered) else folded
+
+        tokens = []
+        for match in _ALPHA_RUN.finditer(folded):
+            offset = match.start()
+            words = segmenter.segment_windows(
+                match.group(), self.chunk_size, self.chunk_overlap, overlay
+            )
+            for word in words:
+                tokens.append(source[offset : offset + len(word)])
+                offset += len(word)
+        return tokens
+
+    def _load_engine(self, language: str, engine: str) -> None:
+        """Carrega o motor do idioma, validando o nome do motor"""
+        if engine == "spacy":
+            self._get_model(language)
+        elif engine == "viterbi":
+            self._get_viterbi(language)
+        else:
+            raise ValueError(
+                f"Motor '{engine}' não suportado. Use 'spacy' ou 'viterbi'."
+            )
+
+    def _classify_fast_path(
+        self,
+        text: str,
+        language: str,
+        siglas: set[str],
+        overlay: Optional[DictLexicon] = None,
+    ) -> Optional[tuple[str, list[str]]]:
+        """Resolve sem o motor textos cujas partes (separadas por espaços, "_",
+        "-" ou CamelCase) são todas palavras conhecidas ou siglas; retorna
+        (caminho, tokens) ou None quando o texto precisa do motor"""
+        if not _FAST_PATH_TEXT.fullmatch(text):
+            return None
+        pieces, camel = split_case_pieces(text)
+        if not pieces:
+            return "empty", []
+
+        segmenter = self._get_viterbi(language)
+        tokens = []
+        for piece in pieces:
+            token = piece.lower()
+            if token not in siglas and not segmenter.is_known(
+                fold_accents(token), overlay
+            ):
+                return None
+            tokens.append(token)
+
+        if camel:
+            return "camelcase", tokens
+        return ("separated" if len(tokens) > 1 else "known_word"), tokens
 
+    def _format_tokens(
+        self, tokens: list[str], language: str, siglas: Optional[set[str]] = None
+    ) -> str:
+        """Capitaliza os tokens preservando as siglas em maiúsculo"""
         formatted = []
-        siglas = self.SIGLAS.get(language, set())
+        if siglas is None:
+            siglas = self.SIGLAS.get(language, set())
 
         for token in tokens:
             if token in siglas:
@@ -51,6 +808,375 @@ class WordSegmenter:
 
         return "".join(formatted)
 
+    def _segment_uncached(
+        self,
+        texts: list[str],
+        language: str,
+        engine: str,
+        vocabulary: Optional[Vocabulary] = None,
+        tenant: str = "",
+        fast_path: bool = True,
+    ) -> list[str]:
+        """Segmenta e formata textos com o motor indicado, sem consultar o cache
+        (fast_path: permite o atalho sem NLP para textos triviais)"""
+        entry = (vocabulary or self.vocabulary.current).entry(language, tenant)
+        siglas = self.SIGLAS.get(language, set())
+        overlay = None
+        if entry is not None:
+            siglas = siglas | entry.acronyms
+            overlay = entry.overlay
+
+        # Carrega o motor antes de medir a tokenização (etapa model_load); erros de
+        # configuração aparecem mesmo quando todos os textos usam o atalho
+        self._load_engine(language, engine)
+
+        token_lists: list[Optional[list[str]]] = [None] * len(texts)
+        if fast_path and self.fast_path:
+            with metrics.time_stage("prefilter", language, engine):
+                for index, text in enumerate(texts):
+                    classified = self._classify_fast_path(
+                        text, language, siglas, overlay
+                    )
+                    if classified is not None:
+                        path, token_lists[index] = classified
+                        metrics.segmentation_path.inc(path, language, engine)
+
+        pending = [index for index, tokens in enumerate(token_lists) if tokens is None]
+        if pending:
+            metrics.segmentation_path.inc(
+                "model", language, engine, amount=len(pending)
+            )
+            model_texts = [texts[index] for index in pending]
+            with metrics.time_stage("tokenize", language, engine):
+                if engine == "viterbi":
+                    tokenized = [
+                        self._tokenize_viterbi(t, language, overlay)
+                        for t in model_texts
+                    ]
+                elif len(model_texts) == 1:
+                    tokenized = [self._tokenize_spacy(model_texts[0], language)]
+                else:
+                    tokenized = self._tokenize_spacy_many(model_texts, language)
+            for index, tokens in zip(pending, tokenized):
+                token_lists[index] = tokens
+
+        with metrics.time_stage("format", language, engine):
+            return [
+                self._format_tokens(tokens, language, siglas) for tokens in token_lists
+            ]
+
+    def _cache_key(
+        self,
+        text: str,
+        language: str,
+        engine: str,
+        tenant: str,
+        vocabulary: Vocabulary,
+    ) -> tuple[str, str, str, str, str]:
+        """Chave de cache: o resultado depende do texto em minúsculas e da versão
+        do vocabulário (entradas de versões anteriores deixam de ser usadas).
+        Com o atalho sem NLP, textos com fronteiras de CamelCase dependem da caixa
+        e entram na chave como recebidos"""
+        key_text = text.lower()
+        if self.fast_path and key_text != text and split_case_pieces(text)[1]:
+            key_text = text
+        return (language, engine, tenant, vocabulary.version, key_text)
+
+    def _resolve_tenant(self, tenant: Optional[str], vocabulary: Vocabulary) -> str:
+        """Tenant efetivo: vazio quando não há vocabulário próprio (cache comum)"""
+        return tenant if tenant and tenant in vocabulary.tenants else ""
+
+    def _resolve_misses(
+        self,
+        texts: list[str],
+        keys: list[tuple[str, str, str, str, str]],
+        engine: str,
+        vocabulary: Vocabulary,
+    ) -> list[str]:
+        """Resolve textos ausentes do cache local (cache compartilhado e motor)"""
+        language, tenant = keys[0][0], keys[0][2]
+        results: list[Optional[str]] = [None] * len(texts)
+        # Chave textual do cache compartilhado: idioma:motor:tenant:versão:texto
+        shared_keys = [":".join(key) for key in keys]
+
+        if self.shared_cache is not None:
+            try:
+                shared = self.shared_cache.get_many(shared_keys)
+            except Exception as e:
+                self.shared_cache.errors += 1
+                print(f"Erro ao consultar cache compartilhado: {e}")
+                shared = {}
+            results = [shared.get(key) for key in shared_keys]
+
+        missing = [index for index, value in enumerate(results) if value is None]
+        if len(missing) < len(texts):
+            metrics.segmentation_path.inc(
+                "shared_cache", language, engine, amount=len(texts) - len(missing)
+            )
+        computed: dict[str, str] = {}
+        if missing:
+            formatted_list = self._segment_uncached(
+                [texts[index] for index in missing],
+                language,
+                engine,
+                vocabulary,
+                tenant,
+            )
+            for index, formatted in zip(missing, formatted_list):
+                results[index] = formatted
+                computed[shared_keys[index]] = formatted
+
+        if self.shared_cache is not None and computed:
+            try:
+                self.shared_cache.set_many(computed)
+            except Exception as e:
+                self.shared_cache.errors += 1
+                print(f"Erro ao gravar no cache compartilhado: {e}")
+
+        for key, formatted in zip(keys, results):
+            self.cache.set(key, formatted)
+        return results
+
+    def _resolve_in_flight(
+        self,
+        texts: list[str],
+        keys: list[tuple[str, str, str, str, str]],
+        engine: str,
+        vocabulary: Vocabulary,
+    ) -> list[str]:
+        """Resolve textos ausentes do cache calculando cada chave uma única vez,
+        mesmo entre chamadas concorrentes (single-flight)"""
+        owned, waiting = self.single_flight.claim(keys)
+        results: list[Optional[str]] = [None] * len(texts)
+
+        # Calcula as chaves próprias antes de aguardar as demais (sem deadlock)
+        if owned:
+            owned_keys = [keys[index] for index in owned]
+            try:
+                resolved = self._resolve_misses(
+                    [texts[index] for index in owned], owned_keys, engine, vocabulary
+                )
+            except BaseException as e:
+                self.single_flight.fail(owned_keys, e)
+                raise
+            self.single_flight.complete(dict(zip(owned_keys, resolved)))
+            for index, formatted in zip(owned, resolved):
+                results[index] = formatted
+
+        if waiting:
+            language = keys[0][0]
+            metrics.segmentation_path.inc(
+                "single_flight", language, engine, amount=len(waiting)
+            )
+            for index, future in waiting.items():
+                results[index] = future.result()
+        return results
+
+    def segment_and_format(
+        self,
+        text: str,
+        language: str,
+        engine: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> str:
+        """Segmenta e formata o texto usando o motor escolhido (spaCy ou Viterbi)"""
+        engine = engine or self.default_engine
+        self._check_input_size([text])
+        # Snapshot lido uma vez: a requisição inteira usa a mesma versão
+        vocabulary = self.vocabulary.current
+        tenant = self._resolve_tenant(tenant, vocabulary)
+        key = self._cache_key(text, language, engine, tenant, vocabulary)
+        formatted = self.cache.get(key) if self.cache.enabled else None
+        if formatted is None:
+            formatted = self._resolve_in_flight([text], [key], engine, vocabulary)[0]
+        else:
+            metrics.segmentation_path.inc("cache", language, engine)
+        return formatted
+
+    def segment_many(
+        self,
+        texts: list[str],
+        language: str,
+        engine: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> list[str]:
+        """Segmenta e formata vários textos do mesmo idioma, na ordem de entrada"""
+        engine = engine or self.default_engine
+        if not texts:
+            return []
+        self._check_input_size(texts)
+
+        vocabulary = self.vocabulary.current
+        tenant = self._resolve_tenant(tenant, vocabulary)
+        keys = [
+            self._cache_key(text, language, engine, tenant, vocabulary)
+            for text in texts
+        ]
+        if self.cache.enabled:
+            results = [self.cache.get(key) for key in keys]
+        else:
+            results = [None] * len(texts)
+        missing = [index for index, value in enumerate(results) if value is None]
+        if len(missing) < len(texts):
+            metrics.segmentation_path.inc(
+                "cache", language, engine, amount=len(texts) - len(missing)
+            )
+
+        if missing:
+            resolved = self._resolve_in_flight(
+                [texts[index] for index in missing],
+                [keys[index] for index in missing],
+                engine,
+                vocabulary,
+            )
+            for index, formatted in zip(missing, resolved):
+                results[index] = formatted
+
+        return results
+
+    def segment_alternatives(
+        self, text: str, language: str, top_k: int, tenant: Optional[str] = None
+    ) -> list[tuple[str, float]]:
+        """As top_k segmentações mais prováveis no modelo de léxico (Viterbi), como
+        (texto formatado, log-probabilidade), em ordem decrescente de score.
+        Textos resolvidos pelo atalho sem NLP (todas as partes conhecidas) têm
+        uma única alternativa: as palavras conhecidas não são divididas"""
+        self._check_input_size([text])
+        if len(text) > self.max_top_k_chars:
+            raise ValueError(
+                f"top_k aceita textos de até {self.max_top_k_chars} caracteres"
+            )
+        vocabulary = self.vocabulary.current
+        entry = vocabulary.entry(language, self._resolve_tenant(tenant, vocabulary))
+        siglas = self.SIGLAS.get(language, set())
+        overlay = None
+        if entry is not None:
+            siglas = siglas | entry.acronyms
+            overlay = entry.overlay
+        segmenter = self._get_viterbi(language)
+
+        # Mesma regra de palavras conhecidas da segmentação sem top_k
+        classified = (
+            self._classify_fast_path(text, language, siglas, overlay)
+            if self.fast_path
+            else None
+        )
+        if classified is not None:
+            tokens = classified[1]
+            score = sum(
+                (segmenter._word_logp(fold_accents(t), overlay) for t in tokens), 0.0
+            )
+            return [(self._format_tokens(tokens, language, siglas), score)]
+        # Segmentações diferentes podem ter a mesma forma formatada (ex.: "s", "p"
+        # e a sigla "sp"): busca caminhos extras para devolver top_k distintas
+        search_k = top_k * 2
+
+        # Fronteiras explícitas (separadores e CamelCase) são mantidas; as k
+        # melhores de cada parte são combinadas pela soma dos scores
+        combined: list[tuple[list[str], float]] = [([], 0.0)]
+        with metrics.time_stage("tokenize", language, "viterbi"):
+            for piece in split_case_pieces(text)[0]:
+                lowered = piece.lower()
+                folded = fold_accents(lowered)
+                source = lowered if len(folded) == len(lowered) else folded
+                options = []
+                for words, score in segmenter.segment_k_best(folded, search_k, overlay):
+                    offset, tokens = 0, []
+                    for word in words:
+                        tokens.append(source[offset : offset + len(word)])
+                        offset += len(word)
+                    options.append((tokens, score))
+                combined = heapq.nlargest(
+                    search_k,
+                    (
+                        (tokens + more, score + extra)
+                        for tokens, score in combined
+                        for more, extra in options
+                    ),
+                    key=lambda option: option[1],
+                )
+
+        alternatives: dict[str, float] = {}
+        for tokens, score in combined:
+            alternatives.setdefault(
+                self._format_tokens(tokens, language, siglas), score
+            )
+        return list(alternatives.items())[:top_k]
+
+    def segment_batch(self, items: list[tuple]) -> list[str]:
+        """Segmenta itens (texto, idioma, motor[, tenant]) agrupando por idioma,
+        motor e tenant"""
+        groups: dict[tuple[str, Optional[str], Optional[str]], list[int]] = {}
+        for index, (_, language, engine, *rest) in enumerate(items):
+            tenant = rest[0] if rest else None
+            groups.setdefault((language, engine, tenant), []).append(index)
+
+        results = [""] * len(items)
+        for (language, engine, tenant), indexes in groups.items():
+            texts = [items[i][0] for i in indexes]
+            for index, formatted in zip(
+                indexes, self.segment_many(texts, language, engine, tenant)
+            ):
+                results[index] = formatted
+        return results
+
+    def preload(
+        self, languages: list[str], engines: Optional[list[str]] = None
+    ) -> dict[str, float]:
+        """Carrega modelos/léxicos antecipadamente e retorna o tempo (s) de cada um"""
+        timings: dict[str, float] = {}
+        for engine in engines or [self.default_engine]:
+            loader = self._get_viterbi if engine == "viterbi" else self._get_model
+            for language in languages:
+                started = time.perf_counter()
+                try:
+                    loader(language)
+                    if engine != "viterbi" and self.fast_path:
+                        # Léxico consultado pelo atalho sem NLP
+                        self._get_viterbi(language)
+                except Exception as e:
+                    print(f"Erro ao pré-carregar '{engine}' para '{language}': {e}")
+                    continue
+                timings[f"{language}:{engine}"] = time.perf_counter() - started
+        return timings
+
+    def warmup(self, languages: list[str], engines: Optional[list[str]] = None) -> dict:
+        """Carrega os modelos e executa segmentações sintéticas antes do tráfego"""
+        self.warmup_state = "running"
+        started = time.perf_counter()
+        engines = engines or [self.default_engine]
+
+        load_seconds = self.preload(languages, engines)
+        models = {}
+        for engine in engines:
+            for language in languages:
+                name = f"{language}:{engine}"
+                models[name] = name in load_seconds
+                samples = WARMUP_SAMPLES.get(language)
+                if models[name] and samples:
+                    # Sem cache nem atalho: o objetivo é exercitar o motor
+                    self._segment_uncached(samples, language, engine, fast_path=False)
+
+        self.warmup_report = {
+            "models": models,
+            "load_seconds": load_seconds,
+            "warmup_seconds": time.perf_counter() - started,
+        }
+        self.warmup_state = "done" if all(models.values()) else "failed"
+        return self.warmup_report
+
+    def readiness(self) -> dict:
+        """Estado de prontidão: pronto sem aquecimento ou após aquecimento completo"""
+        return {
+            "ready": self.warmup_state in ("disabled", "done"),
+            "warmup": self.warmup_state,
+            "loaded": {
+                "spacy": sorted(self.models),
+                "viterbi": sorted(self.viterbi_segmenters),
+            },
+            **self.warmup_report,
+        }
+
     async def check_connection_status(self) -> dict:
         """Verifica o status do serviço de segmentação"""
         try:
@@ -71,7 +1197,9 @@ class WordSegmenter:
             }
 
     async def disconnect(self) -> bool:
-        """Método para compatibilidade - não há conexão para desconectar"""
+        """Fecha as conexões do cache compartilhado, se configurado"""
+        if self.shared_cache is not None:
+            self.shared_cache.close()
         return True
 
 
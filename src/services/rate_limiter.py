@@ -0,0 +1,243 @@
+"""
+Controle de admissão por cliente com token buckets ponderados pelo custo da requisição
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from src.core.config import settings
+
+
+class RateLimitBackend(ABC):
+    """Interface dos backends de token bucket"""
+
+    backend = "none"
+
+    @abstractmethod
+    def take(
+        self, key: str, cost: float, rate: float, burst: float, force: bool = False
+    ) -> float:
+        """Consome cost tokens do bucket da chave. Retorna 0 se admitido ou os
+        segundos até haver tokens suficientes; force debita mesmo sem saldo"""
+
+    def close(self) -> None:
+        """Libera conexões"""
+
+
+def _refill(
+    tokens: float, updated: float, now: float, rate: float, burst: float
+) -> float:
+    """Saldo do bucket após o reabastecimento desde a última atualização"""
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Buckets em memória, por worker (os mais antigos são descartados)"""
+
+    backend = "memory"
+
+    def __init__(
+        self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_keys = max(1, max_keys)
+        self._clock = clock
+        # chave -> (saldo, instante da última atualização)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(
+        self, key: str, cost: float, rate: float, burst: float, force: bool = False
+    ) -> float:
+        with self._lock:
+            now = self._clock()
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = _refill(tokens, updated, now, rate, burst)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait or force:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return 0.0 if force else wait
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """Buckets em arquivo SQLite, compartilhados entre os workers do mesmo host"""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Conexão por thread e por processo (seguro após fork dos workers)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def take(
+        self, key: str, cost: float, rate: float, burst: float, force: bool = False
+    ) -> float:
+        connection = self._connect()
+        # BEGIN IMMEDIATE serializa leitura e escrita do bucket entre processos
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = self._clock()
+            row = connection.execute(
+                "SELECT tokens, updated FROM rate_limit WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = _refill(*(row or (burst, now)), now, rate, burst)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait or force:
+                tokens -= cost
+            connection.execute(
+                "INSERT OR REPLACE INTO rate_limit (key, tokens, updated) "
+                "VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return 0.0 if force else wait
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+# Token bucket atômico no Redis: KEYS[1] = bucket; ARGV = custo, taxa,
+# capacidade, forçar (0/1). Retorna a espera em segundos (string)
+_REDIS_TAKE = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local cost, rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens < cost then wait = (cost - tokens) / rate end
+if wait == 0 or ARGV[4] == '1' then tokens = tokens - cost end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 60)
+if ARGV[4] == '1' then return '0' end
+return tostring(wait)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Buckets no Redis (script Lua atômico), compartilhados entre réplicas"""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError(
+                "Pacote 'redis' não instalado. Instale com 'pip install .[redis]'."
+            )
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._take = self.client.register_script(_REDIS_TAKE)
+
+    def take(
+        self, key: str, cost: float, rate: float, burst: float, force: bool = False
+    ) -> float:
+        wait = self._take(
+            keys=[self.prefix + key], args=[cost, rate, burst, int(force)]
+        )
+        return float(wait)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_rate_limit_backend(backend: str = "", url: str = "") -> RateLimitBackend:
+    """Cria o backend configurado (memória por worker quando não informado)"""
+    if not backend or backend == "memory":
+        return MemoryRateLimitBackend()
+    if backend == "sqlite":
+        return SQLiteRateLimitBackend(url or "/tmp/nuuvify_rate_limit.db")
+    if backend == "redis":
+        return RedisRateLimitBackend(url or "redis://localhost:6379/0")
+    raise ValueError(
+        f"Backend de rate limit '{backend}' não suportado. "
+        "Use 'memory', 'sqlite' ou 'redis'."
+    )
+
+
+class RateLimiter:
+    """Token bucket por cliente: cada requisição custa 1 token mais 1 por bloco
+    completo de bytes_per_token bytes do corpo (textos longos e lotes grandes
+    custam mais)"""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        bytes_per_token: int = 1024,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.rate = max(0.0, rate)
+        self.burst = max(1.0, burst)
+        self.bytes_per_token = max(1, bytes_per_token)
+        self.backend = MemoryRateLimitBackend() if backend is None else backend
+
+    @property
+    def enabled(self) -> bool:
+        """Desativado quando a taxa é 0"""
+        return self.rate > 0
+
+    def cost(self, body_bytes: int) -> float:
+        """Custo de uma requisição, limitado à capacidade do bucket"""
+        return min(self.burst, 1 + body_bytes // self.bytes_per_token)
+
+    def admit(self, client: str, body_bytes: int) -> float:
+        """Tenta admitir a requisição: 0 se admitida ou segundos até poder tentar"""
+        return self.backend.take(client, self.cost(body_bytes), self.rate, self.burst)
+
+    def charge(self, client: str, body_bytes: int) -> None:
+        """Debita bytes recebidos além do estimado na admissão (corpos sem
+        Content-Length, como o streaming); o saldo pode ficar negativo"""
+        tokens = body_bytes // self.bytes_per_token
+        if tokens:
+            self.backend.take(client, tokens, self.rate, self.burst, force=True)
+
+
+# Instância global do serviço
+rate_limiter = RateLimiter(
+    rate=settings.RATE_LIMIT_RATE,
+    burst=settings.RATE_LIMIT_BURST,
+    bytes_per_token=settings.RATE_LIMIT_BYTES_PER_TOKEN,
+    backend=(
+        create_rate_limit_backend(settings.RATE_LIMIT_BACKEND, settings.RATE_LIMIT_URL)
+        if settings.RATE_LIMIT_RATE > 0
+        else None
+    ),
+)
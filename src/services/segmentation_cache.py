@@ -0,0 +1,117 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class LRUCache:
+    """Cache LRU em memória com limite de entradas, bytes e TTL opcional"""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self._clock = clock
+
+        # chave -> (valor, tamanho em bytes, expiração)
+        self._entries: OrderedDict[Hashable, tuple[str, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Cache desativado quando max_entries é 0"""
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Retorna o valor em cache (ou None), marcando-o como recente"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at and expires_at <= self._clock():
+                del self._entries[key]
+                self.size_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self, key: Hashable, value: str, ttl_seconds: Optional[float] = None
+    ) -> None:
+        """Armazena um valor, removendo os menos recentes acima dos limites
+        (ttl_seconds: validade própria da entrada, limitada pelo TTL do cache)"""
+        if not self.enabled:
+            return
+
+        size = sys.getsizeof(value) + sum(
+            sys.getsizeof(part) for part in (key if isinstance(key, tuple) else (key,))
+        )
+        if self.max_bytes and size > self.max_bytes:
+            return
+        ttl = self.ttl_seconds
+        if ttl_seconds is not None:
+            ttl = min(ttl, ttl_seconds) if ttl else ttl_seconds
+            if ttl <= 0:
+                return
+        expires_at = self._clock() + ttl if ttl else 0.0
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[1]
+
+            self._entries[key] = (value, size, expires_at)
+            self.size_bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes and self.size_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> dict:
+        """Retorna contadores e ocupação do cache"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,164 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.core.config import settings
+from src.services.metrics import metrics
+from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Fila do executor de segmentação cheia"""
+
+
+def _init_worker() -> None:
+    """Inicializa o processo worker: verificação periódica do vocabulário"""
+    # Descarta as métricas herdadas do processo pai no fork (já contadas nele)
+    metrics.drain_worker()
+    nuuvify_wordsegment_service.vocabulary.start_watching(
+        settings.SEGMENTATION_VOCABULARY_RELOAD_SECONDS
+    )
+
+
+def _run_with_metrics(func: Callable[..., Any], *args: Any) -> tuple[Any, dict]:
+    """Executa func no processo worker e devolve também as métricas registradas
+    nele (o /metrics é servido pelo processo principal)"""
+    return func(*args), metrics.drain_worker()
+
+
+def _run_segment_and_format(
+    text: str, language: str, engine: Optional[str], tenant: Optional[str] = None
+) -> str:
+    """Executa a segmentação no worker (função de módulo para ser serializável)"""
+    return nuuvify_wordsegment_service.segment_and_format(
+        text, language, engine, tenant
+    )
+
+
+def _run_segment_batch(items: list[tuple]) -> list[str]:
+    """Executa a segmentação em lote no worker"""
+    return nuuvify_wordsegment_service.segment_batch(items)
+
+
+def _run_segment_alternatives(
+    items: list[tuple[str, str, Optional[str], int]],
+) -> list[list[tuple[str, float]]]:
+    """Calcula as segmentações alternativas (texto, idioma, tenant, top_k)"""
+    return [
+        nuuvify_wordsegment_service.segment_alternatives(text, language, top_k, tenant)
+        for text, language, tenant, top_k in items
+    ]
+
+
+class SegmentationExecutor:
+    """Executor limitado que tira a segmentação (CPU) do event loop"""
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        workers: int = 4,
+        max_queue: int = 64,
+        timeout: Optional[float] = None,
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(
+                f"Executor '{mode}' não suportado. Use 'thread' ou 'process'."
+            )
+
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout or None
+
+        # Tarefas submetidas e ainda não concluídas (em execução + na fila)
+        self.inflight = 0
+        self._pool: Optional[Executor] = None
+
+    @property
+    def capacity(self) -> int:
+        """Total de tarefas aceitas simultaneamente"""
+        return self.workers + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        """Tarefas aguardando um worker livre"""
+        return max(0, self.inflight - self.workers)
+
+    def _get_pool(self) -> Executor:
+        """Cria o pool sob demanda"""
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="segmentation"
+                )
+        return self._pool
+
+    def _release(self, future: "asyncio.Future[Any]") -> None:
+        """Libera a vaga quando a tarefa termina (mesmo após timeout do chamador)"""
+        self.inflight -= 1
+        # Consome a exceção de tarefas cujo chamador já desistiu por timeout
+        if not future.cancelled():
+            future.exception()
+
+    async def submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Executa func(*args) no pool respeitando fila e timeout"""
+        if self.inflight >= self.capacity:
+            raise ExecutorSaturatedError(
+                f"Serviço de segmentação sobrecarregado ({self.inflight} tarefas)"
+            )
+
+        if self.mode == "process":
+            func, args = _run_with_metrics, (func, *args)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_pool(), func, *args)
+        self.inflight += 1
+        future.add_done_callback(self._release)
+
+        # shield: o timeout só interrompe a espera, a vaga é liberada no término
+        result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        if self.mode == "process":
+            result, snapshot = result
+            metrics.merge_worker(snapshot)
+        return result
+
+    async def segment_and_format(
+        self,
+        text: str,
+        language: str,
+        engine: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> str:
+        """Segmenta um texto fora do event loop"""
+        return await self.submit(
+            _run_segment_and_format, text, language, engine, tenant
+        )
+
+    async def segment_batch(self, items: list[tuple]) -> list[str]:
+        """Segmenta um lote fora do event loop"""
+        return await self.submit(_run_segment_batch, items)
+
+    async def segment_alternatives(
+        self, items: list[tuple[str, str, Optional[str], int]]
+    ) -> list[list[tuple[str, float]]]:
+        """Calcula as top_k segmentações de cada item fora do event loop"""
+        return await self.submit(_run_segment_alternatives, items)
+
+    def shutdown(self) -> None:
+        """Encerra o pool de workers"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Instância global do serviço
+segmentation_executor = SegmentationExecutor(
+    mode=settings.SEGMENTATION_EXECUTOR,
+    workers=settings.SEGMENTATION_EXECUTOR_WORKERS,
+    max_queue=settings.SEGMENTATION_EXECUTOR_MAX_QUEUE,
+    timeout=settings.SEGMENTATION_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,230 @@
+"""
+Cache de segundo nível compartilhado entre workers e réplicas (SQLite ou Redis)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+
+class SharedCache(ABC):
+    """Interface dos backends de cache compartilhado"""
+
+    backend = "none"
+
+    def __init__(self, ttl_seconds: float = 0):
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Retorna os valores encontrados para as chaves"""
+
+    @abstractmethod
+    def set_many(self, items: dict[str, str]) -> None:
+        """Armazena vários valores"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+
+    def close(self) -> None:
+        """Libera conexões"""
+
+    def stats(self) -> dict:
+        """Retorna contadores do cache"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SQLiteSharedCache(SharedCache):
+    """Cache em arquivo SQLite (WAL), compartilhado entre processos do mesmo host"""
+
+    backend = "sqlite"
+
+    # Limite de parâmetros por consulta do SQLite
+    CHUNK_SIZE = 500
+
+    # Intervalo mínimo (segundos) entre limpezas feitas durante as gravações
+    PURGE_INTERVAL_SECONDS = 60
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = 0,
+        clock: Callable[[], float] = time.time,
+        max_entries: int = 0,
+    ):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self.max_entries = max(0, max_entries)
+        self._clock = clock
+        self._local = threading.local()
+        self._last_purge = clock()
+        connection = self._connect()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS segmentation_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS segmentation_cache_expires_at "
+            "ON segmentation_cache (expires_at)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Conexão por thread e por processo (seguro após fork dos workers)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        if not keys:
+            return {}
+        connection = self._connect()
+        now = self._clock()
+        found: dict[str, str] = {}
+        for offset in range(0, len(keys), self.CHUNK_SIZE):
+            chunk = keys[offset : offset + self.CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                "SELECT key, value FROM segmentation_cache "
+                f"WHERE key IN ({placeholders}) "
+                "AND (expires_at = 0 OR expires_at > ?)",
+                [*chunk, now],
+            )
+            found.update(rows.fetchall())
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: dict[str, str]) -> None:
+        if not items:
+            return
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds else 0.0
+        self._connect().executemany(
+            "INSERT OR REPLACE INTO segmentation_cache (key, value, expires_at) "
+            "VALUES (?, ?, ?)",
+            [(key, value, expires_at) for key, value in items.items()],
+        )
+        # Sem limpeza o arquivo cresce indefinidamente: entradas expiradas só
+        # são filtradas na leitura e as de versões antigas do vocabulário não
+        # são mais lidas
+        now = self._clock()
+        if now - self._last_purge >= self.PURGE_INTERVAL_SECONDS:
+            self._last_purge = now
+            self.purge()
+
+    def purge(self) -> int:
+        """Remove entradas expiradas e as mais antigas acima de max_entries;
+        retorna a quantidade removida"""
+        removed = self.purge_expired()
+        if self.max_entries:
+            # INSERT OR REPLACE gera um novo rowid: rowids menores são mais antigos
+            cursor = self._connect().execute(
+                "DELETE FROM segmentation_cache WHERE rowid <= ("
+                "SELECT rowid FROM segmentation_cache ORDER BY rowid DESC "
+                "LIMIT 1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            removed += cursor.rowcount
+        return removed
+
+    def purge_expired(self) -> int:
+        """Remove entradas expiradas e retorna a quantidade removida"""
+        cursor = self._connect().execute(
+            "DELETE FROM segmentation_cache WHERE expires_at != 0 AND expires_at <= ?",
+            (self._clock(),),
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM segmentation_cache")
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class RedisSharedCache(SharedCache):
+    """Cache em Redis (ou servidor compatível), compartilhado entre réplicas"""
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl_seconds: float = 0, prefix: str = "segment:"):
+        super().__init__(ttl_seconds)
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError(
+                "Pacote 'redis' não instalado. Instale com 'pip install .[redis]'."
+            )
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        if not keys:
+            return {}
+        values = self.client.mget([self.prefix + key for key in keys])
+        found = {key: value for key, value in zip(keys, values) if value is not None}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: dict[str, str]) -> None:
+        if not items:
+            return
+        pipeline = self.client.pipeline(transaction=False)
+        ttl = int(self.ttl_seconds) or None
+        for key, value in items.items():
+            pipeline.set(self.prefix + key, value, ex=ttl)
+        pipeline.execute()
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*", count=1000):
+            self.client.delete(key)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_shared_cache(
+    backend: str, url: str = "", ttl_seconds: float = 0, max_entries: int = 0
+) -> Optional[SharedCache]:
+    """Cria o backend configurado (ou None quando desativado); max_entries limita
+    o SQLite (no Redis o limite é a política de memória do servidor)"""
+    if not backend or backend == "none":
+        return None
+    if backend == "sqlite":
+        return SQLiteSharedCache(
+            url or "/tmp/nuuvify_segmentation_cache.db",
+            ttl_seconds,
+            max_entries=max_entries,
+        )
+    if backend == "redis":
+        return RedisSharedCache(url or "redis://localhost:6379/0", ttl_seconds)
+    raise ValueError(
+        f"Cache compartilhado '{backend}' não suportado. Use 'sqlite' ou 'redis'."
+    )
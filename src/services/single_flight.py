@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import Future
+from typing import Hashable, Iterable
+
+
+class SingleFlight:
+    """Deduplicação de cálculos idênticos em andamento (single-flight).
+
+    O primeiro chamador de uma chave se torna o responsável pelo cálculo; os
+    demais, inclusive chaves repetidas na mesma chamada, aguardam o mesmo
+    Future em vez de recalcular.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        # Chamadas que reaproveitaram um cálculo em andamento
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def claim(self, keys: list[Hashable]) -> tuple[list[int], dict[int, Future]]:
+        """Registra as chaves: retorna os índices a calcular pelo chamador e os
+        Futures a aguardar para as demais"""
+        owned: list[int] = []
+        waiting: dict[int, Future] = {}
+        with self._lock:
+            for index, key in enumerate(keys):
+                future = self._calls.get(key)
+                if future is None:
+                    self._calls[key] = Future()
+                    owned.append(index)
+                else:
+                    waiting[index] = future
+            self.shared += len(waiting)
+        return owned, waiting
+
+    def complete(self, results: dict[Hashable, object]) -> None:
+        """Publica os resultados e libera as chaves"""
+        with self._lock:
+            futures = [(self._calls.pop(key), value) for key, value in results.items()]
+        for future, value in futures:
+            future.set_result(value)
+
+    def fail(self, keys: Iterable[Hashable], error: BaseException) -> None:
+        """Propaga o erro aos chamadores em espera e libera as chaves"""
+        with self._lock:
+            futures = [self._calls.pop(key) for key in keys if key in self._calls]
+        for future in futures:
+            future.set_exception(error)
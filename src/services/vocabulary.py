@@ -0,0 +1,300 @@
+"""
+Vocabulário de siglas e palavras de domínio, recarregável sem reiniciar o serviço
+
+Formato (JSON), em arquivo ou em um segredo do Azure Key Vault:
+
+    {
+        "pt": {"acronyms": ["rh", "erp"], "words": ["nuuvify"]},
+        "en": {"acronyms": ["crm"]},
+        "tenants": {"acme": {"pt": {"acronyms": ["acme"]}}}
+    }
+"""
+
+import hashlib
+import json
+import os
+import threading
+from types import MappingProxyType
+from typing import Callable, Optional
+
+from src.services.azure_service import azure_service
+from src.services.lexicon import fold_accents
+from src.services.lexicon_index import DictLexicon
+
+# Chave do vocabulário padrão (sem tenant)
+DEFAULT_TENANT = ""
+
+
+def _terms(values: object) -> frozenset[str]:
+    """Normaliza uma lista de termos (minúsculas, sem espaços nas pontas)"""
+    if not isinstance(values, list):
+        raise ValueError("As listas do vocabulário devem ser arrays JSON de strings")
+    return frozenset(
+        str(value).strip().lower() for value in values if str(value).strip()
+    )
+
+
+class VocabularyEntry:
+    """Siglas e palavras de um idioma (já combinadas com o vocabulário padrão)"""
+
+    __slots__ = ("acronyms", "words", "overlay")
+
+    def __init__(self, acronyms: frozenset[str], words: frozenset[str]):
+        self.acronyms = acronyms
+        self.words = words
+        # Termos consultados pelo Viterbi como palavras adicionais do léxico, sem
+        # acentos como o texto que ele segmenta (as siglas seguem com acentos
+        # para a formatação)
+        terms = {fold_accents(term) for term in acronyms | words}
+        self.overlay = DictLexicon(dict.fromkeys(terms, 1)) if terms else None
+
+
+class Vocabulary:
+    """Snapshot imutável do vocabulário; a versão é o hash do conteúdo"""
+
+    def __init__(self, document: Optional[dict] = None):
+        document = document or {}
+        if not isinstance(document, dict):
+            raise ValueError("O vocabulário deve ser um objeto JSON")
+
+        canonical = json.dumps(document, sort_keys=True, ensure_ascii=False)
+        # Mesmo conteúdo gera a mesma versão em todos os workers e réplicas
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+        tenants = document.get("tenants", {})
+        if not isinstance(tenants, dict):
+            raise ValueError("'tenants' deve ser um objeto JSON")
+
+        entries: dict[tuple[str, str], VocabularyEntry] = {}
+        defaults = self._parse_languages(document)
+        for language, (acronyms, words) in defaults.items():
+            entries[(DEFAULT_TENANT, language)] = VocabularyEntry(acronyms, words)
+
+        for tenant, languages in tenants.items():
+            if not isinstance(languages, dict):
+                raise ValueError(f"Vocabulário do tenant '{tenant}' inválido")
+            for language, (acronyms, words) in self._parse_languages(languages).items():
+                base_acronyms, base_words = defaults.get(
+                    language, (frozenset(), frozenset())
+                )
+                entries[(tenant, language)] = VocabularyEntry(
+                    base_acronyms | acronyms, base_words | words
+                )
+
+        self._entries = MappingProxyType(entries)
+        self.tenants = frozenset(tenants)
+
+    @staticmethod
+    def _parse_languages(
+        document: dict,
+    ) -> dict[str, tuple[frozenset[str], frozenset[str]]]:
+        """Extrai {idioma: (siglas, palavras)} de um objeto do vocabulário"""
+        parsed = {}
+        for language, lists in document.items():
+            if language == "tenants":
+                continue
+            if not isinstance(lists, dict):
+                raise ValueError(f"Vocabulário do idioma '{language}' inválido")
+            parsed[language] = (
+                _terms(lists.get("acronyms", [])),
+                _terms(lists.get("words", [])),
+            )
+        return parsed
+
+    def entry(
+        self, language: str, tenant: Optional[str] = None
+    ) -> Optional[VocabularyEntry]:
+        """Vocabulário do tenant (ou o padrão, se o tenant não tiver um próprio)"""
+        if tenant:
+            entry = self._entries.get((tenant, language))
+            if entry is not None:
+                return entry
+        return self._entries.get((DEFAULT_TENANT, language))
+
+    def acronyms(self, language: str, tenant: Optional[str] = None) -> frozenset[str]:
+        """Siglas do idioma para o tenant"""
+        entry = self.entry(language, tenant)
+        return entry.acronyms if entry is not None else frozenset()
+
+    def stats(self) -> dict:
+        """Resumo do vocabulário carregado"""
+        return {
+            "version": self.version,
+            "tenants": sorted(self.tenants),
+            "entries": {
+                f"{tenant or 'default'}:{language}": {
+                    "acronyms": len(entry.acronyms),
+                    "words": len(entry.words),
+                }
+                for (tenant, language), entry in sorted(self._entries.items())
+            },
+        }
+
+
+class VocabularySource:
+    """Origem do documento JSON do vocabulário"""
+
+    name = "none"
+
+    def changed(self) -> bool:
+        """Indica se a origem pode ter mudado desde a última leitura"""
+        return True
+
+    def load(self) -> dict:
+        """Lê o documento"""
+        return {}
+
+
+class FileVocabularySource(VocabularySource):
+    """Vocabulário em arquivo JSON (recarregado quando o mtime muda)"""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        # mtime da última leitura (-1 antes da primeira; None se o arquivo não existia)
+        self._mtime: Optional[int] = -1
+
+    def _stat(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def changed(self) -> bool:
+        return self._stat() != self._mtime
+
+    def load(self) -> dict:
+        # Registrado antes da leitura: um arquivo inválido só é relido ao mudar
+        self._mtime = self._stat()
+        with open(self.path, encoding="utf-8") as fh:
+            return json.load(fh)
+
+
+class KeyVaultVocabularySource(VocabularySource):
+    """Vocabulário em um segredo do Azure Key Vault (conteúdo JSON)"""
+
+    name = "keyvault"
+
+    def __init__(self, secret_name: str):
+        self.secret_name = secret_name
+
+    def load(self) -> dict:
+        value = azure_service.get_secret(self.secret_name)
+        if value is None:
+            raise RuntimeError(
+                f"Segredo '{self.secret_name}' indisponível no Azure Key Vault"
+            )
+        return json.loads(value)
+
+
+def create_vocabulary_source(path: str = "", secret_name: str = "") -> VocabularySource:
+    """Cria a origem configurada (arquivo tem precedência sobre o Key Vault)"""
+    if path:
+        return FileVocabularySource(path)
+    if secret_name:
+        return KeyVaultVocabularySource(secret_name)
+    return VocabularySource()
+
+
+class VocabularyStore:
+    """Mantém o snapshot atual e o substitui atomicamente a cada recarga.
+
+    Leitores apenas obtêm a referência de `current` (sem locks); a recarga
+    compila o novo snapshot à parte e troca a referência ao final. A primeira
+    carga não acontece na importação (o Key Vault pode ser lento): é feita por
+    `start_watching` no lifespan ou, fora da aplicação, no primeiro acesso.
+    """
+
+    def __init__(
+        self,
+        source: Optional[VocabularySource] = None,
+        on_swap: Optional[Callable[[Vocabulary], None]] = None,
+    ):
+        self.source = source or VocabularySource()
+        self._current = Vocabulary()
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        # Chamado após cada troca (ex.: limpar caches da versão anterior)
+        self.on_swap = on_swap
+        self.reloads = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def current(self) -> Vocabulary:
+        """Snapshot atual (faz a primeira carga se ainda não foi feita)"""
+        if not self._loaded:
+            self.load()
+        return self._current
+
+    def load(self) -> None:
+        """Primeira carga da origem, feita uma única vez"""
+        with self._load_lock:
+            if not self._loaded:
+                self.reload(force=True)
+                self._loaded = True
+
+    def reload(self, force: bool = False) -> bool:
+        """Recarrega da origem; retorna True se a versão mudou"""
+        with self._reload_lock:
+            if not force and not self.source.changed():
+                return False
+            try:
+                vocabulary = Vocabulary(self.source.load())
+            except Exception as e:
+                # Mantém o snapshot anterior quando a origem é inválida
+                self.errors += 1
+                self.last_error = str(e)
+                print(f"Erro ao carregar vocabulário ({self.source.name}): {e}")
+                return False
+
+            self.last_error = None
+            if vocabulary.version == self._current.version:
+                return False
+            self._current = vocabulary
+            self.reloads += 1
+            print(f"Vocabulário carregado: versão {vocabulary.version}")
+            if self.on_swap is not None:
+                self.on_swap(vocabulary)
+            return True
+
+    def start_watching(self, interval: float) -> None:
+        """Faz a primeira carga e verifica a origem periodicamente em uma thread
+        de fundo"""
+        self.load()
+        if interval <= 0 or self.source.name == "none":
+            return
+        # Após um fork a thread do processo pai não existe no filho
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+
+        def watch() -> None:
+            while not self._stop.wait(interval):
+                self.reload()
+
+        self._watcher = threading.Thread(
+            target=watch, name="vocabulary-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Interrompe a verificação periódica"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def stats(self) -> dict:
+        """Estado do vocabulário e das recargas"""
+        return {
+            **self.current.stats(),
+            "source": self.source.name,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
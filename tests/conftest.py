@@ -5,6 +5,7 @@ Configurações para testes da API Nuuvify
 import sys
 from pathlib import Path
 
+import httpx
 import pytest
 
 # Adicionar o diretório raiz do projeto ao sys.path
@@ -12,6 +13,32 @@ root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
 
+class FakeClock:
+    """Relógio controlado manualmente"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Relógio controlado pelo teste (TTLs e token buckets)"""
+    return FakeClock()
+
+
+@pytest.fixture
+async def client():
+    """Cliente HTTP em processo (sem servidor)"""
+    from src.api.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
 @pytest.fixture(scope="session")
 def api_base_url():
     """URL base da API para testes"""
@@ -0,0 +1,142 @@
+"""
+Testes para as segmentações alternativas (top_k) com score
+"""
+
+import pytest
+
+from src.core.config import settings
+from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+
+
+class TestSegmentAlternatives:
+    """Testes do serviço"""
+
+    def test_alternatives(self):
+        """Testa k alternativas distintas, ordenadas e formatadas"""
+        ranked = nuuvify_wordsegment_service.segment_alternatives(
+            "minhacasatemsp", "pt", 3
+        )
+        assert len(ranked) == 3
+        assert ranked[0][0] == "MinhaCasaTemSP"
+        assert len({formatted for formatted, _ in ranked}) == 3
+        assert [score for _, score in ranked] == sorted(
+            (score for _, score in ranked), reverse=True
+        )
+
+    def test_keeps_explicit_boundaries(self):
+        """Testa que separadores e CamelCase continuam sendo fronteiras"""
+        ranked = nuuvify_wordsegment_service.segment_alternatives(
+            "Casa_notafiscal", "pt", 5
+        )
+        assert ranked[0][0] == "CasaNotaFiscal"
+        assert len(ranked) > 1
+        # "nota" sempre começa uma nova palavra, qualquer que seja a alternativa
+        assert all(formatted[4] == "N" for formatted, _ in ranked)
+
+    def test_known_word_is_not_split(self):
+        """Testa a mesma regra de palavras conhecidas da segmentação sem top_k"""
+        ranked = nuuvify_wordsegment_service.segment_alternatives("defeito", "pt", 3)
+        assert [formatted for formatted, _ in ranked] == ["Defeito"]
+        assert nuuvify_wordsegment_service.segment_and_format(
+            "defeito", "pt", "viterbi"
+        ) == ("Defeito")
+
+    def test_long_text_rejected(self, monkeypatch):
+        """Testa que o k-best (sem janelas) não roda em textos longos"""
+        monkeypatch.setattr(nuuvify_wordsegment_service, "max_top_k_chars", 10)
+        with pytest.raises(ValueError):
+            nuuvify_wordsegment_service.segment_alternatives("minhacasatemsp", "pt", 2)
+
+
+class TestAlternativesRoutes:
+    """Testes dos endpoints com top_k"""
+
+    async def test_single(self, client):
+        """Testa o top_k no endpoint individual"""
+        response = await client.post(
+            "/api/v1/segment/",
+            json={
+                "text": "humanresources",
+                "language": "en",
+                "engine": "viterbi",
+                "top_k": 2,
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["formatted"] == "HumanResources"
+        assert [item["formatted"] for item in data["alternatives"]][0] == (
+            "HumanResources"
+        )
+        assert len(data["alternatives"]) == 2
+        assert data["alternatives"][0]["score"] > data["alternatives"][1]["score"]
+
+    async def test_formatted_is_top_alternative(self, client):
+        """Testa que formatted e a primeira alternativa não se contradizem"""
+        for text in ("defeito", "minhacasatemsp"):
+            response = await client.post(
+                "/api/v1/segment/",
+                json={"text": text, "language": "pt", "top_k": 3},
+            )
+            data = response.json()
+            assert data["formatted"] == data["alternatives"][0]["formatted"]
+
+    async def test_spacy_rejected(self, client):
+        """Testa que top_k não é aceito com o motor spacy"""
+        response = await client.post(
+            "/api/v1/segment/",
+            json={"text": "casa", "language": "pt", "engine": "spacy", "top_k": 2},
+        )
+        assert response.status_code == 422
+
+    async def test_long_text_rejected(self, client, monkeypatch):
+        """Testa o 422 para top_k em textos acima do limite de caracteres"""
+        monkeypatch.setattr(settings, "SEGMENTATION_MAX_TOP_K_CHARS", 10)
+        payload = {"text": "minhacasatemsp", "language": "pt", "engine": "viterbi"}
+        response = await client.post("/api/v1/segment/", json={**payload, "top_k": 2})
+        assert response.status_code == 422
+        response = await client.post("/api/v1/segment/", json=payload)
+        assert response.status_code == 200
+
+    async def test_without_top_k(self, client):
+        """Testa que a resposta não muda quando top_k não é pedido"""
+        response = await client.post(
+            "/api/v1/segment/",
+            json={"text": "casa", "language": "pt", "engine": "viterbi"},
+        )
+        assert response.json() == {"original": "casa", "formatted": "Casa"}
+
+    async def test_batch(self, client):
+        """Testa alternativas apenas nos itens do lote que pediram top_k"""
+        response = await client.post(
+            "/api/v1/segment/batch",
+            json={
+                "items": [
+                    {"text": "casa", "language": "pt", "engine": "viterbi"},
+                    {
+                        "text": "notafiscal",
+                        "language": "pt",
+                        "engine": "viterbi",
+                        "top_k": 3,
+                    },
+                ]
+            },
+        )
+        results = response.json()["results"]
+        assert results[0] == {"original": "casa", "formatted": "Casa"}
+        assert len(results[1]["alternatives"]) == 3
+        assert results[1]["formatted"] == results[1]["alternatives"][0]["formatted"]
+
+    @pytest.mark.parametrize("top_k", [0, 1000])
+    async def test_invalid_top_k(self, client, top_k):
+        """Testa a rejeição de top_k fora dos limites"""
+        response = await client.post(
+            "/api/v1/segment/",
+            json={
+                "text": "casa",
+                "language": "pt",
+                "engine": "viterbi",
+                "top_k": top_k,
+            },
+        )
+        assert response.status_code == 422
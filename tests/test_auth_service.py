@@ -0,0 +1,124 @@
+"""
+Testes para o AuthService (hashing fora do event loop e cache de tokens)
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from jose import jwt
+
+from src.services import auth_service as auth_module
+from src.services.auth_service import AuthService
+from src.services.segmentation_cache import LRUCache
+
+
+@pytest.fixture
+def service(clock):
+    """AuthService com chave de teste e relógio controlado no cache de tokens"""
+    service = AuthService()
+    service.SECRET_KEY = "chave-de-teste"
+    service.clock = clock
+    service.token_cache = LRUCache(max_entries=10, ttl_seconds=300, clock=service.clock)
+    yield service
+    service.hash_executor.shutdown()
+
+
+class TestTokenCache:
+    """Testes para a verificação de tokens com cache"""
+
+    @pytest.fixture
+    def decodes(self, monkeypatch):
+        """Conta as decodificações do JWT"""
+        calls = []
+        original = jwt.decode
+
+        def counting(*args, **kwargs):
+            calls.append(args[0])
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(auth_module.jwt, "decode", counting)
+        return calls
+
+    def test_cached_until_exp(self, service, decodes):
+        """Testa que o token verificado vem do cache até o exp"""
+        token = jwt.encode(
+            {"sub": "admin", "exp": int(time.time()) + 60},
+            service.SECRET_KEY,
+            algorithm=service.algorithm,
+        )
+        assert service.verify_token(token)["sub"] == "admin"
+        assert service.verify_token(token)["sub"] == "admin"
+        assert len(decodes) == 1
+        assert len(service.token_cache) == 1
+        assert token not in service.token_cache._entries
+
+        # Após o exp a entrada expira e o token é verificado novamente
+        service.clock.now += 61
+        service.verify_token(token)
+        assert len(decodes) == 2
+
+    def test_create_access_token(self, service, decodes):
+        """Testa o token emitido pelo próprio serviço"""
+        token = service.create_access_token({"sub": "admin"})
+        claims = service.verify_token(token)
+        claims["sub"] = "alterado"
+        assert service.verify_token(token)["sub"] == "admin"
+        assert len(decodes) == 1
+
+    def test_invalid_tokens(self, service):
+        """Testa que tokens inválidos ou expirados não são aceitos nem guardados"""
+        expired = jwt.encode(
+            {"sub": "admin", "exp": int(time.time()) - 10},
+            service.SECRET_KEY,
+            algorithm=service.algorithm,
+        )
+        forged = jwt.encode(
+            {"sub": "admin"}, "outra-chave", algorithm=service.algorithm
+        )
+        for token in (expired, forged, "nao-e-um-jwt"):
+            assert service.verify_token(token) is None
+        assert len(service.token_cache) == 0
+
+
+class TestPasswordHashing:
+    """Testes para o hashing de senhas no pool de threads"""
+
+    async def test_runs_off_loop_with_limit(self, service, monkeypatch):
+        """Testa que a verificação não roda no event loop e respeita o limite"""
+        service.hash_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="auth-hash"
+        )
+        lock = threading.Lock()
+        running = {"now": 0, "max": 0, "threads": set()}
+
+        def slow_verify(plain, hashed):
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+                running["threads"].add(threading.current_thread().name)
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+            return plain == hashed
+
+        monkeypatch.setattr(service, "verify_password", slow_verify)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        results = await asyncio.gather(
+            ticker(),
+            *(service.verify_password_async("senha", "senha") for _ in range(4)),
+            service.verify_password_async("senha", "outra"),
+        )
+        assert results[1:] == [True, True, True, True, False]
+        assert ticks == 5
+        assert running["max"] == 2
+        assert all(name.startswith("auth-hash") for name in running["threads"])
@@ -0,0 +1,133 @@
+"""
+Testes para o acesso ao Azure Key Vault (clientes sob demanda e cache com TTL)
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.azure_service import AzureKeyVaultService
+
+
+class FakeVault:
+    """Key Vault em processo: segredos em dicionário e contagem de consultas"""
+
+    def __init__(self, secrets: dict[str, str], delay: float = 0.0):
+        self.secrets = dict(secrets)
+        self.delay = delay
+        self.calls: list[str] = []
+        self.created: list[bool] = []
+        self.closed: list[bool] = []
+
+    def _lookup(self, name: str) -> SimpleNamespace:
+        self.calls.append(name)
+        if name not in self.secrets:
+            raise KeyError(f"segredo '{name}' não encontrado")
+        return SimpleNamespace(value=self.secrets[name])
+
+    def factory(self, asynchronous: bool):
+        self.created.append(asynchronous)
+        vault = self
+
+        class SyncClient:
+            def get_secret(self, name):
+                return vault._lookup(name)
+
+            def close(self):
+                vault.closed.append(False)
+
+        class AsyncClient:
+            async def get_secret(self, name):
+                await asyncio.sleep(vault.delay)
+                return vault._lookup(name)
+
+            async def close(self):
+                vault.closed.append(True)
+
+        return AsyncClient() if asynchronous else SyncClient()
+
+
+@pytest.fixture
+def vault():
+    """Vault com dois segredos"""
+    return FakeVault({"vocab": '{"acronyms": ["sp"]}', "token": "abc"}, delay=0.01)
+
+
+@pytest.fixture
+def service(vault):
+    """Serviço sobre o vault em processo"""
+    return AzureKeyVaultService(
+        ttl_seconds=60, client_factory=vault.factory, enabled=True
+    )
+
+
+class TestAzureKeyVaultService:
+    """Testes para o AzureKeyVaultService"""
+
+    def test_lazy_client(self, vault, service):
+        """Testa que nenhum cliente é criado antes do primeiro uso"""
+        assert vault.created == []
+        assert service.get_secret("token") == "abc"
+        assert vault.created == [False]
+
+    def test_not_configured(self):
+        """Testa o serviço sem Key Vault configurado"""
+        service = AzureKeyVaultService(enabled=False)
+        assert service.get_secret("token") is None
+        assert asyncio.run(service.get_secret_async("token")) is None
+
+    def test_sync_cache(self, vault, service):
+        """Testa que o segredo em cache não consulta o vault novamente"""
+        assert service.get_secret("token") == "abc"
+        assert service.get_secret("token") == "abc"
+        assert service.get_secret("ausente") is None
+        assert vault.calls == ["token", "ausente"]
+
+    async def test_concurrent_fetch_is_shared(self, vault, service):
+        """Testa que consultas simultâneas ao mesmo segredo viram uma só"""
+        results = await asyncio.gather(
+            *(service.get_secret_async("token") for _ in range(5))
+        )
+        assert results == ["abc"] * 5
+        assert vault.calls == ["token"]
+        assert vault.created == [True]
+
+    async def test_stale_value_is_refreshed(self, vault, service):
+        """Testa que o valor vencido é devolvido e renovado em segundo plano"""
+        assert await service.get_secret_async("token") == "abc"
+        vault.secrets["token"] = "novo"
+        service._cache["token"] = ("abc", 0.0)
+
+        assert await service.get_secret_async("token") == "abc"
+        await asyncio.sleep(0.05)
+        assert await service.get_secret_async("token") == "novo"
+        assert vault.calls == ["token", "token"]
+
+    async def test_failure_keeps_previous_value(self, vault, service):
+        """Testa que uma falha do vault mantém o último valor conhecido"""
+        assert await service.get_secret_async("token") == "abc"
+        del vault.secrets["token"]
+        service._cache["token"] = ("abc", 0.0)
+        assert await service._fetch("token") == "abc"
+
+    async def test_prefetch_and_refresh(self, vault, service):
+        """Testa a pré-carga concorrente e a renovação em segundo plano"""
+        values = await service.prefetch(["vocab", "token", "vocab", ""])
+        assert values == {"vocab": '{"acronyms": ["sp"]}', "token": "abc"}
+        assert sorted(vault.calls) == ["token", "vocab"]
+
+        service.ttl = 0.05
+        service.start_refresh(["vocab"])
+        await asyncio.sleep(0.12)
+        await service.close()
+        assert vault.calls.count("vocab") >= 3
+        assert service._refresh_task is None
+        assert vault.closed == [True]
+
+        # Consultas síncronas usam o cache preenchido de forma assíncrona
+        calls = len(vault.calls)
+        service.ttl = 60
+        await service.prefetch(["token"])
+        assert service.get_secret("token") == "abc"
+        assert len(vault.calls) == calls + 1
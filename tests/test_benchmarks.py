@@ -0,0 +1,77 @@
+"""
+Testes para a suíte de benchmarks
+"""
+
+import json
+
+from benchmarks.corpus import build_corpus
+from benchmarks.harness import compare, summarize
+from benchmarks.runner import main
+
+
+class TestBenchmarkHarness:
+    """Testes para corpora, estatísticas e comparação com o baseline"""
+
+    def test_corpus_is_deterministic(self):
+        """Testa que o corpus é o mesmo a cada geração"""
+        assert build_corpus("pt", "short") == build_corpus("pt", "short")
+        assert build_corpus("pt", "short") != build_corpus("en", "short")
+        assert len(build_corpus("en", "long", count=5)) == 5
+
+    def test_summarize(self):
+        """Testa estatísticas por operação"""
+        result = summarize([2.0, 1.0, 3.0], operations=10)
+        assert result["median"] == 0.2
+        assert result["min"] == 0.1
+        assert result["ops_per_second"] == 5.0
+
+    def test_compare(self):
+        """Testa a classificação de regressões e melhorias pela mediana"""
+        baseline = {"a": {"median": 1.0}, "b": {"median": 1.0}, "c": {"median": 1.0}}
+        results = {
+            "a": {"median": 1.5},
+            "b": {"median": 0.5},
+            "c": {"median": 1.1},
+            "d": {"median": 1.0},
+            "e": {"skipped": "modelo ausente"},
+        }
+        status = {
+            item["name"]: item["status"]
+            for item in compare(results, baseline, tolerance=0.25)
+        }
+        assert status == {"a": "regression", "b": "improvement", "c": "ok"}
+
+
+class TestBenchmarkRunner:
+    """Testes para o runner"""
+
+    def test_json_output_and_baseline(self, tmp_path):
+        """Testa a saída JSON e a detecção de regressão contra o baseline"""
+        output = tmp_path / "resultados.json"
+        args = [
+            "--engines",
+            "viterbi",
+            "--languages",
+            "pt",
+            "--sizes",
+            "short",
+            "--only",
+            "service,batch",
+            "--repeat",
+            "1",
+        ]
+        assert main([*args, "-o", str(output)]) == 0
+
+        report = json.loads(output.read_text())
+        assert set(report["results"]) == {
+            "service.single.viterbi.pt.short",
+            "service.batch.viterbi.pt.short",
+        }
+        assert report["environment"]["python"]
+
+        # Baseline 1000x mais rápido: o runner deve acusar regressão
+        for result in report["results"].values():
+            result["median"] /= 1000
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(report))
+        assert main([*args, "-o", str(output), "--baseline", str(baseline)]) == 1
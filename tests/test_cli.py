@@ -0,0 +1,103 @@
+"""
+Testes para a CLI de segmentação em massa (nuuvify-segment)
+"""
+
+import json
+
+import pytest
+
+from src.cli import main
+from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    """Arquivo texto com uma entrada por linha"""
+    path = tmp_path / "entrada.txt"
+    path.write_text("minhacasatemsp\ncodigodoproduto\nnotafiscaleletronica\n" * 5)
+    return path
+
+
+EXPECTED = ["MinhaCasaTemSP", "CodigoDoProduto", "NotaFiscalEletronica"] * 5
+
+
+class TestSegmentCli:
+    """Testes para o nuuvify-segment"""
+
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_text_file(self, text_file, tmp_path, workers):
+        """Testa arquivo texto mantendo a ordem de entrada"""
+        output = tmp_path / "saida.txt"
+        args = [str(text_file), "-o", str(output), "-e", "viterbi", "-w", workers]
+        assert main([*args, "--chunk-lines", "4"]) == 0
+        assert output.read_text().splitlines() == EXPECTED
+
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_rejected_line_is_left_empty(self, tmp_path, workers, monkeypatch):
+        """Testa que uma linha acima do limite de tamanho não interrompe o
+        arquivo: o campo fica vazio e as demais linhas são segmentadas"""
+        monkeypatch.setattr(nuuvify_wordsegment_service, "max_input_chars", 20)
+        source = tmp_path / "entrada.txt"
+        source.write_text(
+            "minhacasatemsp\n" + "a" * 21 + "\n" + "codigodoproduto\n" * 20
+        )
+        output = tmp_path / "saida.txt"
+        args = [str(source), "-o", str(output), "-e", "viterbi", "-w", workers]
+        assert main([*args, "--chunk-lines", "1"]) == 0
+        assert output.read_text().splitlines() == [
+            "MinhaCasaTemSP",
+            "",
+            *["CodigoDoProduto"] * 20,
+        ]
+
+    def test_worker_failure_does_not_hang(self, text_file, tmp_path, monkeypatch):
+        """Testa que o erro de um worker encerra a CLI em vez de travar o pool"""
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("falha no worker")
+
+        monkeypatch.setattr(nuuvify_wordsegment_service, "segment_many", fail)
+        output = tmp_path / "saida.txt"
+        args = [str(text_file), "-o", str(output), "-e", "viterbi", "-w", "2"]
+        with pytest.raises(RuntimeError):
+            main([*args, "--chunk-lines", "1"])
+
+    def test_csv_column_by_name(self, tmp_path):
+        """Testa CSV com coluna selecionada pelo nome do cabeçalho"""
+        source = tmp_path / "entrada.csv"
+        source.write_text("id,texto\n1,minhacasatemsp\n2,codigodoproduto\n")
+        output = tmp_path / "saida.csv"
+
+        main(
+            [str(source), "-o", str(output), "-c", "texto", "-e", "viterbi", "-w", "1"]
+        )
+        assert output.read_text().splitlines() == [
+            "id,texto,formatted",
+            "1,minhacasatemsp,MinhaCasaTemSP",
+            "2,codigodoproduto,CodigoDoProduto",
+        ]
+
+    def test_resume_from_checkpoint(self, text_file, tmp_path):
+        """Testa a retomada a partir do checkpoint, descartando saída parcial"""
+        output = tmp_path / "saida.txt"
+        checkpoint = tmp_path / "checkpoint.json"
+        first_chunk = "MinhaCasaTemSP\nCodigoDoProduto\nNotaFiscalEletronica\n"
+
+        # Simula uma execução interrompida após o primeiro bloco de 3 linhas
+        output.write_text(first_chunk + "Parcial")
+        checkpoint.write_text(
+            json.dumps(
+                {
+                    "input_offset": len("minhacasatemsp\ncodigodoproduto\n")
+                    + len("notafiscaleletronica\n"),
+                    "output_offset": len(first_chunk),
+                    "lines": 3,
+                }
+            )
+        )
+
+        args = [str(text_file), "-o", str(output), "-e", "viterbi", "-w", "1"]
+        main([*args, "--checkpoint", str(checkpoint), "--chunk-lines", "3"])
+
+        assert output.read_text().splitlines() == EXPECTED
+        assert json.loads(checkpoint.read_text())["lines"] == len(EXPECTED)
@@ -0,0 +1,123 @@
+"""
+Testes para o atalho sem NLP (CamelCase, separadores e palavras conhecidas)
+"""
+
+import pytest
+
+from src.services.metrics import metrics
+from src.services.nuuvify_wordsegment_service import WordSegmenter, split_case_pieces
+
+
+@pytest.fixture
+def segmenter():
+    """Segmentador sem caches, com o motor viterbi"""
+    segmenter = WordSegmenter()
+    segmenter.cache.max_entries = 0
+    segmenter.shared_cache = None
+    return segmenter
+
+
+class TestSplitCasePieces:
+    """Testes para a divisão em partes"""
+
+    def test_camel_case(self):
+        """Testa fronteiras minúscula -> maiúscula e sigla -> palavra"""
+        assert split_case_pieces("MinhaCasaTemSP") == (
+            ["Minha", "Casa", "Tem", "SP"],
+            True,
+        )
+        assert split_case_pieces("HTTPServer") == (["HTTP", "Server"], True)
+        assert split_case_pieces("notaFiscalÉmitida") == (
+            ["nota", "Fiscal", "Émitida"],
+            True,
+        )
+
+    def test_separators(self):
+        """Testa separadores, dígitos e textos sem letras"""
+        assert split_case_pieces("minha_casa-tem sp") == (
+            ["minha", "casa", "tem", "sp"],
+            False,
+        )
+        assert split_case_pieces("Casa123") == (["Casa"], False)
+        assert split_case_pieces("123 !") == ([], False)
+
+
+class TestFastPath:
+    """Testes do atalho no serviço"""
+
+    def test_skips_engine(self, segmenter, monkeypatch):
+        """Testa que textos já segmentados não passam pelo motor"""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("motor não deveria ser chamado")
+
+        monkeypatch.setattr(segmenter, "_tokenize_viterbi", fail)
+        cases = {
+            "MinhaCasaTemSP": "MinhaCasaTemSP",
+            "minha_casa-tem sp": "MinhaCasaTemSP",
+            "casa": "Casa",
+            "informação": "Informação",
+            "": "",
+        }
+        for text, expected in cases.items():
+            assert segmenter.segment_and_format(text, "pt", "viterbi") == expected
+
+    def test_glued_text_uses_engine(self, segmenter):
+        """Testa que texto colado em minúsculas continua no motor"""
+        before = metrics.segmentation_path.value("model", "pt", "viterbi")
+        results = segmenter.segment_many(
+            ["minhacasatemsp", "NotaFiscaldoproduto", "casa azul"], "pt", "viterbi"
+        )
+        assert results == ["MinhaCasaTemSP", "NotaFiscalDoProduto", "CasaAzul"]
+        assert metrics.segmentation_path.value("model", "pt", "viterbi") == (before + 2)
+
+    def test_path_metrics(self, segmenter):
+        """Testa a contagem de textos por caminho"""
+        paths = ("camelcase", "separated", "known_word")
+        before = {
+            path: metrics.segmentation_path.value(path, "en", "viterbi")
+            for path in paths
+        }
+        segmenter.segment_many(
+            ["HumanResources", "human-resources", "house"], "en", "viterbi"
+        )
+        for path in paths:
+            assert metrics.segmentation_path.value(path, "en", "viterbi") == (
+                before[path] + 1
+            )
+        assert any(
+            line.startswith('nuuvify_segmentation_path_total{path="camelcase"')
+            for line in metrics.render()
+        )
+
+    @pytest.mark.parametrize(
+        "order", [["TheRapist", "therapist"], ["therapist", "TheRapist"]]
+    )
+    def test_cache_respects_case(self, order):
+        """Testa que o resultado não depende da ordem das requisições em cache"""
+        segmenter = WordSegmenter()
+        segmenter.shared_cache = None
+        results = {
+            text: segmenter.segment_and_format(text, "en", "viterbi") for text in order
+        }
+        assert results == {"TheRapist": "TheRapist", "therapist": "Therapist"}
+
+    def test_punctuation_and_digits_use_engine(self, segmenter):
+        """Testa que apóstrofos e dígitos ficam com a tokenização do motor"""
+        segmenter.load_profile = "blank"
+        assert segmenter.segment_and_format("don't stop", "en", "spacy") == "DoStop"
+        assert segmenter.segment_and_format("abc123 def", "en", "spacy") == "Def"
+
+    def test_disabled(self, segmenter):
+        """Testa que, desativado, todos os textos passam pelo motor"""
+        segmenter.fast_path = False
+        before = metrics.segmentation_path.value("model", "pt", "viterbi")
+        assert segmenter.segment_and_format("MinhaCasa", "pt", "viterbi") == (
+            "MinhaCasa"
+        )
+        assert metrics.segmentation_path.value("model", "pt", "viterbi") == (before + 1)
+
+    def test_invalid_engine(self, segmenter):
+        """Testa que o motor é validado mesmo quando o atalho resolveria o texto"""
+        with pytest.raises(ValueError):
+            segmenter.segment_and_format("casa", "pt", "outro")
@@ -0,0 +1,155 @@
+"""
+Testes para o índice compilado de léxico (trie em double-array)
+"""
+
+import gzip
+
+import pytest
+
+from src.core.config import settings
+from src.services.lexicon import compile_index
+from src.services.lexicon_index import (
+    DictLexicon,
+    LexiconIndex,
+    build_index,
+    write_index,
+)
+from src.services.nuuvify_wordsegment_service import ViterbiSegmenter, WordSegmenter
+
+COUNTS = {"a": 100, "casa": 40, "casamento": 5, "minha": 50, "tem": 30, "ação": 7}
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Índice gravado em disco e aberto via mmap"""
+    path = write_index(COUNTS, tmp_path / "pt_lexicon.idx", ["sp"], "pt")
+    lexicon = LexiconIndex.open(path)
+    yield lexicon
+    lexicon.close()
+
+
+class TestLexiconIndex:
+    """Testes para o LexiconIndex"""
+
+    def test_counts_and_membership(self, index):
+        """Testa contagens, pertinência e siglas"""
+        assert len(index) == len(COUNTS) + 1
+        assert index.count("casa") == 40
+        assert index.count("ação") == 7
+        assert index.count("cas") == 0
+        assert index.count("xyz") == 0
+        assert "casamento" in index
+        assert "casam" not in index
+        assert index.is_acronym("sp")
+        assert not index.is_acronym("casa")
+        assert index.acronyms == {"sp"}
+
+    def test_prefixes_of(self, index):
+        """Testa as palavras que começam em cada posição"""
+        text = "minhacasamento"
+        assert index.prefixes_of(text, 5) == [(9, 40), (14, 5)]
+        assert index.prefixes_of(text, 5, max_length=4) == [(9, 40)]
+        assert index.prefixes_of(text, 1) == []
+        assert index.prefixes_of(text, 0) == [(5, 50)]
+
+    def test_matches_dict_lexicon(self, index):
+        """Testa que o índice responde como o léxico em dicionário"""
+        lexicon = DictLexicon({**COUNTS, "sp": index.count("sp")})
+        text = "aminhacasatemspcasamentoação"
+        for pos in range(len(text)):
+            assert index.prefixes_of(text, pos) == lexicon.prefixes_of(text, pos)
+
+    def test_invalid_file(self):
+        """Testa a rejeição de arquivos que não são índices"""
+        with pytest.raises(ValueError):
+            LexiconIndex(b"not an index file")
+
+    def test_corrupted_file(self, tmp_path):
+        """Testa a rejeição de índices corrompidos, truncados ou de outra versão"""
+        data = bytearray(build_index(COUNTS))
+        data[-20] ^= 0xFF
+        path = tmp_path / "corrompido.idx"
+        path.write_bytes(data)
+        with pytest.raises(ValueError, match="Checksum"):
+            LexiconIndex.open(path)
+        assert LexiconIndex.open(path, verify=False).count("xyz") == 0
+
+        with pytest.raises(ValueError, match="truncado"):
+            LexiconIndex(build_index(COUNTS)[:-64])
+
+        old = build_index(COUNTS).replace(b'"version": 2', b'"version": 1', 1)
+        with pytest.raises(ValueError, match="Versão"):
+            LexiconIndex(old)
+
+    def test_numpy_arrays(self, index):
+        """Testa os arrays NumPy sem cópia sobre o arquivo mapeado"""
+        arrays = index.arrays()
+        assert set(arrays) == {"base", "check", "counts", "flags"}
+        assert str(arrays["counts"].dtype) == "uint32"
+        assert not arrays["counts"].flags.writeable
+        assert int(arrays["counts"].sum()) == index.total
+        assert len(arrays["flags"]) == index.header["states"]
+        del arrays
+
+    def test_count_matrix(self, index):
+        """Testa a consulta vetorizada de todas as palavras candidatas"""
+        text = "minhacasamentoxação"
+        matrix = index.count_matrix(text, 10)
+        assert matrix.shape == (len(text), 10)
+        for pos in range(len(text)):
+            found = [
+                (pos + length + 1, int(count))
+                for length, count in enumerate(matrix[pos])
+                if count
+            ]
+            assert found == index.prefixes_of(text, pos, 10)
+
+    def test_empty_lexicon(self):
+        """Testa que não é possível compilar um léxico vazio"""
+        with pytest.raises(ValueError):
+            build_index({})
+
+    def test_viterbi_with_index(self, index):
+        """Testa que o Viterbi segmenta igual com índice e com dicionário"""
+        from_index = ViterbiSegmenter(index, max_word_length=10)
+        from_dict = ViterbiSegmenter(dict(COUNTS, sp=index.count("sp")))
+        for text in ("minhacasatemsp", "casamentoxyzcasa", "açãominha"):
+            assert from_index.segment(text) == from_dict.segment(text)
+
+
+class TestCompiledLexiconInService:
+    """Testes do serviço usando o índice compilado"""
+
+    def test_service_uses_compiled_index(self, tmp_path, monkeypatch):
+        """Testa a carga do índice, siglas compiladas e siglas adicionadas depois"""
+        with gzip.open(tmp_path / "pt_unigrams.tsv.gz", "wt", encoding="utf-8") as fh:
+            fh.write("minha\t50\ncasa\t40\ntem\t30\nnova\t20\n")
+        compile_index("pt", str(tmp_path), ["xpto"])
+        monkeypatch.setattr(settings, "SEGMENTATION_LEXICON_DIR", str(tmp_path))
+
+        segmenter = WordSegmenter()
+        segmenter.cache.max_entries = 0
+        segmenter.shared_cache = None
+        segmenter.SIGLAS["pt"].add("rj")
+
+        result = segmenter.segment_and_format("minhacasaxptotemrj", "pt", "viterbi")
+        assert isinstance(segmenter.viterbi_segmenters["pt"].lexicon, LexiconIndex)
+        assert result == "MinhaCasaXPTOTemRJ"
+
+    def test_corrupted_index_falls_back_to_tsv(self, tmp_path, monkeypatch):
+        """Testa que um índice corrompido é ignorado em favor do léxico TSV"""
+        with gzip.open(tmp_path / "pt_unigrams.tsv.gz", "wt", encoding="utf-8") as fh:
+            fh.write("minha\t50\ncasa\t40\n")
+        path = compile_index("pt", str(tmp_path))
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF
+        path.write_bytes(data)
+        monkeypatch.setattr(settings, "SEGMENTATION_LEXICON_DIR", str(tmp_path))
+
+        segmenter = WordSegmenter()
+        segmenter.cache.max_entries = 0
+        segmenter.shared_cache = None
+
+        result = segmenter.segment_and_format("minhacasa", "pt", "viterbi")
+        assert not isinstance(segmenter.viterbi_segmenters["pt"].lexicon, LexiconIndex)
+        assert result == "MinhaCasa"
@@ -0,0 +1,70 @@
+"""
+Testes para as métricas no formato Prometheus
+"""
+
+import pytest
+
+from src.services.metrics import Histogram, render_samples
+
+
+class TestHistogram:
+    """Testes para o histograma"""
+
+    def test_cumulative_buckets(self):
+        """Testa buckets cumulativos, soma e contagem"""
+        histogram = Histogram("latency_seconds", "Latência", ("route",), (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "/a")
+
+        lines = histogram.render()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+        assert 'latency_seconds_count{route="/a"} 4' in lines
+        assert histogram.count("/a") == 4
+
+    def test_label_escaping(self):
+        """Testa o escape de aspas nos rótulos"""
+        lines = render_samples("value", "Valor", [({"name": 'a"b'}, 1)])
+        assert lines[-1] == 'value{name="a\\"b"} 1'
+
+
+class TestMetricsEndpoint:
+    """Testes para /metrics"""
+
+    @pytest.mark.asyncio
+    async def test_request_and_stage_metrics(self, client):
+        """Testa latência por rota/idioma, etapas da segmentação e métricas de
+        execução"""
+        response = await client.post(
+            "/api/v1/segment/",
+            json={"text": "metricasdeteste", "language": "pt", "engine": "viterbi"},
+        )
+        assert response.status_code == 200
+
+        response = await client.get("/api/v1/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+        body = response.text
+        assert (
+            "nuuvify_http_request_duration_seconds_count"
+            '{method="POST",route="/api/v1/segment/",language="pt",status="200"}'
+        ) in body
+        for stage in ("tokenize", "format"):
+            assert (
+                "nuuvify_segmentation_stage_duration_seconds_count"
+                f'{{stage="{stage}",language="pt",engine="viterbi"}}'
+            ) in body
+        assert 'nuuvify_cache_hit_ratio{cache="local"}' in body
+        assert "nuuvify_executor_queue_depth{pid=" in body
+        assert "nuuvify_process_resident_memory_bytes{pid=" in body
+
+    @pytest.mark.asyncio
+    async def test_unmatched_route(self, client):
+        """Testa que URLs inexistentes são agrupadas em uma única série"""
+        await client.get("/nao-existe/123")
+
+        response = await client.get("/api/v1/metrics")
+        assert 'route="unmatched",language="",status="404"' in response.text
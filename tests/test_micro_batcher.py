@@ -0,0 +1,97 @@
+"""
+Testes para o micro-batching de requisições individuais
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.micro_batcher import MicroBatcher
+from src.services.segmentation_executor import (
+    ExecutorSaturatedError,
+    SegmentationExecutor,
+)
+
+
+class RecordingExecutor(SegmentationExecutor):
+    """Executor que registra os lotes recebidos"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches: list[list[tuple]] = []
+
+    async def segment_batch(self, items: list[tuple]) -> list[str]:
+        self.batches.append(items)
+        return await super().segment_batch(items)
+
+
+@pytest.fixture
+def executor():
+    """Executor com dois workers"""
+    executor = RecordingExecutor(workers=2, max_queue=8, timeout=5)
+    yield executor
+    executor.shutdown()
+
+
+class TestMicroBatcher:
+    """Testes para o MicroBatcher"""
+
+    async def test_coalesces_concurrent_requests(self, executor):
+        """Testa que requisições concorrentes viram um lote, na ordem de chegada
+        (a primeira vai direto ao executor ocioso; as demais aguardam seu término)"""
+        batcher = MicroBatcher(executor, max_wait_ms=20, max_items=64)
+        texts = ["minhacasatemsp", "codigodoproduto", "notafiscal"] * 3
+
+        results = await asyncio.gather(
+            *(batcher.segment_and_format(t, "pt", "viterbi") for t in texts)
+        )
+        assert results == ["MinhaCasaTemSP", "CodigoDoProduto", "NotaFiscal"] * 3
+        assert [len(batch) for batch in executor.batches] == [1, 8]
+        assert [item[0] for batch in executor.batches for item in batch] == texts
+        assert batcher.pending == 0
+
+    async def test_max_items_and_languages(self, executor):
+        """Testa o envio ao atingir max_items e lotes separados por idioma"""
+        batcher = MicroBatcher(executor, max_wait_ms=20, max_items=4)
+        requests = [
+            batcher.segment_and_format(f"casa{i}", "pt", "viterbi") for i in range(6)
+        ] + [batcher.segment_and_format("bluehouse", "en", "viterbi")]
+
+        results = await asyncio.gather(*requests)
+        assert results[-1] == "BlueHouse"
+        sizes = sorted((batch[0][1], len(batch)) for batch in executor.batches)
+        assert sizes == [("en", 1), ("pt", 1), ("pt", 1), ("pt", 4)]
+
+    async def test_idle_is_not_delayed(self, executor):
+        """Testa que requisições sequenciais não esperam o timer do lote"""
+        batcher = MicroBatcher(executor, max_wait_ms=1000, max_items=64)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for text in ["minhacasa", "notafiscal", "codigodoproduto"]:
+            await batcher.segment_and_format(text, "pt", "viterbi")
+        assert loop.time() - started < 0.5
+        assert [len(batch) for batch in executor.batches] == [1, 1, 1]
+
+    async def test_propagates_errors(self):
+        """Testa que o erro do lote chega a todas as requisições"""
+        executor = SegmentationExecutor(workers=1, max_queue=0, timeout=5)
+        executor.inflight = executor.capacity
+        batcher = MicroBatcher(executor, max_wait_ms=5, max_items=8)
+        try:
+            results = await asyncio.gather(
+                batcher.segment_and_format("casa", "pt", "viterbi"),
+                batcher.segment_and_format("azul", "pt", "viterbi"),
+                return_exceptions=True,
+            )
+            assert all(isinstance(r, ExecutorSaturatedError) for r in results)
+        finally:
+            executor.inflight = 0
+            executor.shutdown()
+
+    async def test_disabled(self, executor):
+        """Testa que sem espera a requisição vai direto ao executor"""
+        batcher = MicroBatcher(executor, max_wait_ms=0)
+        assert not batcher.enabled
+        result = await batcher.segment_and_format("minhacasa", "pt", "viterbi")
+        assert result == "MinhaCasa"
+        assert executor.batches == []
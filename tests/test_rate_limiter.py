@@ -0,0 +1,216 @@
+"""
+Testes para o rate limit por cliente (token buckets ponderados pelo custo)
+"""
+
+import httpx
+import pytest
+
+from src.api import middleware
+from src.api.main import app, create_app
+from src.api.middleware import RateLimitMiddleware, _client_identity
+from src.core.config import settings
+from src.services.auth_service import auth_service
+from src.services.metrics import metrics
+from src.services.rate_limiter import (
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimiter,
+    SQLiteRateLimitBackend,
+    create_rate_limit_backend,
+)
+
+
+class TestBackends:
+    """Testes para os backends de token bucket"""
+
+    @pytest.mark.parametrize("kind", ["memory", "sqlite"])
+    def test_token_bucket(self, kind, tmp_path, clock):
+        """Testa capacidade, reabastecimento e débito forçado"""
+        if kind == "memory":
+            backend = MemoryRateLimitBackend(clock=clock)
+        else:
+            backend = SQLiteRateLimitBackend(str(tmp_path / "rl.db"), clock=clock)
+
+        assert backend.take("a", 3, rate=1, burst=4) == 0
+        assert backend.take("a", 2, rate=1, burst=4) == pytest.approx(1.0)
+        assert backend.take("b", 4, rate=1, burst=4) == 0
+
+        clock.now = 1.0
+        assert backend.take("a", 2, rate=1, burst=4) == 0
+        # Débito forçado deixa o saldo negativo
+        assert backend.take("a", 3, rate=1, burst=4, force=True) == 0
+        assert backend.take("a", 1, rate=1, burst=4) == pytest.approx(4.0)
+
+        clock.now = 100.0
+        assert backend.take("a", 4, rate=1, burst=4) == 0
+        backend.close()
+
+    def test_sqlite_shared_between_instances(self, tmp_path, clock):
+        """Testa que dois processos (instâncias) compartilham o mesmo bucket"""
+        path = str(tmp_path / "rl.db")
+        first = SQLiteRateLimitBackend(path, clock=clock)
+        second = SQLiteRateLimitBackend(path, clock=clock)
+        assert first.take("a", 3, rate=1, burst=3) == 0
+        assert second.take("a", 1, rate=1, burst=3) == pytest.approx(1.0)
+
+    def test_memory_max_keys(self):
+        """Testa o descarte dos buckets mais antigos"""
+        backend = MemoryRateLimitBackend(max_keys=2)
+        for key in ("a", "b", "c"):
+            backend.take(key, 1, rate=1, burst=5)
+        assert len(backend) == 2
+
+    def test_invalid_backend(self):
+        """Testa backend não suportado"""
+        with pytest.raises(ValueError):
+            create_rate_limit_backend("memcached")
+
+    def test_interface_is_abstract(self):
+        """Testa que a interface não pode ser instanciada sem take"""
+        with pytest.raises(TypeError):
+            RateLimitBackend()
+
+
+class TestRateLimiter:
+    """Testes para o custo das requisições"""
+
+    def test_cost(self):
+        """Testa o custo por bytes do corpo, limitado à capacidade"""
+        limiter = RateLimiter(rate=1, burst=10, bytes_per_token=100)
+        assert limiter.cost(0) == 1
+        assert limiter.cost(99) == 1
+        assert limiter.cost(100) == 2
+        assert limiter.cost(250) == 3
+        assert limiter.cost(10_000) == 10
+        assert not RateLimiter(rate=0, burst=10).enabled
+
+
+class TestClientIdentity:
+    """Testes da identificação do cliente por IP atrás (ou não) do proxy"""
+
+    @staticmethod
+    def _scope(headers):
+        return {
+            "client": ("192.168.0.9", 5000),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+
+    def test_ignores_headers_without_proxy(self):
+        """Testa que headers forjados são ignorados quando o proxy não é confiável"""
+        scope = self._scope({"X-Real-IP": "10.0.0.1", "X-Forwarded-For": "10.0.0.2"})
+        assert _client_identity(scope, frozenset(), False) == "ip:192.168.0.9"
+
+    def test_uses_rightmost_forwarded_hop(self):
+        """Testa que só o último salto do X-Forwarded-For identifica o cliente"""
+        scope = self._scope({"X-Forwarded-For": "1.2.3.4, 10.0.0.2"})
+        assert _client_identity(scope, frozenset(), True) == "ip:10.0.0.2"
+
+        scope = self._scope({"X-Real-IP": "10.0.0.1", "X-Forwarded-For": "1.2.3.4"})
+        assert _client_identity(scope, frozenset(), True) == "ip:10.0.0.1"
+
+
+class TestRateLimitMiddleware:
+    """Testes do middleware sobre a aplicação"""
+
+    @pytest.fixture
+    def limiter(self, clock):
+        """Limite de 1 token/s com capacidade 3 e 100 bytes por token"""
+        return RateLimiter(
+            rate=1,
+            burst=3,
+            bytes_per_token=100,
+            backend=MemoryRateLimitBackend(clock=clock),
+        )
+
+    @pytest.fixture
+    async def client(self, limiter):
+        """Cliente HTTP em processo com o middleware nas rotas de segmentação"""
+        limited = RateLimitMiddleware(
+            app,
+            limiter=limiter,
+            paths=["/api/v1/segment"],
+            api_keys=["chave-parceiro"],
+            trust_proxy=True,
+        )
+        transport = httpx.ASGITransport(app=limited)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+    @staticmethod
+    def _segment(client, text="minhacasa", **kwargs):
+        return client.post(
+            "/api/v1/segment/",
+            json={"text": text, "language": "pt", "engine": "viterbi"},
+            **kwargs,
+        )
+
+    async def test_sheds_after_burst(self, client, clock):
+        """Testa o 429 com Retry-After ao esgotar o bucket e a recuperação"""
+        before = metrics.rate_limited.value("ip")
+        for _ in range(3):
+            assert (await self._segment(client)).status_code == 200
+        response = await self._segment(client)
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+        assert metrics.rate_limited.value("ip") == before + 1
+
+        # Rotas fora dos prefixos configurados não são limitadas
+        assert (await client.get("/api/v1/health")).status_code == 200
+
+        clock.now = 1.0
+        assert (await self._segment(client)).status_code == 200
+
+    async def test_cost_weighted_by_size(self, client):
+        """Testa que um texto longo consome mais tokens que um curto"""
+        response = await self._segment(client, text="minhacasa" * 20)
+        assert response.status_code == 200
+        assert (await self._segment(client)).status_code == 429
+
+    async def test_separate_identities(self, client, monkeypatch):
+        """Testa buckets por sub do JWT, API key conhecida e IP do proxy"""
+        monkeypatch.setattr(auth_service, "SECRET_KEY", "chave-de-teste")
+        token = auth_service.create_access_token({"sub": "cliente-a"})
+        identities = [
+            {"Authorization": f"Bearer {token}"},
+            {"X-API-Key": "chave-parceiro"},
+            {"X-Real-IP": "10.0.0.1"},
+            {"X-Real-IP": "10.0.0.2"},
+        ]
+        for headers in identities:
+            for _ in range(3):
+                response = await self._segment(client, headers=headers)
+                assert response.status_code == 200
+            assert (await self._segment(client, headers=headers)).status_code == 429
+
+        # API key desconhecida não ganha bucket próprio: cai no IP
+        headers = {"X-API-Key": "aleatoria", "X-Real-IP": "10.0.0.1"}
+        assert (await self._segment(client, headers=headers)).status_code == 429
+
+    async def test_streaming_body_is_charged(self, client, limiter):
+        """Testa que corpos sem Content-Length são debitados ao serem recebidos"""
+
+        async def body():
+            yield b'{"text": "minhacasa", "language": "pt"}\n' * 5
+
+        response = await client.post(
+            "/api/v1/segment/stream?engine=viterbi",
+            content=body(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+        # 1 token na admissão + 2 pelos ~200 bytes recebidos
+        assert (await self._segment(client)).status_code == 429
+
+    async def test_429_has_cors_headers(self, limiter, monkeypatch):
+        """Testa que o CORS envolve o rate limit: navegadores conseguem ler o 429
+        e o Retry-After"""
+        monkeypatch.setattr(settings, "RATE_LIMIT_RATE", 1)
+        monkeypatch.setattr(middleware, "rate_limiter", limiter)
+        transport = httpx.ASGITransport(app=create_app())
+        headers = {"Origin": "http://x.com"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            for _ in range(3):
+                await self._segment(c, headers=headers)
+            response = await self._segment(c, headers=headers)
+        assert response.status_code == 429
+        assert response.headers["access-control-allow-origin"] == "http://x.com"
@@ -0,0 +1,74 @@
+"""
+Testes para as respostas JSON das rotas de segmentação
+"""
+
+import json
+
+import pytest
+
+from src.api import responses
+from src.api.responses import dumps, segmentation_record
+from src.core.config import settings
+from src.core.models import WordSegmentationResponse
+
+
+class TestDumps:
+    """Testes para a serialização com orjson e com o json da stdlib"""
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_same_output(self, fast, monkeypatch):
+        """Testa que orjson e json produzem o mesmo JSON compacto em UTF-8"""
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+        record = segmentation_record(
+            "notafiscaleletrônica", "NotaFiscalEletrônica", [("NotaFiscal", -1.5)]
+        )
+        expected = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        assert dumps(record) == expected
+
+    def test_without_orjson(self, monkeypatch):
+        """Testa o fallback quando o extra fast-json não está instalado"""
+        monkeypatch.setattr(responses, "orjson", None)
+        assert dumps({"formatted": "Casa"}) == b'{"formatted":"Casa"}'
+
+    def test_record_matches_model(self):
+        """Testa que o corpo montado sem validação é aceito pelo response_model"""
+        record = segmentation_record("casasp", "CasaSP", [("CasaSP", -2.0)])
+        model = WordSegmentationResponse.model_validate(record)
+        assert model.model_dump(exclude_none=True) == record
+        assert "alternatives" not in segmentation_record("casa", "Casa")
+
+
+class TestSegmentationRoutes:
+    """Testes das rotas com a resposta serializada diretamente"""
+
+    async def test_segment(self, client):
+        """Testa /segment/ com e sem alternativas"""
+        payload = {"text": "minhacasatemsp", "language": "pt", "engine": "viterbi"}
+        response = await client.post("/api/v1/segment/", json=payload)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {
+            "original": "minhacasatemsp",
+            "formatted": "MinhaCasaTemSP",
+        }
+
+        response = await client.post("/api/v1/segment/", json={**payload, "top_k": 2})
+        alternatives = response.json()["alternatives"]
+        assert alternatives[0]["formatted"] == "MinhaCasaTemSP"
+        assert len(alternatives) == 2
+
+    async def test_batch(self, client):
+        """Testa /segment/batch mantendo a ordem e omitindo campos vazios"""
+        items = [
+            {"text": "minhacasatemsp", "language": "pt", "engine": "viterbi"},
+            {"text": "humanresourceshr", "language": "en", "engine": "viterbi"},
+        ]
+        response = await client.post("/api/v1/segment/batch", json={"items": items})
+        assert response.json() == {
+            "results": [
+                {"original": "minhacasatemsp", "formatted": "MinhaCasaTemSP"},
+                {"original": "humanresourceshr", "formatted": "HumanResourcesHR"},
+            ]
+        }
@@ -0,0 +1,120 @@
+"""
+Testes unitários para o cache de resultados de segmentação
+"""
+
+from src.services.nuuvify_wordsegment_service import WordSegmenter
+from src.services.segmentation_cache import LRUCache
+
+
+class TestLRUCache:
+    """Testes para o cache LRU"""
+
+    def test_hit_and_miss(self):
+        """Testa contadores de acerto e falha"""
+        cache = LRUCache(max_entries=10)
+        assert cache.get("a") is None
+        cache.set("a", "A")
+        assert cache.get("a") == "A"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        """Testa a remoção da entrada menos recente"""
+        cache = LRUCache(max_entries=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")
+        cache.set("c", "C")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+        assert cache.evictions == 1
+
+    def test_max_bytes(self):
+        """Testa o limite de ocupação em bytes"""
+        cache = LRUCache(max_entries=100, max_bytes=400)
+        for index in range(10):
+            cache.set(("pt", f"texto{index}"), f"Texto{index}")
+
+        assert cache.size_bytes <= 400
+        assert len(cache) < 10
+        assert cache.evictions > 0
+
+    def test_ttl(self, clock):
+        """Testa a expiração das entradas"""
+        cache = LRUCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.set("a", "A")
+
+        clock.now = 4
+        assert cache.get("a") == "A"
+        clock.now = 6
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+        assert cache.size_bytes == 0
+
+    def test_entry_ttl(self, clock):
+        """Testa a validade própria da entrada, limitada pelo TTL do cache"""
+        cache = LRUCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.set("curta", "a", ttl_seconds=2)
+        cache.set("longa", "b", ttl_seconds=60)
+        cache.set("vencida", "c", ttl_seconds=-1)
+        clock.now = 3
+        assert cache.get("curta") is None
+        assert cache.get("longa") == "b"
+        assert cache.get("vencida") is None
+        clock.now = 6
+        assert cache.get("longa") is None
+
+    def test_disabled(self):
+        """Testa que max_entries=0 desativa o cache"""
+        cache = LRUCache(max_entries=0)
+        cache.set("a", "A")
+        assert cache.get("a") is None
+
+    def test_clear(self):
+        """Testa a limpeza do cache"""
+        cache = LRUCache(max_entries=10)
+        cache.set("a", "A")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+
+class TestServiceCache:
+    """Testes do cache no serviço de segmentação"""
+
+    def test_segment_and_format_uses_cache(self):
+        """Testa que textos repetidos (ignorando caixa, sem CamelCase) vêm do cache"""
+        segmenter = WordSegmenter()
+        first = segmenter.segment_and_format("minhacasatemsp", "pt", "viterbi")
+        second = segmenter.segment_and_format("MINHACASATEMSP", "pt", "viterbi")
+
+        assert first == second == "MinhaCasaTemSP"
+        assert segmenter.cache.hits == 1
+        assert segmenter.cache.misses == 1
+
+    def test_segment_many_computes_only_misses(self):
+        """Testa que o lote só processa os textos ausentes do cache"""
+        segmenter = WordSegmenter()
+        segmenter.segment_and_format("codigodoproduto", "pt", "viterbi")
+
+        results = segmenter.segment_many(
+            ["codigodoproduto", "minhacasatemsp"], "pt", "viterbi"
+        )
+        assert results == ["CodigoDoProduto", "MinhaCasaTemSP"]
+        assert segmenter.cache.hits == 1
+        assert len(segmenter.cache) == 2
+
+    def test_cache_key_includes_engine(self):
+        """Testa que motores diferentes não compartilham entradas"""
+        segmenter = WordSegmenter()
+        segmenter.load_profile = "blank"
+        segmenter.segment_and_format("minhacasatemsp", "pt", "viterbi")
+
+        assert segmenter.segment_and_format("minhacasatemsp", "pt", "spacy") == (
+            "Minhacasatemsp"
+        )
@@ -0,0 +1,82 @@
+"""
+Testes unitários para o executor de segmentação
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.services.metrics import metrics
+from src.services.segmentation_executor import (
+    ExecutorSaturatedError,
+    SegmentationExecutor,
+)
+
+
+class TestSegmentationExecutor:
+    """Testes para o executor limitado"""
+
+    @pytest.fixture
+    def executor(self):
+        """Executor com um worker e fila de uma tarefa"""
+        executor = SegmentationExecutor(workers=1, max_queue=1, timeout=5)
+        yield executor
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_segment_and_format(self, executor):
+        """Testa a segmentação executada fora do event loop"""
+        result = await executor.segment_and_format("minhacasatemsp", "pt", "viterbi")
+        assert result == "MinhaCasaTemSP"
+        assert executor.inflight == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self, executor):
+        """Testa que o executor recusa tarefas acima da capacidade"""
+        running = [
+            asyncio.ensure_future(executor.submit(time.sleep, 0.2)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        assert executor.queue_depth == 1
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.submit(time.sleep, 0.2)
+
+        await asyncio.gather(*running)
+        assert executor.inflight == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Testa o timeout por requisição"""
+        executor = SegmentationExecutor(workers=1, max_queue=0, timeout=0.05)
+        try:
+            with pytest.raises(TimeoutError):
+                await executor.submit(time.sleep, 0.3)
+            # A vaga só é liberada quando a tarefa realmente termina
+            assert executor.inflight == 1
+            await asyncio.sleep(0.4)
+            assert executor.inflight == 0
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_metrics_are_merged(self):
+        """Testa que as métricas registradas nos processos workers chegam ao
+        processo que expõe /metrics"""
+        executor = SegmentationExecutor(mode="process", workers=1, timeout=30)
+        before = metrics.segmentation_path.value("model", "pt", "viterbi")
+        try:
+            result = await executor.segment_and_format(
+                "metricasdoprocesso", "pt", "viterbi"
+            )
+        finally:
+            executor.shutdown()
+        assert result == "MetricasDoProcesso"
+        assert metrics.segmentation_path.value("model", "pt", "viterbi") == (before + 1)
+        assert metrics.stage_latency.count("tokenize", "pt", "viterbi") > 0
+
+    def test_invalid_mode(self):
+        """Testa comportamento com modo de executor inválido"""
+        with pytest.raises(ValueError):
+            SegmentationExecutor(mode="fiber")
@@ -0,0 +1,123 @@
+"""
+Testes unitários para o cache compartilhado de segundo nível
+"""
+
+import pytest
+
+from src.services.nuuvify_wordsegment_service import WordSegmenter
+from src.services.shared_cache import (
+    SharedCache,
+    SQLiteSharedCache,
+    create_shared_cache,
+)
+
+
+class TestSQLiteSharedCache:
+    """Testes para o backend SQLite"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        """Arquivo SQLite temporário"""
+        return str(tmp_path / "cache.db")
+
+    def test_set_and_get(self, db_path):
+        """Testa gravação e leitura de várias chaves"""
+        cache = SQLiteSharedCache(db_path)
+        cache.set_many({"pt:viterbi:casa": "Casa", "pt:viterbi:sp": "SP"})
+
+        found = cache.get_many(["pt:viterbi:casa", "pt:viterbi:sp", "pt:viterbi:x"])
+        assert found == {"pt:viterbi:casa": "Casa", "pt:viterbi:sp": "SP"}
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_shared_between_instances(self, db_path):
+        """Testa que instâncias distintas (workers) enxergam o mesmo arquivo"""
+        SQLiteSharedCache(db_path).set_many({"pt:viterbi:casa": "Casa"})
+        assert SQLiteSharedCache(db_path).get_many(["pt:viterbi:casa"]) == {
+            "pt:viterbi:casa": "Casa"
+        }
+
+    def test_ttl(self, db_path):
+        """Testa a expiração das entradas"""
+        now = [100.0]
+        cache = SQLiteSharedCache(db_path, ttl_seconds=10, clock=lambda: now[0])
+        cache.set_many({"k": "v"})
+
+        assert cache.get_many(["k"]) == {"k": "v"}
+        now[0] = 111.0
+        assert cache.get_many(["k"]) == {}
+        assert cache.purge_expired() == 1
+
+    def test_purge_during_writes(self, db_path):
+        """Testa a remoção periódica das expiradas e das mais antigas acima do
+        limite de entradas"""
+        now = [100.0]
+        cache = SQLiteSharedCache(
+            db_path, ttl_seconds=100, clock=lambda: now[0], max_entries=3
+        )
+        cache.set_many({"expira": "v"})
+        now[0] = 140.0
+        cache.set_many({f"k{index}": "v" for index in range(5)})
+        now[0] = 200.0
+        cache.set_many({"k5": "v"})
+
+        rows = cache._connect().execute("SELECT key FROM segmentation_cache")
+        assert sorted(key for (key,) in rows) == ["k3", "k4", "k5"]
+
+    def test_many_keys(self, db_path):
+        """Testa consultas acima do limite de parâmetros do SQLite"""
+        cache = SQLiteSharedCache(db_path)
+        items = {f"k{index}": f"v{index}" for index in range(1200)}
+        cache.set_many(items)
+        assert cache.get_many(list(items)) == items
+
+    def test_clear(self, db_path):
+        """Testa a limpeza do cache"""
+        cache = SQLiteSharedCache(db_path)
+        cache.set_many({"k": "v"})
+        cache.clear()
+        assert cache.get_many(["k"]) == {}
+
+
+class TestCreateSharedCache:
+    """Testes para a criação do backend configurado"""
+
+    def test_disabled(self):
+        """Testa que backend vazio desativa o cache compartilhado"""
+        assert create_shared_cache("") is None
+
+    def test_invalid_backend(self):
+        """Testa comportamento com backend inválido"""
+        with pytest.raises(ValueError):
+            create_shared_cache("memcached")
+
+    def test_interface_is_abstract(self):
+        """Testa que a interface não pode ser instanciada sem os métodos"""
+        with pytest.raises(TypeError):
+            SharedCache()
+
+
+class TestServiceSharedCache:
+    """Testes do cache compartilhado no serviço de segmentação"""
+
+    def test_warm_result_from_other_worker(self, tmp_path):
+        """Testa que um worker reaproveita o resultado calculado por outro"""
+        path = str(tmp_path / "cache.db")
+        first = WordSegmenter()
+        first.shared_cache = SQLiteSharedCache(path)
+        first.segment_and_format("minhacasatemsp", "pt", "viterbi")
+
+        second = WordSegmenter()
+        second.shared_cache = SQLiteSharedCache(path)
+        # Chave: idioma, motor, tenant, versão do vocabulário e texto
+        key = second._cache_key(
+            "minhacasatemsp", "pt", "viterbi", "", second.vocabulary.current
+        )
+        second.shared_cache.set_many({":".join(key): "Sentinela"})
+
+        assert second.segment_and_format("minhacasatemsp", "pt", "viterbi") == (
+            "Sentinela"
+        )
+        assert second.shared_cache.hits == 1
+        # O resultado compartilhado também aquece o cache local
+        assert second.cache.get(key) == "Sentinela"
@@ -0,0 +1,104 @@
+"""
+Testes para a deduplicação de segmentações idênticas em andamento
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.services.nuuvify_wordsegment_service import WordSegmenter
+from src.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Testes para o SingleFlight"""
+
+    def test_claim_and_complete(self):
+        """Testa o responsável pelo cálculo, as esperas e a liberação das chaves"""
+        flight = SingleFlight()
+        owned, waiting = flight.claim(["a", "b", "a"])
+        assert owned == [0, 1]
+        assert list(waiting) == [2]
+
+        other_owned, other_waiting = flight.claim(["b", "c"])
+        assert other_owned == [1]
+        assert list(other_waiting) == [0]
+
+        flight.complete({"a": 1, "b": 2})
+        assert waiting[2].result() == 1
+        assert other_waiting[0].result() == 2
+        assert len(flight) == 1
+        assert flight.shared == 2
+
+    def test_fail(self):
+        """Testa a propagação do erro aos chamadores em espera"""
+        flight = SingleFlight()
+        flight.claim(["a"])
+        _, waiting = flight.claim(["a"])
+        flight.fail(["a"], ValueError("falhou"))
+        with pytest.raises(ValueError):
+            waiting[0].result()
+        assert len(flight) == 0
+
+
+class TestSingleFlightInService:
+    """Testes do single-flight no serviço"""
+
+    @pytest.fixture
+    def segmenter(self, monkeypatch):
+        """Segmentador sem caches cujo motor é lento e conta as chamadas"""
+        segmenter = WordSegmenter()
+        segmenter.cache.max_entries = 0
+        segmenter.shared_cache = None
+        segmenter.calls = []
+        original = segmenter._segment_uncached
+
+        def slow(texts, *args, **kwargs):
+            segmenter.calls.append(list(texts))
+            time.sleep(0.1)
+            return original(texts, *args, **kwargs)
+
+        monkeypatch.setattr(segmenter, "_segment_uncached", slow)
+        return segmenter
+
+    def test_concurrent_identical_requests(self, segmenter):
+        """Testa que requisições idênticas concorrentes calculam uma única vez"""
+        texts = ["MINHACASATEMSP", "minhacasatemsp"] * 4
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(
+                pool.map(
+                    lambda t: segmenter.segment_and_format(t, "pt", "viterbi"), texts
+                )
+            )
+        assert set(results) == {"MinhaCasaTemSP"}
+        assert segmenter.calls == [["MINHACASATEMSP"]]
+        assert len(segmenter.single_flight) == 0
+
+    def test_duplicates_in_batch(self, segmenter):
+        """Testa que textos repetidos no mesmo lote são calculados uma vez"""
+        results = segmenter.segment_many(
+            ["notafiscal", "NOTAFISCAL", "casa", "notafiscal"], "pt", "viterbi"
+        )
+        assert results == ["NotaFiscal", "NotaFiscal", "Casa", "NotaFiscal"]
+        assert segmenter.calls == [["notafiscal", "casa"]]
+
+    def test_error_reaches_waiters(self, segmenter, monkeypatch):
+        """Testa que o erro do cálculo chega a quem aguardava e libera a chave"""
+        started = threading.Event()
+
+        def failing(texts, *args, **kwargs):
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("motor indisponível")
+
+        monkeypatch.setattr(segmenter, "_segment_uncached", failing)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(segmenter.segment_and_format, "casa", "pt", "viterbi")
+            started.wait()
+            second = pool.submit(segmenter.segment_and_format, "casa", "pt", "viterbi")
+            for future in (first, second):
+                with pytest.raises(RuntimeError):
+                    future.result()
+        assert len(segmenter.single_flight) == 0
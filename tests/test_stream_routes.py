@@ -0,0 +1,133 @@
+"""
+Testes para o endpoint de segmentação em streaming
+"""
+
+import json
+
+import httpx
+import pytest
+
+from src.core.config import settings
+
+
+def _records(response: httpx.Response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestSegmentStream:
+    """Testes para /segment/stream"""
+
+    @pytest.mark.asyncio
+    async def test_ndjson(self, client):
+        """Testa entrada NDJSON com idiomas mistos, mantendo a ordem"""
+        body = "\n".join(
+            [
+                json.dumps({"text": "minhacasatemsp", "language": "pt"}),
+                "",
+                json.dumps({"text": "humanresourceshr", "language": "en"}),
+            ]
+        )
+        response = await client.post(
+            "/api/v1/segment/stream?engine=viterbi",
+            content=body,
+            headers={"content-type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert _records(response) == [
+            {"original": "minhacasatemsp", "formatted": "MinhaCasaTemSP"},
+            {"original": "humanresourceshr", "formatted": "HumanResourcesHR"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_plain_text_incremental_body(self, client):
+        """Testa texto puro recebido em pedaços que cortam as linhas"""
+
+        async def body():
+            for piece in [b"minhacasa", b"temsp\ncodigodo", b"produto\n", b"casa"]:
+                yield piece
+
+        response = await client.post(
+            "/api/v1/segment/stream?language=pt&engine=viterbi",
+            content=body(),
+            headers={"content-type": "text/plain"},
+        )
+
+        assert [r["formatted"] for r in _records(response)] == [
+            "MinhaCasaTemSP",
+            "CodigoDoProduto",
+            "Casa",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_lines_do_not_abort_stream(self, client):
+        """Testa que linhas inválidas geram erro sem interromper o stream"""
+        body = "\n".join(
+            [
+                json.dumps({"text": "casa", "language": "fr"}),
+                json.dumps({"text": "casa", "language": "pt"}),
+            ]
+        )
+        response = await client.post(
+            "/api/v1/segment/stream?engine=viterbi",
+            content=body,
+            headers={"content-type": "application/x-ndjson"},
+        )
+
+        records = _records(response)
+        assert "error" in records[0]
+        assert records[1] == {"original": "casa", "formatted": "Casa"}
+
+    @pytest.mark.asyncio
+    async def test_oversized_line(self, client, monkeypatch):
+        """Testa que linhas acima do limite são descartadas com erro"""
+        monkeypatch.setattr(settings, "SEGMENTATION_STREAM_MAX_LINE_BYTES", 16)
+
+        async def body():
+            yield b"casa\n" + b"a" * 10
+            yield b"a" * 10
+            yield b"a" * 10 + b"\nsp\n"
+
+        response = await client.post(
+            "/api/v1/segment/stream?language=pt&engine=viterbi",
+            content=body(),
+            headers={"content-type": "text/plain"},
+        )
+
+        records = _records(response)
+        assert records[0]["formatted"] == "Casa"
+        assert "error" in records[1]
+        assert records[2]["formatted"] == "SP"
+        assert len(records) == 3
+
+    @pytest.mark.asyncio
+    async def test_text_over_max_input_chars(self, client, monkeypatch):
+        """Testa o limite de caracteres por texto no stream e em /segment/"""
+        monkeypatch.setattr(settings, "SEGMENTATION_MAX_INPUT_CHARS", 10)
+
+        response = await client.post(
+            "/api/v1/segment/stream?language=pt&engine=viterbi",
+            content="casa\nminhacasatemsp\nsp\n",
+            headers={"content-type": "text/plain"},
+        )
+        records = _records(response)
+        assert records[0]["formatted"] == "Casa"
+        assert "excede o limite" in records[1]["error"]
+        assert records[2]["formatted"] == "SP"
+
+        response = await client.post(
+            "/api/v1/segment/",
+            json={"text": "minhacasatemsp", "language": "pt", "engine": "viterbi"},
+        )
+        assert response.status_code == 413
+
+    @pytest.mark.asyncio
+    async def test_plain_text_requires_language(self, client):
+        """Testa que texto puro exige o parâmetro language"""
+        response = await client.post(
+            "/api/v1/segment/stream",
+            content="casa",
+            headers={"content-type": "text/plain"},
+        )
+        assert response.status_code == 422
@@ -0,0 +1,200 @@
+"""
+Testes unitários para o motor de segmentação Viterbi
+"""
+
+import math
+import random
+
+import pytest
+
+from src.services.lexicon_index import DictLexicon, LexiconIndex, build_index
+from src.services.nuuvify_wordsegment_service import (
+    ViterbiSegmenter,
+    nuuvify_wordsegment_service,
+)
+
+
+class TestViterbiSegmenter:
+    """Testes para o segmentador por dicionário"""
+
+    @pytest.fixture
+    def segmenter(self):
+        """Segmentador com um léxico pequeno"""
+        return ViterbiSegmenter(
+            {"minha": 50, "casa": 40, "tem": 30, "sp": 10, "a": 100, "casatem": 1},
+            max_word_length=10,
+        )
+
+    def test_segment_unigram(self, segmenter):
+        """Testa a segmentação com unigramas"""
+        assert segmenter.segment("minhacasatemsp") == ["minha", "casa", "tem", "sp"]
+
+    def test_segment_empty(self, segmenter):
+        """Testa segmentação de texto vazio"""
+        assert segmenter.segment("") == []
+
+    def test_segment_unknown_text(self, segmenter):
+        """Testa que trechos desconhecidos são preservados"""
+        assert "".join(segmenter.segment("xyzcasa")) == "xyzcasa"
+
+    def test_max_word_length_bounded_by_lexicon(self, segmenter):
+        """Testa que o tamanho máximo de palavra respeita o léxico"""
+        assert segmenter.max_word_length == len("casatem")
+
+    def test_segment_bigram(self):
+        """Testa que bigramas alteram a segmentação mais provável"""
+        unigrams = {"ab": 10, "cd": 10, "abc": 12, "d": 12}
+        assert ViterbiSegmenter(unigrams).segment("abcd") == ["abc", "d"]
+
+        bigrams = {"ab cd": 10}
+        assert ViterbiSegmenter(unigrams, bigrams).segment("abcd") == ["ab", "cd"]
+
+    def test_segment_windows(self, segmenter):
+        """Testa que janelas sobrepostas não cortam palavras na fronteira"""
+        text = "minhacasatemsp" * 20
+        expected = segmenter.segment(text)
+        for size, overlap in [(10, 10), (13, 7), (50, 8)]:
+            assert segmenter.segment_windows(text, size, overlap) == expected
+        assert segmenter.segment_windows(text, 0, 0) == expected
+
+
+class TestKBestViterbi:
+    """Testes para as k melhores segmentações"""
+
+    @pytest.mark.parametrize("bigrams", [None, {"minha casa": 20, "casa tem": 5}])
+    def test_k_best(self, bigrams):
+        """Testa ordem, unicidade e concordância com a melhor segmentação"""
+        segmenter = ViterbiSegmenter(
+            {"minha": 50, "casa": 40, "tem": 30, "sp": 10, "a": 100, "casatem": 1},
+            bigrams,
+            max_word_length=10,
+        )
+        text = "minhacasatemsp"
+        ranked = segmenter.segment_k_best(text, 5)
+
+        assert len(ranked) == 5
+        assert ranked[0][0] == segmenter.segment(text)
+        scores = [score for _, score in ranked]
+        assert scores == sorted(scores, reverse=True)
+        assert len({tuple(words) for words, _ in ranked}) == 5
+        assert all("".join(words) == text for words, _ in ranked)
+        assert ["minha", "casatem", "sp"] in [words for words, _ in ranked]
+
+    def test_k_best_scores(self):
+        """Testa que o score é a log-probabilidade da segmentação"""
+        segmenter = ViterbiSegmenter({"ab": 30, "a": 10, "b": 60})
+        ranked = dict(
+            (tuple(words), score) for words, score in segmenter.segment_k_best("ab", 2)
+        )
+        assert ranked[("ab",)] == pytest.approx(math.log(30 / 100))
+        assert ranked[("a", "b")] == pytest.approx(math.log(10 / 100 * 60 / 100))
+        assert segmenter.segment_k_best("", 3) == [([], 0.0)]
+
+
+class TestVectorizedViterbi:
+    """Testes para a pontuação vetorizada (NumPy) de textos longos"""
+
+    COUNTS = {"minha": 50, "casa": 40, "tem": 30, "nota": 20, "fiscal": 15, "a": 90}
+
+    @pytest.fixture
+    def segmenter(self):
+        """Segmentador sobre o índice compilado, vetorizado a partir de 1 caractere"""
+        return ViterbiSegmenter(
+            LexiconIndex(build_index(self.COUNTS)),
+            max_word_length=10,
+            extra_words={"sp": 25},
+            vectorized_min_length=1,
+        )
+
+    def test_score_matrix(self, segmenter):
+        """Testa a matriz de pontuações (posição x tamanho)"""
+        scores, known = segmenter._score_matrix("casasp")
+        assert scores.shape == (6, segmenter.max_word_length)
+        assert known[0, 3] and known[4, 1] and known[1, 0]
+        assert not known[0, 2]
+        assert scores[0, 3] == pytest.approx(segmenter._word_logp("casa"))
+        assert scores[0, 2] == pytest.approx(segmenter.unknown_logp[3])
+
+    def test_matches_unigram(self, segmenter):
+        """Testa que o caminho vetorizado segmenta igual ao Viterbi em Python"""
+        rng = random.Random(7)
+        words = list(self.COUNTS) + ["sp", "xyz", "ção"]
+        overlay = DictLexicon({"notafiscal": 1})
+        for _ in range(50):
+            text = "".join(rng.choices(words, k=rng.randint(1, 40)))
+            assert segmenter._segment_vectorized(text) == (
+                segmenter._segment_unigram(text)
+            )
+            assert segmenter._segment_vectorized(text, overlay) == (
+                segmenter._segment_unigram(text, overlay)
+            )
+
+    def test_threshold(self, segmenter, monkeypatch):
+        """Testa que só textos a partir do tamanho mínimo usam o caminho vetorizado"""
+        segmenter.vectorized_min_length = 10
+        calls = []
+        original = segmenter._segment_vectorized
+
+        def recording(text, overlay=None):
+            calls.append(text)
+            return original(text, overlay)
+
+        monkeypatch.setattr(segmenter, "_segment_vectorized", recording)
+        assert segmenter.segment("minhacasa") == ["minha", "casa"]
+        assert segmenter.segment("minhacasatemsp") == ["minha", "casa", "tem", "sp"]
+        assert calls == ["minhacasatemsp"]
+
+    def test_requires_compiled_index(self):
+        """Testa que o léxico em dicionário não usa o caminho vetorizado"""
+        segmenter = ViterbiSegmenter(self.COUNTS, vectorized_min_length=1)
+        assert segmenter.vectorized_min_length == 0
+
+
+class TestViterbiEngine:
+    """Testes do motor viterbi no serviço de segmentação"""
+
+    @pytest.mark.parametrize(
+        "text,language,expected",
+        [
+            ("minhacasatemsp", "pt", "MinhaCasaTemSP"),
+            ("sistemadeinformacaomg", "pt", "SistemaDeInformacaoMG"),
+            ("tecnologiadainformacaoti", "pt", "TecnologiaDaInformacaoTI"),
+            ("humanresourceshr", "en", "HumanResourcesHR"),
+        ],
+    )
+    def test_segment_and_format(self, text, language, expected):
+        """Testa segmentação com os léxicos distribuídos"""
+        result = nuuvify_wordsegment_service.segment_and_format(
+            text, language, engine="viterbi"
+        )
+        assert result == expected
+
+    def test_preserves_accents(self):
+        """Testa que acentos do texto original são mantidos"""
+        result = nuuvify_wordsegment_service.segment_and_format(
+            "notafiscaleletrônica", "pt", engine="viterbi"
+        )
+        assert result == "NotaFiscalEletrônica"
+
+    def test_filters_non_alpha(self):
+        """Testa que apenas caracteres alfabéticos são mantidos"""
+        result = nuuvify_wordsegment_service.segment_and_format(
+            "casa123_azul", "pt", engine="viterbi"
+        )
+        assert result == "CasaAzul"
+
+    def test_invalid_engine(self):
+        """Testa comportamento com motor inválido"""
+        with pytest.raises(ValueError) as exc_info:
+            nuuvify_wordsegment_service.segment_and_format("casa", "pt", engine="x")
+        assert "não suportado" in str(exc_info.value)
+
+    def test_segment_batch_preserves_order(self):
+        """Testa que o lote agrupa por idioma e mantém a ordem de entrada"""
+        items = [
+            ("minhacasatemsp", "pt", "viterbi"),
+            ("humanresourceshr", "en", "viterbi"),
+            ("codigodoproduto", "pt", "viterbi"),
+        ]
+        results = nuuvify_wordsegment_service.segment_batch(items)
+        assert results == ["MinhaCasaTemSP", "HumanResourcesHR", "CodigoDoProduto"]
@@ -0,0 +1,210 @@
+"""
+Testes para o vocabulário de siglas/palavras de domínio recarregável
+"""
+
+import json
+import os
+
+import pytest
+
+from src.core.config import settings
+from src.services.nuuvify_wordsegment_service import (
+    WordSegmenter,
+    nuuvify_wordsegment_service,
+)
+from src.services.vocabulary import (
+    FileVocabularySource,
+    Vocabulary,
+    VocabularyStore,
+)
+
+DOCUMENT = {
+    "pt": {"acronyms": ["ERP", " crm "], "words": ["nuuvify"]},
+    "tenants": {"acme": {"pt": {"acronyms": ["acme"]}}},
+}
+
+
+def write_vocabulary(path, document) -> None:
+    """Grava o vocabulário e avança o mtime (detecção confiável da mudança)"""
+    path.write_text(json.dumps(document), encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def vocabulary_file(tmp_path):
+    """Arquivo de vocabulário com o documento padrão"""
+    path = tmp_path / "vocabulary.json"
+    write_vocabulary(path, DOCUMENT)
+    return path
+
+
+class TestVocabulary:
+    """Testes para o snapshot do vocabulário"""
+
+    def test_parse_and_tenant_merge(self):
+        """Testa a normalização dos termos e a combinação tenant + padrão"""
+        vocabulary = Vocabulary(DOCUMENT)
+        assert vocabulary.acronyms("pt") == {"erp", "crm"}
+        assert vocabulary.acronyms("pt", "acme") == {"erp", "crm", "acme"}
+        assert vocabulary.acronyms("pt", "outro") == {"erp", "crm"}
+        assert vocabulary.acronyms("en") == frozenset()
+        assert vocabulary.entry("pt", "acme").words == {"nuuvify"}
+
+    def test_version_is_content_hash(self):
+        """Testa que a versão depende apenas do conteúdo"""
+        reordered = {"tenants": DOCUMENT["tenants"], "pt": DOCUMENT["pt"]}
+        assert Vocabulary(DOCUMENT).version == Vocabulary(reordered).version
+        assert Vocabulary(DOCUMENT).version != Vocabulary({}).version
+
+    def test_invalid_document(self):
+        """Testa a rejeição de documentos mal formados"""
+        with pytest.raises(ValueError):
+            Vocabulary({"pt": {"acronyms": "erp"}})
+        with pytest.raises(ValueError):
+            Vocabulary({"tenants": []})
+
+
+class TestVocabularyStore:
+    """Testes para a recarga do vocabulário"""
+
+    def test_reload_swaps_snapshot(self, vocabulary_file):
+        """Testa a troca de versão e o callback após a recarga"""
+        swaps = []
+        store = VocabularyStore(
+            FileVocabularySource(str(vocabulary_file)), on_swap=swaps.append
+        )
+        first = store.current.version
+        assert store.current.acronyms("pt") == {"erp", "crm"}
+
+        # Sem mudança no arquivo não há nova leitura
+        assert store.reload() is False
+
+        write_vocabulary(vocabulary_file, {"pt": {"acronyms": ["bi"]}})
+        assert store.reload() is True
+        assert store.current.acronyms("pt") == {"bi"}
+        assert store.current.version != first
+        assert [vocabulary.version for vocabulary in swaps] == [
+            first,
+            store.current.version,
+        ]
+
+    def test_invalid_file_keeps_previous(self, vocabulary_file):
+        """Testa que um arquivo inválido mantém o snapshot anterior"""
+        store = VocabularyStore(FileVocabularySource(str(vocabulary_file)))
+        version = store.current.version
+
+        vocabulary_file.write_text("{invalido", encoding="utf-8")
+        os.utime(vocabulary_file, ns=(0, 10**9))
+        assert store.reload() is False
+        assert store.current.version == version
+        assert store.errors == 1
+        assert store.stats()["last_error"]
+
+    def test_first_load_is_deferred(self, vocabulary_file):
+        """Testa que a origem só é lida em start_watching ou no primeiro acesso"""
+        source = FileVocabularySource(str(vocabulary_file))
+        store = VocabularyStore(source)
+        assert source.changed() is True
+        store.start_watching(0)
+        assert source.changed() is False
+        assert store.current.acronyms("pt") == {"erp", "crm"}
+        assert store.reloads == 1
+
+        store = VocabularyStore(FileVocabularySource(str(vocabulary_file)))
+        assert store.reloads == 0
+        assert store.current.acronyms("pt") == {"erp", "crm"}
+
+    def test_missing_file(self, tmp_path):
+        """Testa a inicialização sem o arquivo (vocabulário vazio)"""
+        store = VocabularyStore(FileVocabularySource(str(tmp_path / "nao.json")))
+        assert store.current.acronyms("pt") == frozenset()
+        assert store.errors == 1
+
+
+class TestVocabularyInService:
+    """Testes do vocabulário aplicado à segmentação"""
+
+    @pytest.fixture
+    def segmenter(self, vocabulary_file, monkeypatch):
+        """Serviço com o vocabulário em arquivo e sem cache compartilhado"""
+        monkeypatch.setattr(
+            settings, "SEGMENTATION_VOCABULARY_FILE", str(vocabulary_file)
+        )
+        segmenter = WordSegmenter()
+        segmenter.shared_cache = None
+        return segmenter
+
+    def test_acronyms_and_words(self, segmenter):
+        """Testa siglas e palavras de domínio no Viterbi"""
+        assert segmenter.segment_and_format("sistemaerp", "pt", "viterbi") == (
+            "SistemaERP"
+        )
+        assert segmenter.segment_and_format("nuuvifysistema", "pt", "viterbi") == (
+            "NuuvifySistema"
+        )
+
+    def test_tenant_vocabulary(self, segmenter):
+        """Testa o vocabulário específico do tenant"""
+        assert segmenter.segment_many(
+            ["acmesistema"], "pt", "viterbi", tenant="acme"
+        ) == ["ACMESistema"]
+        assert segmenter.segment_batch(
+            [("acmesistema", "pt", "viterbi"), ("acmesistema", "pt", "viterbi", "x")]
+        ) == ["AcmeSistema", "AcmeSistema"]
+
+    def test_accented_words(self, segmenter, vocabulary_file):
+        """Testa palavras com acentos no Viterbi (o texto é segmentado sem
+        acentos) sem perder a sigla seguinte"""
+        write_vocabulary(vocabulary_file, {"pt": {"words": ["nuuvifyção"]}})
+        segmenter.vocabulary.reload()
+        assert segmenter.segment_and_format("minhanuuvifyçãosp", "pt", "viterbi") == (
+            "MinhaNuuvifyçãoSP"
+        )
+
+    def test_reload_invalidates_cache(self, segmenter, vocabulary_file):
+        """Testa que a nova versão do vocabulário não usa resultados antigos"""
+        assert segmenter.segment_and_format("sistemaerp", "pt", "viterbi") == (
+            "SistemaERP"
+        )
+        write_vocabulary(vocabulary_file, {"pt": {"acronyms": ["bi"]}})
+        assert segmenter.vocabulary.reload() is True
+        assert segmenter.segment_and_format("sistemaerp", "pt", "viterbi") != (
+            "SistemaERP"
+        )
+        assert segmenter.segment_and_format("sistemabi", "pt", "viterbi") == (
+            "SistemaBI"
+        )
+
+
+class TestVocabularyRoutes:
+    """Testes para os endpoints de administração do vocabulário"""
+
+    async def test_stats(self, client):
+        """Testa a consulta da versão carregada"""
+        response = await client.get("/api/v1/vocabulary/")
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert (
+            data["version"] == nuuvify_wordsegment_service.vocabulary.stats()["version"]
+        )
+
+    async def test_reload_requires_token(self, client, monkeypatch):
+        """Testa que a recarga exige o token de administração"""
+        monkeypatch.setattr(settings, "VOCABULARY_ADMIN_TOKEN", "")
+        response = await client.post(
+            "/api/v1/vocabulary/reload", headers={"X-Admin-Token": ""}
+        )
+        assert response.status_code == 403
+
+        monkeypatch.setattr(settings, "VOCABULARY_ADMIN_TOKEN", "segredo")
+        response = await client.post(
+            "/api/v1/vocabulary/reload", headers={"X-Admin-Token": "errado"}
+        )
+        assert response.status_code == 403
+
+        response = await client.post(
+            "/api/v1/vocabulary/reload", headers={"X-Admin-Token": "segredo"}
+        )
+        assert response.status_code == 200
+        assert response.json()["data"]["changed"] is False
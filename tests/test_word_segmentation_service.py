@@ -2,9 +2,16 @@
 Testes unitários para o serviço de segmentação de palavras
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from src.services.nuuvify_wordsegment_service import nuuvify_wordsegment_service
+from src.services.nuuvify_wordsegment_service import (
+    WordSegmenter,
+    nuuvify_wordsegment_service,
+    split_chunks,
+)
 
 
 class TestWordSegmentationService:
@@ -113,3 +120,154 @@ class TestWordSegmentationService:
         with pytest.raises(ValueError) as exc_info:
             nuuvify_wordsegment_service.segment_and_format("test", "fr")
         assert "não suportado" in str(exc_info.value)
+
+
+class TestSpacyLoadProfiles:
+    """Testes para os perfis de carga dos modelos spaCy"""
+
+    def test_blank_profile(self):
+        """Testa o perfil 'blank' (somente tokenizador, sem modelo instalado)"""
+        segmenter = WordSegmenter()
+        segmenter.load_profile = "blank"
+
+        result = segmenter.segment_and_format("minha casa tem sp", "pt")
+        assert result == "MinhaCasaTemSP"
+        assert segmenter.models["pt"].pipe_names == []
+
+    def test_blank_profile_batch(self):
+        """Testa o perfil 'blank' com nlp.pipe"""
+        segmenter = WordSegmenter()
+        segmenter.load_profile = "blank"
+
+        results = segmenter.segment_many(["house usa", "human resources"], "en")
+        assert results == ["HouseUSA", "HumanResources"]
+
+    def test_invalid_profile(self):
+        """Testa comportamento com perfil de carga inválido"""
+        segmenter = WordSegmenter()
+        segmenter.load_profile = "tiny"
+
+        with pytest.raises(ValueError) as exc_info:
+            segmenter.segment_and_format("casa", "pt")
+        assert "não suportado" in str(exc_info.value)
+
+
+class TestChunking:
+    """Testes para textos longos (pedaços, janelas sobrepostas e limite)"""
+
+    def test_split_chunks(self):
+        """Testa os cortes em espaços, em outros separadores e em letras"""
+        text = "ab cd, efghijklmnop qr"
+        chunks = list(split_chunks(text, 5))
+        assert chunks == ["ab ", "cd, ", "efghijklmnop", " qr"]
+        assert "".join(chunks) == text
+        assert list(split_chunks(text, 0)) == [text]
+        assert list(split_chunks("abc", 5)) == ["abc"]
+
+    @pytest.mark.parametrize("engine", ["viterbi", "spacy"])
+    def test_chunked_matches_whole(self, engine):
+        """Testa que o resultado em pedaços é igual ao do texto inteiro"""
+        text = "minhacasatemsp" * 30 + " notafiscal, codigodoproduto" * 20
+        segmenter = WordSegmenter()
+        segmenter.load_profile = "blank"
+        segmenter.chunk_size = 0
+        expected = segmenter.segment_many([text, "casa sp"], "pt", engine)
+
+        segmenter = WordSegmenter()
+        segmenter.load_profile = "blank"
+        segmenter.chunk_size, segmenter.chunk_overlap = 40, 24
+        assert segmenter.segment_many([text, "casa sp"], "pt", engine) == expected
+        assert segmenter.segment_and_format(text, "pt", engine) == expected[0]
+
+    def test_max_input_chars(self):
+        """Testa que textos acima do limite são rejeitados antes do motor"""
+        segmenter = WordSegmenter()
+        segmenter.max_input_chars = 10
+
+        with pytest.raises(ValueError) as exc_info:
+            segmenter.segment_many(["casa", "minhacasatemsp"], "pt", "viterbi")
+        assert "excede o limite" in str(exc_info.value)
+        assert segmenter.viterbi_segmenters == {}
+        assert segmenter.segment_and_format("casa", "pt", "viterbi") == "Casa"
+
+
+class TestConcurrentLoad:
+    """Testes para a carga sob demanda com requisições concorrentes"""
+
+    def test_loads_once_per_language(self, monkeypatch):
+        """Testa que a primeira carga concorrente acontece uma única vez"""
+        segmenter = WordSegmenter()
+        segmenter.shared_cache = None
+        loads = []
+        original = segmenter._load_viterbi
+
+        def slow_load(language):
+            loads.append(language)
+            time.sleep(0.05)
+            return original(language)
+
+        monkeypatch.setattr(segmenter, "_load_viterbi", slow_load)
+        texts = ["minhacasa", "temsp", "notafiscal", "codigodoproduto"]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(
+                pool.map(
+                    lambda t: segmenter.segment_and_format(t, "pt", "viterbi"), texts
+                )
+            )
+        assert results == ["MinhaCasa", "TemSP", "NotaFiscal", "CodigoDoProduto"]
+        assert loads == ["pt"]
+
+
+class TestPreload:
+    """Testes para a pré-carga de modelos"""
+
+    def test_preload_viterbi(self):
+        """Testa a pré-carga dos léxicos do motor viterbi"""
+        segmenter = WordSegmenter()
+        timings = segmenter.preload(["pt", "en"], ["viterbi"])
+
+        assert set(timings) == {"pt:viterbi", "en:viterbi"}
+        assert set(segmenter.viterbi_segmenters) == {"pt", "en"}
+
+    def test_preload_skips_unavailable_models(self):
+        """Testa que falhas de carga não interrompem a pré-carga"""
+        segmenter = WordSegmenter()
+        timings = segmenter.preload(["fr", "pt"], ["viterbi"])
+        assert set(timings) == {"pt:viterbi"}
+
+
+class TestWarmup:
+    """Testes para o aquecimento e a prontidão do serviço"""
+
+    def test_ready_without_warmup(self):
+        """Testa que, sem aquecimento, o serviço é considerado pronto"""
+        readiness = WordSegmenter().readiness()
+        assert readiness["ready"] is True
+        assert readiness["warmup"] == "disabled"
+
+    def test_warmup_viterbi(self):
+        """Testa o aquecimento completo do motor viterbi"""
+        segmenter = WordSegmenter()
+        segmenter.warmup_state = "pending"
+        assert segmenter.readiness()["ready"] is False
+
+        report = segmenter.warmup(["pt", "en"], ["viterbi"])
+        readiness = segmenter.readiness()
+
+        assert readiness["ready"] is True
+        assert readiness["warmup"] == "done"
+        assert readiness["loaded"]["viterbi"] == ["en", "pt"]
+        assert report["models"] == {"pt:viterbi": True, "en:viterbi": True}
+        assert report["warmup_seconds"] > 0
+        # O aquecimento não deve popular o cache de resultados
+        assert len(segmenter.cache) == 0
+
+    def test_warmup_failure_is_not_ready(self):
+        """Testa que falhas de carga deixam o serviço indisponível"""
+        segmenter = WordSegmenter()
+        segmenter.warmup(["fr"], ["viterbi"])
+
+        readiness = segmenter.readiness()
+        assert readiness["ready"] is False
+        assert readiness["warmup"] == "failed"
+        assert readiness["models"] == {"fr:viterbi": False}